@@ -1,26 +1,41 @@
-import os
+import threading
 import time
-from typing import Self
-import pandas as pd
 from datetime import datetime
-from dotenv import load_dotenv
 from binance.client import Client
 from binance.enums import *
 from binance.exceptions import BinanceAPIException, BinanceRequestException
-from db.neonDbConfig import create_tables
-from estrategias import getMovingAverageVergenceRSI
 from functions.calculators.profit_and_loss_Calculator import calculate_profit
 from functions.logger import createLogOrder, erro_logger, trade_logger, bot_logger
 from decimal import ROUND_DOWN, Decimal
 from functions.calculators.calculate_max_buy_sell_quantity import QuantityCalculator
-from functions.get_current_price import get_current_price
-
-
-# Load environment variables
-load_dotenv()
+from functions.bot.OrderExecutionEngine import OrderExecutionEngine, weighted_fill_price
+from functions.binance.create_client import create_client
+from functions.binance.parse_klines import parse_klines
+from functions.CandleSeries import FIELDS, CandleSeries
+from functions.checkpoint import (
+    checkpoint_path,
+    load_array_checkpoint,
+    load_json_checkpoint,
+    save_array_checkpoint,
+    save_json_checkpoint,
+)
+from functions.binance.ExchangeInfoCache import shared_exchange_info
+from functions.binance.UserDataStream import UserDataStream
+from functions.PositionLedger import PositionLedger
+from db.writeBehind import write_behind
+from db.neonDbConfig import save_candles_to_db
+from functions.resilience import (
+    CircuitOpenError,
+    get_breaker,
+    is_transient_http_error,
+    retry_call,
+)
+from functions.metrics import metrics
+from functions.bot.load_bot_config import DEFAULT_RISK_PARAMS, DEFAULT_STRATEGY_PARAMS
+from functions.bot.RiskWatcher import RiskWatcher
+from functions.bot.StrategyEngine import StrategyEngine
+from requests.exceptions import RequestException
 
-api_key = os.getenv("BINANCE_API_KEY")
-secret_key = os.getenv("BINANCE_SECRET_KEY")
 
 # Configurations
 STOCK_CODE = "SOL"
@@ -28,6 +43,20 @@ OPERATION_CODE = "SOLUSDT"
 CANDLE_PERIOD = Client.KLINE_INTERVAL_15MINUTE
 TRADED_QUANTITY = 0.073
 BACKTESMODE = True
+PAPERMODE = False  # Ordens em uma PaperExchange no processo (saldos simulados)
+KLINES_LIMIT = 1000
+CHECKPOINT_SECONDS = 60  # Intervalo mínimo entre checkpoints periódicos
+METRICS_LOG_SECONDS = 300  # Intervalo mínimo entre métricas no bot.log (todos os robôs)
+
+# Estado do robô gravado no checkpoint (além da série de candles)
+BOT_STATE_FIELDS = (
+    "current_price_from_buy_order",
+    "last_profit",
+    "entry_price",
+    "purchased_quantity",
+    "last_trade_decision",
+    "last_archived_open_time",
+)
 
 
 # Binance Trading Bot Class
@@ -42,6 +71,12 @@ class BinanceTraderBot:
         traded_quantity,
         traded_percentage,
         candle_period,
+        backtest_mode=BACKTESMODE,
+        strategy_params=None,
+        base_url=None,
+        name=None,
+        paper_exchange=None,
+        risk_params=None,
     ):
         self.stock_code = stock_code
         self.operation_code = operation_code
@@ -50,20 +85,108 @@ class BinanceTraderBot:
         self.purchased_quantity = 0.0
         self.traded_percentage = traded_percentage
         self.candle_period = candle_period
-        self.client_binance = Client(api_key, secret_key)
+        # Nome usado nos checkpoints (o launcher usa SYMBOL-modo)
+        self.name = name or operation_code
+        self.backtest_mode = backtest_mode
+        self.strategy_params = {**DEFAULT_STRATEGY_PARAMS, **(strategy_params or {})}
+        # Chaves lidas do ambiente (BINANCE_API_KEY / BINANCE_SECRET_KEY)
+        self.client_binance = create_client(base_url=base_url)
+        if paper_exchange is not None:
+            # Paper trading: dados de mercado do cliente acima, ordens e saldos simulados
+            self.client_binance = paper_exchange.client(self.client_binance)
         self.quantity_calculator = QuantityCalculator(
             self.client_binance, self.operation_code
         )  # Instancia a classe
+        self.exchange_info = shared_exchange_info(self.client_binance)
+        self.order_engine = OrderExecutionEngine(self.client_binance)
+        self.user_stream = UserDataStream(
+            self.client_binance, use_websocket=base_url is None
+        )
+        if not backtest_mode:
+            # Backtest não envia ordens: os saldos vêm do REST a cada tick
+            self.user_stream.start()
+        if backtest_mode:
+            mode = "backtest"
+        elif paper_exchange is not None:
+            mode = "sim"
+        elif base_url is not None:
+            mode = "paper"
+        else:
+            mode = "live"
+        self.position_ledger = PositionLedger(
+            self.client_binance,
+            {self.operation_code: self.stock_code},
+            bot=self.name,
+            mode=mode,
+        ).start()
         self.current_price_from_buy_order = 0
+        # 1000 candles: a série cobre também a janela de suporte/resistência
+        # da estratégia; depois do primeiro tick só o delta é buscado
+        self.candles = CandleSeries(
+            capacity=KLINES_LIMIT, symbol=self.operation_code, interval=self.candle_period
+        )
+        self.last_archived_open_time = None
+        # Após 3 falhas seguidas os ticks são pulados por 60 s sem tocar na Binance
+        self.binance_breaker = get_breaker("binance", failure_threshold=3, reset_timeout=60)
+        # Estratégia persistente (estado entre ticks e checkpoint em disco)
+        self.strategy_engine = StrategyEngine(
+            self.operation_code,
+            self.client_binance,
+            self.candle_period,
+            self.strategy_params,
+            checkpoint_name=self.name,
+        )
+        # Ordens do tick e do RiskWatcher não podem se cruzar
+        self._trade_lock = threading.Lock()
+        # Stop-loss/take profit a cada preço do stream, entre os ticks
+        self.risk_watcher = RiskWatcher(
+            self.operation_code,
+            self.client_binance,
+            self._risk_exit,
+            use_websocket=base_url is None,
+            **{**DEFAULT_RISK_PARAMS, **(risk_params or {})},
+        )
+        if paper_exchange is not None:
+            self.risk_watcher.add_listener(paper_exchange.set_price)
+        self.checkpoint_file = checkpoint_path(f"{self.name}.bot")
+        # O intervalo entra no nome: candles de outro intervalo não são reaproveitados
+        self.candles_checkpoint_file = checkpoint_path(
+            f"{self.name}.{self.candle_period}.candles", "npy"
+        )
+        self.last_checkpoint = time.monotonic()
+        self.restore_checkpoint()
+        if not self.backtest_mode:
+            self.risk_watcher.sync(
+                self.getActualTradePositionForBinance(), self.current_price_from_buy_order
+            )
+            self.risk_watcher.start()
         print("Robo Trader iniciado...")
         bot_logger.info("Robo Trader iniciado...")
 
     def updateAllData(self):
         try:
-            self.account_data = self.getUpdatedAccountData()
+            # Com o user data stream ativo os saldos já estão atualizados
+            if not self.user_stream.live:
+                self.account_data = self.getUpdatedAccountData()
             self.last_stock_account_balance = self.getLastStockAccountBalance()
             self.actual_trade_position = self.getActualTradePositionForBinance()
-            self.stock_data = self.getStockData()
+            self.stock_data = retry_call(
+                self.getStockData,
+                attempts=3,
+                # BinanceAPIException cobre as respostas 5xx, 429 e 418 da Binance
+                retry_on=(BinanceRequestException, BinanceAPIException, RequestException),
+                retry_if=is_transient_http_error,
+                breaker=self.binance_breaker,
+            )
+        except (
+            BinanceRequestException,
+            BinanceAPIException,
+            RequestException,
+            CircuitOpenError,
+        ):
+            # Sem dados novos o tick não pode seguir (nem com os candles do
+            # tick anterior); execute() trata o erro
+            raise
         except Exception as e:
             erro_logger.exception(
                 f"------------------------------------\nErro ao atualizar dados: {e}"
@@ -71,83 +194,103 @@ class BinanceTraderBot:
             erro_logger.exception(f"------------------------------------\n")
 
     def getUpdatedAccountData(self):
-        return self.client_binance.get_account()
+        return self.user_stream.reconcile()
 
     def getLastStockAccountBalance(self):
-        for stock in self.account_data["balances"]:
-            if stock["asset"] == self.stock_code:
-                return float(stock["free"])
-        return 0.0
+        return float(self.user_stream.get_free(self.stock_code))
 
     def getActualTradePositionForBinance(self):
-        try:
-            trades = self.client_binance.get_my_trades(
-                symbol=self.operation_code, limit=1
-            )
-            if trades:
-                last_trade = trades[0]
-                return last_trade[
-                    "isBuyer"
-                ]  # True se a última ordem foi compra, False se foi venda
-            else:
-                # Se não houver negociações, assume que a posição é vendida (ou neutra)
-                return False
-        except BinanceAPIException as e:
-            erro_logger.exception(
-                f"Erro na Binance API ao obter a posição de negociação: {e}"
-            )
-            return False  # Retorna False em caso de erro para evitar compras acidentais
-        except Exception as e:
-            erro_logger.exception(f"Erro ao obter a posição de negociação: {e}")
-            return False
+        # True se a última execução foi compra, False se foi venda (ou sem negociações).
+        # Vem do ledger local, conferido com a exchange só na inicialização e no timer lento.
+        return self.position_ledger.is_long(self.operation_code)
 
     # Prints
 
     def printAllWallet(self):
         # Printa toda a carteira
-        for stock in self.account_data["balances"]:
-            if float(stock["free"]) > 0:
-                print(stock)
+        for asset, balance in self.user_stream.balances.items():
+            if balance["free"] > 0:
+                print(self.user_stream.get_balance(asset))
 
     def printStock(self):
         # Printa o ativo definido na classe
-        for stock in self.account_data["balances"]:
-            if stock["asset"] == self.stock_code:
-                print(stock)
+        stock = self.user_stream.get_balance(self.stock_code)
+        if stock:
+            print(stock)
 
     def printBrl(self):
-        for stock in self.account_data["balances"]:
-            if stock["asset"] == "BRL":
-                print(stock)
+        stock = self.user_stream.get_balance("BRL")
+        if stock:
+            print(stock)
 
     def getStockData(self):
-        candles = self.client_binance.get_klines(
-            symbol=self.operation_code, interval=self.candle_period, limit=500
-        )
-        prices = pd.DataFrame(
-            candles,
-            columns=[
-                "open_time",
-                "open_price",
-                "high_price",
-                "low_price",
-                "close_price",
-                "volume",
-                "close_time",
-                "quote_asset_volume",
-                "number_of_trades",
-                "taker_buy_base_asset_volume",
-                "taker_buy_quote_asset_volume",
-                "ignore",
-            ],
-        )
-        prices = prices[["close_price", "open_time"]]
-        prices["open_time"] = (
-            pd.to_datetime(prices["open_time"], unit="ms")
-            .dt.tz_localize("UTC")
-            .dt.tz_convert("America/Sao_Paulo")
-        )
-        return prices
+        candles = None
+        if len(self.candles):
+            # Só o delta: do último candle conhecido (ainda aberto) em diante
+            candles = self.client_binance.get_klines(
+                symbol=self.operation_code,
+                interval=self.candle_period,
+                startTime=int(self.candles.last("open_time")),
+                limit=KLINES_LIMIT,
+            )
+            if len(candles) == KLINES_LIMIT:
+                # Parado por mais de KLINES_LIMIT candles: recarrega a janela recente
+                candles = None
+        if candles is None:
+            candles = self.client_binance.get_klines(
+                symbol=self.operation_code,
+                interval=self.candle_period,
+                limit=KLINES_LIMIT,
+            )
+        # A mesma série é reaproveitada a cada tick: só candles novos (ou o
+        # último, ainda aberto) são gravados no buffer
+        candles = parse_klines(candles)
+        self.candles.extend(candles)
+        self.archive_closed_candles(candles)
+        return self.candles
+
+    def archive_closed_candles(self, candles):
+        """Envia ao banco, em segundo plano, os candles fechados ainda não gravados."""
+        closed = candles[candles["close_time"] < time.time() * 1000]
+        if self.last_archived_open_time is not None:
+            closed = closed[closed["open_time"] > self.last_archived_open_time]
+        if len(closed):
+            self.last_archived_open_time = int(closed["open_time"][-1])
+            write_behind.submit(save_candles_to_db, self.operation_code, closed)
+
+    # Checkpoint
+
+    def save_checkpoint(self):
+        """Grava o estado do robô e a série de candles de forma atômica."""
+        try:
+            save_json_checkpoint(
+                self.checkpoint_file,
+                {field: getattr(self, field) for field in BOT_STATE_FIELDS},
+            )
+            save_array_checkpoint(self.candles_checkpoint_file, self.candles.to_array())
+            self.strategy_engine.save_checkpoint()
+        except (OSError, TypeError, ValueError) as e:
+            erro_logger.error(f"Erro ao gravar o checkpoint de {self.name}: {e}")
+        self.last_checkpoint = time.monotonic()
+
+    def restore_checkpoint(self):
+        """
+        Restaura o estado e os candles do último checkpoint, se houver.
+
+        Com a série restaurada o primeiro tick busca só os candles que faltam.
+        """
+        state = load_json_checkpoint(self.checkpoint_file)
+        if state:
+            for field in BOT_STATE_FIELDS:
+                if field in state:
+                    setattr(self, field, state[field])
+        candles = load_array_checkpoint(self.candles_checkpoint_file)
+        if candles is not None and candles.dtype.names == tuple(FIELDS):
+            self.candles.extend(candles)
+        if state or len(self.candles):
+            bot_logger.info(
+                f"Checkpoint de {self.name} restaurado ({len(self.candles)} candles)."
+            )
 
     def calculate_profit(self, entry_price, quantity, current_price):
         """Calcula o lucro ou prejuízo de uma posição.
@@ -178,48 +321,27 @@ class BinanceTraderBot:
                 f"Lucro/Prejuízo da operação: {symbol}{abs(profit):.8f} USDT"
             )
 
-    def execute_trade(self, side):
+    def execute_trade(self, side, current_price=None):
         quantity = None  # Inicializa quantity como None
         try:
-            # Obtenha informações do símbolo para obter stepSize e minQty (quantidade mínima)
-            current_price = Decimal(
-                self.client_binance.get_symbol_ticker(symbol=self.operation_code)[
-                    "price"
-                ]
-            )
-            symbol_info = self.client_binance.get_symbol_info(self.operation_code)
-
-            step_size = min_quantity = min_notional = None
-
-            # Processa os filtros necessários
-            step_size = min_quantity = min_notional = 0
-            for filter in symbol_info["filters"]:
-                if filter["filterType"] == "LOT_SIZE":
-                    step_size = Decimal(filter["stepSize"])
-                    min_quantity = Decimal(filter["minQty"])
-                elif filter["filterType"] == "NOTIONAL":
-                    min_notional = Decimal(filter["minNotional"])
-
-            # Validação
-            if step_size == 0 or min_quantity == 0 or min_notional == 0:
-                raise ValueError(
-                    "Não foi possível obter 'stepSize', 'minQty' ou 'minNotional'"
-                )
+            # Usa o preço já obtido no tick; só consulta o ticker se não houver
+            if current_price is None:
+                current_price = self.client_binance.get_symbol_ticker(
+                    symbol=self.operation_code
+                )["price"]
+            current_price = Decimal(current_price)
 
-            # Verificando se os filtros estão presentes
-            if "filters" not in symbol_info:
-                raise ValueError(
-                    f"Os filtros não estão presentes para o símbolo {self.operation_code}. Verifique o par de moedas."
-                )
-            # Logar os filtros disponíveis para depuração
-            # for filter in symbol_info['filters']:
-            # print(filter)  # Isso ajudará a ver quais filtros estão disponíveis
+            # Filtros (stepSize, minQty, minNotional) vêm do cache do exchangeInfo
+            symbol_filters = self.exchange_info.get(self.operation_code)
+            step_size = symbol_filters.step_size
+            min_quantity = symbol_filters.min_qty
+            min_notional = symbol_filters.min_notional
 
             if side == SIDE_BUY:
                 balance = self.get_balance()
 
                 quantity = self.quantity_calculator.calculate_max_buy_quantity(
-                    symbol_info, balance, current_price
+                    symbol_filters, balance, current_price
                 )
 
                 # Arredonda para baixo para o step_size mais próximo
@@ -232,15 +354,6 @@ class BinanceTraderBot:
                     raise ValueError(
                         f"Quantidade de compra menor que o mínimo permitido: {min_quantity}"
                     )
-                order = self.client_binance.create_order(
-                    symbol=self.operation_code,
-                    side=SIDE_BUY,
-                    type=ORDER_TYPE_MARKET,
-                    quantity=str(quantity),
-                )
-                self.current_price_from_buy_order = get_current_price(
-                    self.operation_code
-                )
 
             elif side == SIDE_SELL:
                 # Obtem o saldo disponível do ativo
@@ -259,7 +372,7 @@ class BinanceTraderBot:
                     erro_logger.error(f"iniciando correção do valor da venda")
 
                     quantity = self.quantity_calculator.calculate_max_sell_quantity(
-                        symbol_info, available_balance, current_price
+                        symbol_filters, available_balance, current_price
                     )
 
                     # Arredonda para baixo para o step_size mais próximo
@@ -270,64 +383,55 @@ class BinanceTraderBot:
                     trade_logger.info(
                         f"Corrigindo ordem de VENDA: {self.operation_code}, Quantidade: {quantity}, Preço: {current_price}"
                     )
-                order = self.client_binance.create_order(
-                    symbol=self.operation_code,
-                    side=SIDE_SELL,
-                    type=ORDER_TYPE_MARKET,
-                    quantity=str(quantity),
-                )
 
-            if order["status"] == "FILLED":
-                (
-                    createLogOrder(order, OPERATION_CODE)
-                    if createLogOrder
-                    else "No log message"
-                )
-                self.actual_trade_position = True if side == SIDE_BUY else False
-                self.traded_quantity = float(order["executedQty"])
-                if self.actual_trade_position == True:
-                    self.entry_price = Decimal(order["fills"][0]["price"])
-                    self.purchased_quantity = Decimal(order["executedQty"])
+            order = self.order_engine.submit_market_order(
+                self.operation_code, side, quantity
+            )
+
+            if order["status"] in ("FILLED", "PARTIALLY_FILLED"):
+                if order["status"] == "FILLED":
+                    write_behind.submit(createLogOrder, order, self.operation_code)
                 else:
-                    current_price = Decimal(
-                        self.client_binance.get_symbol_ticker(
-                            symbol=self.operation_code
-                        )["price"]
+                    trade_logger.info(
+                        f"Ordem {side} parcialmente preenchida. Verifique o status da ordem."
                     )
-                profit = self.calculate_profit(
-                    self.entry_price, self.purchased_quantity, current_price
-                )
-                self.last_profit = profit  # Armazena o lucro
-                self.entry_price = None  # Reseta o entry_price
-                self.purchased_quantity = None
-                self.updateAllData()
-
-            elif order["status"] == "PARTIALLY_FILLED":
-                trade_logger.info(
-                    f"Ordem {side} parcialmente preenchida. Verifique o status da ordem."
-                )
-                self.actual_trade_position = True if side == SIDE_BUY else False
+
+                # Preço médio ponderado de todos os fills, sem nova consulta de preço
+                fill_price = weighted_fill_price(order)
+                realized_before = self.position_ledger.get(
+                    self.operation_code
+                ).realized_pnl
+                position = self.position_ledger.apply_order(order)
+
+                self.actual_trade_position = side == SIDE_BUY
                 self.traded_quantity = float(order["executedQty"])
-                if self.actual_trade_position == True:
-                    self.entry_price = Decimal(order["fills"][0]["price"])
+                if self.actual_trade_position:
+                    self.entry_price = fill_price
                     self.purchased_quantity = Decimal(order["executedQty"])
+                    self.current_price_from_buy_order = fill_price
+                    self.risk_watcher.arm(fill_price)
                 else:
-                    current_price = Decimal(
-                        self.client_binance.get_symbol_ticker(
-                            symbol=self.operation_code
-                        )["price"]
+                    # Lucro realizado da venda (já descontada a comissão)
+                    self.last_profit = position.realized_pnl - realized_before
+                    symbol = "+" if self.last_profit >= 0 else "-"
+                    bot_logger.info(
+                        f"Lucro/Prejuízo da operação: {symbol}{abs(self.last_profit):.8f} USDT"
                     )
-                profit = self.calculate_profit(
-                    self.entry_price, self.purchased_quantity, current_price
-                )
-                self.last_profit = profit  # Armazena o lucro
-                self.entry_price = None  # Reseta o entry_price
-                self.purchased_quantity = None
-                self.updateAllData()
+                    self.entry_price = None  # Reseta o entry_price
+                    self.purchased_quantity = None
+                    self.risk_watcher.disarm()
+                if not self.user_stream.live:
+                    # Sem o stream (paper, mock, backtest) o saldo em cache é o
+                    # de antes da ordem; a próxima venda (ex: do RiskWatcher,
+                    # antes do tick) precisa do saldo novo
+                    self.user_stream.reconcile()
+                # Posição mudou: não espera o checkpoint periódico
+                self.save_checkpoint()
 
             return order
 
         except BinanceAPIException as e:
+            self.exchange_info.handle_order_error(e)
             erro_logger.exception(
                 f"Erro da Binance API ({side}): {e}, quantity: {quantity}"
             )
@@ -341,14 +445,57 @@ class BinanceTraderBot:
             )
             return None
 
+    def update_strategy_params(self, strategy_params):
+        """
+        Troca os parâmetros da estratégia sem reiniciar o robô.
+
+        Vale a partir do próximo tick; cliente, streams, caches e o estado da
+        estratégia continuam os mesmos.
+        """
+        self.strategy_params = {**DEFAULT_STRATEGY_PARAMS, **strategy_params}
+        self.strategy_engine.update_params(self.strategy_params)
+        bot_logger.info(
+            f"Parâmetros da estratégia de {self.operation_code} atualizados: {self.strategy_params}"
+        )
+
     def get_balance(self):
-        account_info = self.client_binance.get_account()
-        for asset in account_info["balances"]:
-            if asset["asset"] == "USDT":
-                return float(asset["free"])
-        return 0.0
+        return float(self.user_stream.get_free("USDT"))
+
+    def _risk_exit(self, reason, price):
+        """Venda disparada pelo RiskWatcher (stop-loss, trailing ou take profit)."""
+        with self._trade_lock:
+            if not self.getActualTradePositionForBinance():
+                return None  # O tick já vendeu
+            trade_logger.info(
+                f"Saída por {reason}: {self.operation_code} a {price:.8f} (fora do tick)"
+            )
+            order = self.execute_trade(SIDE_SELL, Decimal(str(price)))
+            self.actual_trade_position = self.getActualTradePositionForBinance()
+            if self.actual_trade_position:
+                # Venda falhou: volta a vigiar a posição com o stop já atingido,
+                # depois de uma espera (não repete a ordem a cada preço)
+                delay = self.risk_watcher.retry()
+                erro_logger.error(
+                    f"Saída por {reason} de {self.operation_code} falhou; "
+                    f"nova tentativa em {delay:.0f}s."
+                )
+            return order
 
     def execute(self):
+        """
+        Executa um tick do robô: atualiza os dados, roda a estratégia e envia
+        a ordem se for o caso.
+
+        Returns:
+            bool: Decisão da estratégia (None para manter ou se o tick falhou).
+        """
+        ma_trade_decision = None
+
+        # Circuito da Binance aberto: pula o tick em vez de bloquear o loop
+        if not self.binance_breaker.available():
+            bot_logger.warning("Binance indisponível (circuito aberto); tick ignorado.")
+            metrics.log_snapshot(every=METRICS_LOG_SECONDS)
+            return None
 
         try:
             self.updateAllData()
@@ -358,10 +505,10 @@ class BinanceTraderBot:
                 f'Executado: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'
             )  # Adiciona o horário atual
             print(
-                f'Posição atual: {"Comprado" if MaTrader.actual_trade_position else "Vendido" }'
+                f'Posição atual: {"Comprado" if self.actual_trade_position else "Vendido" }'
             )
             print(
-                f"Balanço atual: {MaTrader.last_stock_account_balance} ({self.stock_code})"
+                f"Balanço atual: {self.last_stock_account_balance} ({self.stock_code})"
             )
             if self.last_profit is not None:  # Exibe apenas se houver lucro registrado.
                 print(f"Lucro da última venda: {self.last_profit:.8f} USDT")
@@ -382,46 +529,92 @@ class BinanceTraderBot:
             # Usa getActualTradePositionForBinance para obter a posição atual do trade
             self.actual_trade_position = self.getActualTradePositionForBinance()
 
-            # Cria uma instância da classe `estrategies`
-            estrategias = getMovingAverageVergenceRSI.getMovingAverageVergenceRSI(
-                stock_data=self.stock_data,
-                operation_code=OPERATION_CODE,  # Passa o código da operação
-                actual_trade_position=self.actual_trade_position,
-                current_price_from_buy_order=self.current_price_from_buy_order,
-            )
-
-            ma_trade_decision = estrategias.getMovingAverageVergenceRSI(
-                fast_window=7,
-                slow_window=40,
-                volatility_factor=0.3,
-                initial_purchase_price=self.traded_quantity,
+            # Mesma estratégia a cada tick: o estado entre ticks fica em memória
+            ma_trade_decision = self.strategy_engine.decide(
+                self.stock_data,
+                self.actual_trade_position,
+                self.current_price_from_buy_order,
+                self.traded_quantity,
             )
+            if time.monotonic() - self.last_checkpoint >= CHECKPOINT_SECONDS:
+                self.save_checkpoint()
 
             # Executa a ordem de compra/venda se a decisão da estratégia for verdadeira
-            if ma_trade_decision is not None and BACKTESMODE is not True:
-                if ma_trade_decision and not self.actual_trade_position:
-                    self.execute_trade(SIDE_BUY)
-                    self.actual_trade_position = (
-                        self.getActualTradePositionForBinance()
-                    )  # ou True, se tiver certeza da compra
-                elif not ma_trade_decision and self.actual_trade_position:
-                    self.execute_trade(SIDE_SELL)
-                    self.actual_trade_position = (
-                        self.getActualTradePositionForBinance()
-                    )  # ou False, se tiver certeza da venda
-
-        except BinanceRequestException as e:  # Captura erros de requisição da Binance
+            if ma_trade_decision is not None and self.backtest_mode is not True:
+                with self._trade_lock:
+                    # O RiskWatcher pode ter vendido durante o tick
+                    self.actual_trade_position = self.getActualTradePositionForBinance()
+                    if ma_trade_decision and not self.actual_trade_position:
+                        self.execute_trade(SIDE_BUY, self.strategy_engine.current_price)
+                        self.actual_trade_position = (
+                            self.getActualTradePositionForBinance()
+                        )  # ou True, se tiver certeza da compra
+                    elif not ma_trade_decision and self.actual_trade_position:
+                        self.execute_trade(SIDE_SELL, self.strategy_engine.current_price)
+                        self.actual_trade_position = (
+                            self.getActualTradePositionForBinance()
+                        )  # ou False, se tiver certeza da venda
+            if not self.backtest_mode:
+                # Posição mudada fora do robô (ou saída que falhou) volta a ser vigiada
+                self.risk_watcher.sync(
+                    self.actual_trade_position, self.current_price_from_buy_order
+                )
+
+        except (
+            BinanceRequestException,
+            BinanceAPIException,
+            RequestException,
+        ) as e:  # Captura erros de requisição da Binance
+            # As novas tentativas com backoff já foram feitas em updateAllData; o
+            # circuito da Binance decide quando voltar a tentar.
             erro_logger.error(f"Erro de requisição da Binance: {e}")
-            bot_logger.warning("Tentando reconectar à Binance em 60 segundos...")
-            time.sleep(60)  # Aguarda 60 segundos antes de tentar novamente
+        except CircuitOpenError as e:
+            bot_logger.warning(f"{e}; tick ignorado.")
 
+        metrics.log_snapshot(every=METRICS_LOG_SECONDS)
+        return ma_trade_decision
 
-# Cria as tabelas do banco de dados
-create_tables()
-# Main execution loop
-MaTrader = BinanceTraderBot(
-    STOCK_CODE, OPERATION_CODE, TRADED_QUANTITY, 100, CANDLE_PERIOD
-)
-while True:
-    MaTrader.execute()
-    time.sleep(60)
+
+def main():
+    """Carrega o .env, cria as tabelas e roda o loop principal do robô."""
+    import logging
+    import os
+    from dotenv import load_dotenv
+    from db.neonDbConfig import create_tables
+
+    # Load environment variables
+    load_dotenv()
+    # Cria as tabelas do banco de dados
+    create_tables()
+
+    paper_exchange = None
+    if PAPERMODE:
+        from functions.binance.PaperExchange import PaperExchange
+
+        paper_exchange = PaperExchange(
+            fee_rate=os.getenv("PAPER_FEE_RATE", "0.001"),
+            slippage_bps=float(os.getenv("PAPER_SLIPPAGE_BPS", "0")),
+        )
+    trader = BinanceTraderBot(
+        STOCK_CODE,
+        OPERATION_CODE,
+        TRADED_QUANTITY,
+        100,
+        CANDLE_PERIOD,
+        backtest_mode=BACKTESMODE and not PAPERMODE,
+        paper_exchange=paper_exchange,
+    )
+    try:
+        # Main execution loop
+        while True:
+            trader.execute()
+            time.sleep(60)
+    finally:
+        trader.save_checkpoint()
+        write_behind.flush()
+        # Fechar handlers ao final da execução para liberar recursos
+        logging.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Comparação entre o classificador local e o Gemini na decisão final.
+
+Lê os ticks gravados no diário de decisões (JOURNAL_DIR ou --journal) e, em
+cada robô, separa a série no tempo: o começo treina o classificador local
+(ou usa LOCAL_MODEL_PATH / --model) e o fim, que o modelo não viu, é usado na
+avaliação. Nos ticks avaliados o Gemini recebe a mesma linha que a estratégia
+enviou (TickReport.render_prompt), e o script mostra o acerto do modelo local,
+a concordância com o Gemini e a latência de cada um.
+
+Uso:
+    python advisor_benchmark.py --journal journal --samples 30
+    python advisor_benchmark.py --stub      # Gemini simulado pelo StubModelServer
+
+Sem GEMINI_API_KEY (e sem --stub) mede apenas o classificador local.
+"""
+
+import argparse
+import os
+import statistics
+import time
+import numpy as np
+
+
+def split_journal(journal, train_fraction, horizon, threshold):
+    """
+    Linhas do diário por robô, separadas em treino (começo) e avaliação (fim).
+
+    Returns:
+        dict: {robô: (linhas, características, rótulos, início da avaliação)}.
+    """
+    from functions.InteligenciaArtificial.LocalClassifier import (
+        journal_features,
+        label_outcomes,
+    )
+
+    series = {}
+    for bot in journal.bots():
+        rows = journal.query(bots=[bot])
+        if len(rows["price"]) <= horizon:
+            continue
+        features = journal_features(rows)
+        labels = label_outcomes(rows["price"], horizon, threshold)
+        series[bot] = (rows, features, labels, int(len(labels) * train_fraction))
+    return series
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Acerto e latência do classificador local x Gemini, no diário de decisões."
+    )
+    parser.add_argument("--journal", default=os.getenv("JOURNAL_DIR", "journal"))
+    parser.add_argument("--model", default=os.getenv("LOCAL_MODEL_PATH"))
+    parser.add_argument(
+        "--train-fraction", type=float, default=0.7, help="Parte inicial de cada série usada no treino."
+    )
+    parser.add_argument("--samples", type=int, default=20, help="Ticks avaliados no Gemini por robô.")
+    parser.add_argument("--horizon", type=int, default=4)
+    parser.add_argument("--threshold", type=float, default=0.002)
+    parser.add_argument("--stub", action="store_true", help="Usa o StubModelServer local.")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    from functions.DecisionJournal import DecisionJournal
+    from functions.InteligenciaArtificial.LocalClassifier import CLASS_DECISIONS, LocalClassifier
+    from functions.TickReport import TickReport
+
+    series = split_journal(
+        DecisionJournal(args.journal), args.train_fraction, args.horizon, args.threshold
+    )
+    if not series:
+        print(f"Diário vazio em {args.journal}; rode os robôs com JOURNAL_DIR antes.")
+        return
+
+    if args.model:
+        model = LocalClassifier.load(args.model)
+    else:
+        # Sem modelo gravado: treina só com o começo de cada série
+        model = LocalClassifier().fit(
+            np.vstack([features[:split] for _, features, _, split in series.values()]),
+            np.concatenate([labels[:split] for _, _, labels, split in series.values()]),
+        )
+
+    stub = None
+    if args.stub:
+        from functions.InteligenciaArtificial.StubModelServer import StubModelServer
+
+        stub = StubModelServer(latency_ms=300, latency_jitter_ms=200, seed=args.seed).start()
+        os.environ["GEMINI_API_URL"] = stub.base_url
+        os.environ.setdefault("GEMINI_API_KEY", "stub")
+    use_gemini = bool(os.getenv("GEMINI_API_KEY"))
+
+    # Avaliação: só os ticks fora do treino, com características e resultado conhecidos
+    local_times, gemini_times = [], []
+    evaluated, correct, compared, agreed = 0, 0, 0, 0
+    for rows, features, labels, split in series.values():
+        held_out = [
+            index
+            for index in range(split, len(labels))
+            if labels[index] >= 0 and not np.isnan(features[index]).any()
+        ]
+        for index in held_out:
+            started = time.perf_counter()
+            local_decision, _ = model.decide(features[index])
+            local_times.append(time.perf_counter() - started)
+            evaluated += 1
+            correct += local_decision == CLASS_DECISIONS[labels[index]]
+
+        if not use_gemini:
+            continue
+        from functions.InteligenciaArtificial.GeminiTradingBot import GeminiTradingBot
+
+        for index in held_out[-args.samples :]:
+            row = {name: values[index] for name, values in rows.items() if name != "bot"}
+            prompt = TickReport.from_journal_row(str(row.pop("symbol")), row).render_prompt()
+            started = time.perf_counter()
+            response, gemini_decision = GeminiTradingBot(prompt).geminiTrader()
+            gemini_times.append(time.perf_counter() - started)
+            if response is not None:
+                compared += 1
+                agreed += gemini_decision == model.decide(features[index])[0]
+
+    print("\n--------------- Classificador local x Gemini ---------------")
+    print(
+        f"Diário: {args.journal} ({len(series)} robô(s)); "
+        f"avaliados {evaluated} ticks fora do treino"
+    )
+    if evaluated:
+        print(
+            f"Local: acerto {correct / evaluated:.1%}, "
+            f"mediana {statistics.median(local_times) * 1e6:.0f} µs por tick"
+        )
+    if gemini_times:
+        print(
+            f"Gemini{' (stub)' if stub else ''}: mediana {statistics.median(gemini_times) * 1000:.0f} ms, "
+            f"máximo {max(gemini_times) * 1000:.0f} ms"
+        )
+        if compared:
+            print(f"Concordância: {agreed}/{compared} ({agreed / compared:.0%})")
+        else:
+            print("Concordância: sem respostas válidas do Gemini.")
+    else:
+        print("Gemini: não medido (defina GEMINI_API_KEY ou use --stub).")
+
+    if stub is not None:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
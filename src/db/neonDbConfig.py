@@ -1,18 +1,37 @@
 from decimal import Decimal
-import psycopg2
-from psycopg2 import sql
-from datetime import datetime
+from datetime import datetime, timezone
+import json
 import os
+from functions.resilience import get_breaker, retry_call, CircuitOpenError
 
-# String de conexão ao NeonDB
-connection_string = os.getenv("NEON_DB_STRING_KEY")
+# Após 3 falhas seguidas o banco é ignorado por 60 s (sem esperar o timeout de conexão)
+db_breaker = get_breaker("neondb", failure_threshold=3, reset_timeout=60)
 
 
 def connect_to_db():
-    """Conecta ao banco de dados e retorna a conexão."""
+    """
+    Conecta ao banco de dados e retorna a conexão.
+
+    Tenta de novo com backoff em falhas de rede; com o circuito do banco aberto
+    retorna None na hora. Quem chama deve tratar o retorno None.
+    """
+    # String de conexão ao NeonDB (lida na hora, depois do load_dotenv)
+    connection_string = os.getenv("NEON_DB_STRING_KEY")
     try:
-        conn = psycopg2.connect(connection_string)
-        return conn
+        # Importado aqui para não pesar no import dos módulos que usam o banco;
+        # sem o psycopg2 o bot segue sem banco, como em qualquer outra falha
+        import psycopg2
+
+        return retry_call(
+            psycopg2.connect,
+            connection_string,
+            connect_timeout=5,
+            attempts=2,
+            retry_on=(psycopg2.OperationalError,),
+            breaker=db_breaker,
+        )
+    except CircuitOpenError:
+        return None
     except Exception as e:
         print(f"Erro ao conectar ao banco de dados: {e}")
         return None
@@ -91,6 +110,23 @@ def create_tables():
                 """
                 )
 
+                cur.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS bot_positions (
+                       bot VARCHAR(100) NOT NULL,
+                       mode VARCHAR(20) NOT NULL,
+                       symbol VARCHAR(50) NOT NULL,
+                       quantity NUMERIC NOT NULL DEFAULT 0,
+                       avg_entry_price NUMERIC NOT NULL DEFAULT 0,
+                       realized_pnl NUMERIC NOT NULL DEFAULT 0,
+                       last_side VARCHAR(10),
+                       fees TEXT,
+                       updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                       PRIMARY KEY (bot, mode, symbol)
+                    );
+                """
+                )
+
                 conn.commit()
                 print("Tabelas criadas/verificadas com sucesso!")
             except Exception as e:
@@ -255,8 +291,140 @@ def get_account_balance(currency):
         return None
 
 
+def save_position(bot, mode, symbol, quantity, avg_entry_price, realized_pnl, last_side, fees=None):
+    """Grava (upsert) a posição de um símbolo do PositionLedger de um robô."""
+    conn = connect_to_db()
+    if conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(
+                    """
+                    INSERT INTO bot_positions
+                        (bot, mode, symbol, quantity, avg_entry_price, realized_pnl, last_side, fees)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (bot, mode, symbol) DO UPDATE SET
+                        quantity = EXCLUDED.quantity,
+                        avg_entry_price = EXCLUDED.avg_entry_price,
+                        realized_pnl = EXCLUDED.realized_pnl,
+                        last_side = EXCLUDED.last_side,
+                        fees = EXCLUDED.fees,
+                        updated_at = CURRENT_TIMESTAMP;
+                """,
+                    (
+                        bot,
+                        mode,
+                        symbol,
+                        quantity,
+                        avg_entry_price,
+                        realized_pnl,
+                        last_side,
+                        json.dumps({asset: str(amount) for asset, amount in (fees or {}).items()}),
+                    ),
+                )
+                conn.commit()
+            except Exception as e:
+                print(f"Erro ao salvar posição: {e}")
+                conn.rollback()
+        conn.close()
+
+
+def get_positions(bot, mode):
+    """
+    Recupera as posições salvas de um robô.
+
+    Returns:
+        dict: {symbol: (quantity, avg_entry_price, realized_pnl, last_side, fees)}.
+    """
+    conn = connect_to_db()
+    if conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(
+                    """
+                    SELECT symbol, quantity, avg_entry_price, realized_pnl, last_side, fees
+                    FROM bot_positions WHERE bot = %s AND mode = %s
+                """,
+                    (bot, mode),
+                )
+                rows = cur.fetchall()
+                conn.close()
+                return {
+                    row[0]: (*row[1:5], json.loads(row[5]) if row[5] else {}) for row in rows
+                }
+            except Exception as e:
+                print(f"Erro ao buscar posições: {e}")
+                conn.close()
+                return {}
+    else:
+        return {}
+
+
+def _utc_from_ms(ms):
+    # Mesmo formato de pd.to_datetime(unit="ms"): UTC sem fuso
+    return datetime.fromtimestamp(int(ms) / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def save_candles_to_db(symbol, candles, limit=1000):
+    """
+    Grava candles fechados na tabela candlestick_data, mantendo só os `limit` mais recentes.
+
+    Args:
+        symbol (str): Par de negociação (ex: 'SOLUSDT').
+        candles (np.ndarray): Array estruturado de parse_klines/CandleSeries.
+        limit (int): Número máximo de registros mantidos na tabela.
+    """
+    if len(candles) == 0:
+        return
+    conn = connect_to_db()
+    if conn is None:
+        return
+    rows = [
+        (
+            symbol,
+            _utc_from_ms(candle["open_time"]),
+            float(candle["open"]),
+            float(candle["high"]),
+            float(candle["low"]),
+            float(candle["close"]),
+            float(candle["volume"]),
+            _utc_from_ms(candle["close_time"]),
+        )
+        for candle in candles[-limit:]
+    ]
+    with conn.cursor() as cur:
+        try:
+            cur.executemany(
+                """
+                INSERT INTO candlestick_data (symbol, open_time, open, high, low, close, volume, close_time)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
+            """,
+                rows,
+            )
+            cur.execute("SELECT COUNT(*) FROM candlestick_data;")
+            count = cur.fetchone()[0]
+            if count > limit:
+                cur.execute(
+                    """
+                    DELETE FROM candlestick_data
+                    WHERE id IN (
+                        SELECT id FROM candlestick_data
+                        ORDER BY open_time ASC
+                        LIMIT %s
+                    );
+                """,
+                    (count - limit,),
+                )
+            conn.commit()
+        except Exception as e:
+            print(f"Erro ao salvar candles: {e}")
+            conn.rollback()
+    conn.close()
+
+
 def save_gradients_to_db_with_limit(fast_gradient, slow_gradient, limit=10):
     conn = connect_to_db()
+    if conn is None:
+        return
     cursor = conn.cursor()
 
     # Converter np.float64 para float
@@ -291,6 +459,7 @@ def save_gradients_to_db_with_limit(fast_gradient, slow_gradient, limit=10):
             (count - limit,),
         )
         conn.commit()
+    conn.close()
 
 
 def get_last_gradients_from_db():
@@ -305,6 +474,8 @@ def get_last_gradients_from_db():
               ou None se não houver registros.
     """
     conn = connect_to_db()
+    if conn is None:
+        return None
     try:
         with conn.cursor() as cursor:
             # Query para obter os últimos gradientes pelo timestamp mais recente
@@ -317,6 +488,7 @@ def get_last_gradients_from_db():
             cursor.execute(query)
             result = cursor.fetchone()
 
+            conn.close()  # Fecha a conexão com o banco de dados
             if result:
                 # Retorna os valores como um dicionário
                 return {
@@ -326,7 +498,6 @@ def get_last_gradients_from_db():
             else:
                 print("Nenhum gradiente encontrado no banco de dados.")
                 return None
-        conn.close()  # Fecha a conexão com o banco de dados
     except Exception as e:
         print(f"Erro ao recuperar gradientes do banco de dados: {e}")
         conn.close()  # Fecha a conexão com o banco de dados
@@ -0,0 +1,56 @@
+import queue
+import threading
+from functions.logger import erro_logger
+
+
+class WriteBehindQueue:
+    """
+    Executa gravações no banco de dados em uma thread de fundo.
+
+    O caminho de ordens apenas enfileira a gravação (ex: log_trade,
+    save_position) e segue em frente, sem esperar a ida e volta ao NeonDB.
+    """
+
+    def __init__(self, max_size=10000):
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="db-write-behind", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                erro_logger.exception(
+                    f"Erro na gravação em segundo plano ({func.__name__}): {e}"
+                )
+            finally:
+                self._queue.task_done()
+
+    def submit(self, func, *args, **kwargs):
+        """Enfileira func(*args, **kwargs) para execução em segundo plano."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((func, args, kwargs))
+        except queue.Full:
+            erro_logger.error(
+                f"Fila de gravação cheia; executando {func.__name__} de forma síncrona."
+            )
+            func(*args, **kwargs)
+
+    def flush(self):
+        """Bloqueia até todas as gravações pendentes terminarem."""
+        self._queue.join()
+
+
+# Fila compartilhada por todo o processo
+write_behind = WriteBehindQueue()
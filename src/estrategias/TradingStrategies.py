@@ -1,6 +1,7 @@
 import numpy as np
 from functions.logger import erro_logger, bot_logger
-from functions.indicadores.RsiCalculationClass import TechnicalIndicators
+from functions.indicadores.IndicatorRegistry import indicator_registry
+from functions.CandleSeries import CandleSeries
 
 
 # strategies.py
@@ -17,7 +18,8 @@ class estrategies:
         operation_code=None,
         actual_trade_position=None,
     ):
-        self.stock_data = stock_data
+        # Série somente-leitura: a estratégia não escreve colunas nos dados de quem chama
+        self.stock_data = CandleSeries.wrap(stock_data)
         self.volume_threshold = volume_threshold
         self.rsi_period = rsi_period
         self.rsi_upper = rsi_upper
@@ -27,7 +29,6 @@ class estrategies:
         self.entry_price = None
         self.operation_code = operation_code
         self.actual_trade_position = actual_trade_position
-        self.indicators = TechnicalIndicators(stock_data, rsi_period)
 
     def message_bot_logger_info(self, message):
         bot_logger.info(message)
@@ -35,16 +36,16 @@ class estrategies:
     def getMovingAverage(self, fast_window=7, slow_window=40):
 
         # Calcula as Médias Móveis Rápida e Lenta
-        self.stock_data["ma_fast"] = (
-            self.stock_data["close_price"].rolling(window=fast_window).mean()
+        ma_fast = indicator_registry.compute(
+            self.stock_data, "sma", window=fast_window
         )  # Média Rápida
-        self.stock_data["ma_slow"] = (
-            self.stock_data["close_price"].rolling(window=slow_window).mean()
+        ma_slow = indicator_registry.compute(
+            self.stock_data, "sma", window=slow_window
         )  # Média Lenta
 
         # Pega as últimas Moving Average
-        last_ma_fast = self.stock_data["ma_fast"].iloc[-1]
-        last_ma_slow = self.stock_data["ma_slow"].iloc[-1]
+        last_ma_fast = ma_fast[-1]
+        last_ma_slow = ma_slow[-1]
 
         # Toma a decisão, baseada na posição da média móvel
         # (False = Vender, True = Comprar)
@@ -75,28 +76,18 @@ class estrategies:
     def getBolingerBands(self, window=20, factor=2):
         # Executa a estratégia de bollinger bands
 
-        self.stock_data["bb_mean"] = (
-            self.stock_data["close_price"].rolling(window=window).mean()
-        )
-        self.stock_data["bb_std"] = (
-            self.stock_data["close_price"].rolling(window=window).std()
-        )
-        self.stock_data["bb_upper"] = (
-            self.stock_data["bb_mean"] + factor * self.stock_data["bb_std"]
-        )
-        self.stock_data["bb_lower"] = (
-            self.stock_data["bb_mean"] - factor * self.stock_data["bb_std"]
-        )
+        close = self.stock_data.close
+        bb_mean = indicator_registry.compute(self.stock_data, "sma", window=window)[-1]
+        bb_std = indicator_registry.compute(self.stock_data, "std", window=window)[-1]
+        bb_upper = bb_mean + factor * bb_std
+        bb_lower = bb_mean - factor * bb_std
 
-        bb_trade_decision = (
-            self.stock_data["bb_lower"].iloc[-1]
-            > self.stock_data["close_price"].iloc[-1]
-        )  # True = Comprar
+        bb_trade_decision = bb_lower > close[-1]  # True = Comprar
 
         print("-----")
         print(f"Estratégia executada: Bollinger Bands")
         print(
-            f'{self.operation_code}: {self.stock_data["bb_mean"].iloc[-1]:.3f} - Média Bollinger \n {self.stock_data["bb_upper"].iloc[-1]:.3f} - Bollinger Superior \n {self.stock_data["bb_lower"].iloc[-1]:.3f} - Bollinger Inferior \n {self.stock_data["close_price"].iloc[-1]:.3f} - Valor Atual'
+            f"{self.operation_code}: {bb_mean:.3f} - Média Bollinger \n {bb_upper:.3f} - Bollinger Superior \n {bb_lower:.3f} - Bollinger Inferior \n {close[-1]:.3f} - Valor Atual"
         )
         print(
             f'Decisão de posição: {"Comprar" if bb_trade_decision == True else "Vender"}'
@@ -115,24 +106,18 @@ class estrategies:
     ):
         try:
             # Calcula as médias móveis e a volatilidade
-            self.stock_data["ma_fast"] = (
-                self.stock_data["close_price"].rolling(window=fast_window).mean()
-            )
-            self.stock_data["ma_slow"] = (
-                self.stock_data["close_price"].rolling(window=slow_window).mean()
-            )
-            self.stock_data["volatility"] = (
-                self.stock_data["close_price"].rolling(window=slow_window).std()
+            ma_fast = indicator_registry.compute(self.stock_data, "sma", window=fast_window)
+            ma_slow = indicator_registry.compute(self.stock_data, "sma", window=slow_window)
+            volatility_series = indicator_registry.compute(
+                self.stock_data, "std", window=slow_window
             )
 
-            last_ma_fast = self.stock_data["ma_fast"].iloc[-1]
-            last_ma_slow = self.stock_data["ma_slow"].iloc[-1]
-            prev_ma_fast = self.stock_data["ma_fast"].iloc[-2]
-            prev_ma_slow = self.stock_data["ma_slow"].iloc[-2]
-            last_volatility = self.stock_data["volatility"].iloc[-1]
-            volatility = self.stock_data["volatility"][
-                len(self.stock_data) - slow_window :
-            ].mean()
+            last_ma_fast = ma_fast[-1]
+            last_ma_slow = ma_slow[-1]
+            prev_ma_fast = ma_fast[-2]
+            prev_ma_slow = ma_slow[-2]
+            last_volatility = volatility_series[-1]
+            volatility = np.nanmean(volatility_series[-slow_window:])
 
             fast_gradient = last_ma_fast - prev_ma_fast
             slow_gradient = last_ma_slow - prev_ma_slow
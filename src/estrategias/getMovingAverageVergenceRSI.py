@@ -1,24 +1,25 @@
+from concurrent.futures import TimeoutError
 from decimal import Decimal
-from http import client
-import os
+import numpy as np
 
-from werkzeug import Client
-from db.neonDbConfig import (
-    get_last_gradients_from_db,
-    save_gradients_to_db_with_limit,
-)
 
 
 from functions.InteligenciaArtificial.GeminiTradingBot import GeminiTradingBot
-from functions.binance.getActualTradePositionForBinance import (
-    getActualTradePositionForBinance,
+from functions.InteligenciaArtificial.DecisionCache import quantize_features
+from functions.InteligenciaArtificial.LLMAdvisor import gemini_advisor
+from functions.InteligenciaArtificial.BatchAdvisor import gemini_batch_advisor
+from functions.InteligenciaArtificial.LocalClassifier import (
+    CLASSES,
+    CLASS_DECISIONS,
+    feature_vector,
+    get_local_classifier,
+    local_batch_predictor,
 )
 from functions.indicadores.calculate_fast_gradients import calculate_fast_gradients
 from functions.indicadores.calculate_gradient_percentage_change import (
     calculate_gradient_percentage_change,
 )
 from functions.calculators.calculate_jump_threshold import calculate_jump_threshold
-from functions.indicadores.calculate_moving_average import calculate_moving_average
 from functions.calculators.calculate_recent_growth_value import (
     calculate_recent_growth_value,
 )
@@ -26,18 +27,16 @@ from functions.calculators.calculate_support_resistance_from_prices import (
     calculate_support_resistance_from_prices,
 )
 from functions.detect_new_price_jump import detect_new_price_jump
-from functions.get_current_price import get_current_price
-from functions.get_recent_prices import get_recent_prices
 from functions.logger import erro_logger, bot_logger
-from functions.indicadores.RsiCalculationClass import TechnicalIndicators
-from functions.CandlestickDataExtractor import CandlestickDataExtractor
+from functions.DecisionJournal import decision_index, late_answer_journal
+from functions.TickReport import TickReport, console_enabled
+from functions.indicadores.IndicatorRegistry import indicator_registry
+from functions.CandleSeries import CandleSeries
 from binance.client import Client
+from functions.binance.create_client import create_client
 
 from functions.update_fast_gradients import update_fast_gradients
 
-api_key = os.getenv("BINANCE_API_KEY")
-secret_key = os.getenv("BINANCE_SECRET_KEY")
-
 
 class getMovingAverageVergenceRSI:
     def __init__(
@@ -52,8 +51,10 @@ class getMovingAverageVergenceRSI:
         operation_code=None,
         actual_trade_position=None,
         current_price_from_buy_order=None,
+        client_binance=None,
     ):
-        self.stock_data = stock_data
+        # Série somente-leitura: a estratégia não escreve colunas nos dados de quem chama
+        self.stock_data = CandleSeries.wrap(stock_data)
         self.volume_threshold = volume_threshold
         self.rsi_period = rsi_period
         self.rsi_upper = rsi_upper
@@ -62,14 +63,16 @@ class getMovingAverageVergenceRSI:
         self.stop_gain = stop_gain
         self.entry_price = None
         self.operation_code = operation_code
+        # Nome do robô (StrategyEngine): consultas à IA e diário são por robô
+        self.bot_name = operation_code
         self.actual_trade_position = actual_trade_position
 
         # Variáveis adicionais
-        self.indicators = TechnicalIndicators(stock_data, rsi_period)
         self.last_fast_gradient = None
         self.last_slow_gradient = None
         self.prev_rsi = None
-        self.client_binance = Client(api_key, secret_key)
+        # Reaproveita o cliente do robô; criar um novo faz um ping na Binance
+        self.client_binance = client_binance or create_client()
         self.alerta_de_crescimento_rapido = False
         self.fast_gradients = []
         self.current_price = Decimal
@@ -80,13 +83,46 @@ class getMovingAverageVergenceRSI:
         self.percentage_fromUP_fast_gradient = None
         self.percentage_fromDOWN_fast_gradient = None
         self.max_price_resistenceZone = None
-        self.last_max_price_down_resistanceZone = 259.43
+        self.last_max_price_down_resistanceZone = 0
         self.min_price_supportZone = None
         self.last_min_price_up_supportZone = 0
         self.volatility_tracker = []
         self.current_volume = None
         self.min_gradient_difference = 0.02
-        self.actual_trade_position = None
+        # (fast_gradient, slow_gradient) do tick anterior, mantidos em memória
+        self.previous_gradients = None
+        # Relatório do último tick (valores, regra e decisões)
+        self.report = None
+
+    def _late_answer_writer(self, advisor, report):
+        """Grava no diário de respostas atrasadas a resposta que perdeu o prazo do tick."""
+        open_time = report.values.get("open_time")
+
+        def write(answer, elapsed):
+            decision, decision_bool = answer or (None, None)
+            late_answer_journal.append(
+                self.operation_code,
+                {
+                    "open_time": open_time,
+                    "advisor": advisor,
+                    "advisor_decision": decision_index(decision_bool) if decision else -1,
+                    "latency": elapsed,
+                },
+                bot=self.bot_name,
+            )
+
+        return write
+
+    def update_tick_data(
+        self, stock_data, actual_trade_position, current_price_from_buy_order
+    ):
+        """
+        Atualiza os dados do tick em uma instância que vive entre os ticks
+        (StrategyEngine), preservando o estado acumulado da estratégia.
+        """
+        self.stock_data = CandleSeries.wrap(stock_data)
+        self.actual_trade_position = actual_trade_position
+        self.current_price_from_buy_order = current_price_from_buy_order
 
     def getMovingAverageVergenceRSI(
         self,
@@ -103,42 +139,37 @@ class getMovingAverageVergenceRSI:
                 0.08  # Detectar correção quando o gradiente diminui pelo menos 0.3
             )
             ma_trade_decision = None
+            self.report = None
+            report = TickReport(self.operation_code)
             stop_loss_percentage = 0.05  # 5% abaixo do preço de compra
-            self.current_price = get_current_price(self.operation_code)
-
-            self.stock_data["ma_fast"] = (
-                self.stock_data["close_price"].rolling(window=fast_window).mean()
+            # Pelo cliente do robô: em paper/sim o preço vem da mesma exchange
+            # (mock ou simulada) que executa as ordens
+            self.current_price = Decimal(
+                self.client_binance.get_symbol_ticker(symbol=self.operation_code)["price"]
             )
-            self.stock_data["ma_slow"] = (
-                self.stock_data["close_price"].rolling(window=slow_window).mean()
+
+            # Indicadores compartilhados por todas as estratégias do tick
+            ma_fast = indicator_registry.compute(self.stock_data, "sma", window=fast_window)
+            ma_slow = indicator_registry.compute(self.stock_data, "sma", window=slow_window)
+            volatility_series = indicator_registry.compute(
+                self.stock_data, "std", window=slow_window
             )
-            self.stock_data["volatility"] = (
-                self.stock_data["close_price"].rolling(window=slow_window).std()
+            last_ma_fast = ma_fast[-1]
+            last_ma_slow = ma_slow[-1]
+            prev_ma_slow = ma_slow[-2]
+            prev_ma_fast = ma_fast[-2]
+
+            # Calcula o RSI e pega os dois últimos valores
+            rsi_values = indicator_registry.compute(
+                self.stock_data, "rsi", period=self.rsi_period
             )
-            last_ma_fast = self.stock_data["ma_fast"].iloc[-1]
-            last_ma_slow = self.stock_data["ma_slow"].iloc[-1]
-            prev_ma_slow = self.stock_data["ma_slow"].iloc[-2]
-            prev_ma_fast = self.stock_data["ma_fast"].iloc[-2]
-
-            # instanciar a instância da classe RSICalculationClass
-            # Após calcular o RSI
-            self.indicators.calculate_rsi()
-
-            # Verifique se a coluna 'rsi' existe e pegue o último valor
-            if "rsi" in self.stock_data:
-                last_rsi = self.stock_data["rsi"].iloc[-1]
-                self.prev_rsi = self.stock_data["rsi"].iloc[-2]
-            else:
-                raise ValueError(
-                    "Erro: a coluna 'rsi' não foi encontrada em 'self.stock_data' após o cálculo."
-                )
-
-            last_rsi = self.stock_data["rsi"].iloc[-1]
+            last_rsi = rsi_values[-1]
+            self.prev_rsi = rsi_values[-2]
 
-            last_volatility = self.stock_data["volatility"].iloc[-1]
-            volatility = self.stock_data["volatility"][
-                len(self.stock_data) - slow_window :
-            ].mean()  # Média da volatilidade dos últimos n valores
+            last_volatility = volatility_series[-1]
+            volatility = np.nanmean(
+                volatility_series[-slow_window:]
+            )  # Média da volatilidade dos últimos n valores
 
             hysteresis = max(0.01, volatility * 0.1)
 
@@ -147,25 +178,19 @@ class getMovingAverageVergenceRSI:
 
             gradient_difference = fast_gradient - slow_gradient
 
-            # Salvar os gradientes no banco de dados com limite
-            save_gradients_to_db_with_limit(fast_gradient, slow_gradient, limit=10)
-
-            # Recuperar os dois últimos gradientes para comparação
-            gradients_from_db = get_last_gradients_from_db()
-
-            if gradients_from_db:
-                self.last_fast_gradient = gradients_from_db["prev_fast_gradient"]
-                self.last_slow_gradient = gradients_from_db["prev_slow_gradient"]
-
-                # Comparar os gradientes
-                # if self.last_fast_gradient is not None:
-                #    print(
-                #        f"Comparação - Gradiente rápido anterior: {self.last_fast_gradient:.3f}, atual: {fast_gradient:.3f}"
-                #    )
-                # else:
-                #    print("Primeira execução, sem gradiente anterior para comparar.")
+            # Gradientes do tick anterior (em memória; no primeiro tick compara
+            # com os próprios valores atuais)
+            if self.previous_gradients is not None:
+                self.last_fast_gradient, self.last_slow_gradient = (
+                    self.previous_gradients
+                )
             else:
-                print("Nenhum gradiente encontrado no banco de dados.")
+                report.note("primeira_execucao")
+                self.last_fast_gradient, self.last_slow_gradient = (
+                    fast_gradient,
+                    slow_gradient,
+                )
+            self.previous_gradients = (fast_gradient, slow_gradient)
 
             current_difference = last_ma_fast - last_ma_slow
             volatility_by_purshase = volatility * volatility_factor
@@ -174,15 +199,13 @@ class getMovingAverageVergenceRSI:
             stop_loss_price = Decimal(self.current_price_from_buy_order) * Decimal(
                 1 - stop_loss_percentage
             )
-            print(f"Preço de stop-loss: {stop_loss_price:.2f}")
 
-            # Obter dados recentes de preços
-            prices, recent_volumes = get_recent_prices(
-                self, symbol=self.operation_code, interval=self.interval, limit=1000
-            )
+            # Preços e volumes recentes vêm da própria série de candles do robô
+            # (mesmos 1000 candles, sem uma segunda busca na Binance)
+            prices = self.stock_data.close.tolist()
+            recent_volumes = self.stock_data.volume
 
             self.current_volume = recent_volumes[-1]
-            print(f"Volume recente: {self.current_volume:.3f}")
 
             # Definin zonas de suporte e resistência
             support_resistance = calculate_support_resistance_from_prices(prices)
@@ -202,18 +225,10 @@ class getMovingAverageVergenceRSI:
             ):
                 self.last_min_price_up_supportZone = self.current_price
 
-            print(f"Preço atual: {self.current_price:.2f}")
-            print(f"Resistência: {self.max_price_resistenceZone:.2f}")
-            print(f"Suporte: {self.min_price_supportZone:.2f}")
-            print(
-                f"zona de resistência recente: {self.last_max_price_down_resistanceZone:.2f}"
-            )
-            print(
-                f"zona de suporte recente: {self.last_min_price_up_supportZone:.2f}\n"
-            )
-
             # Calculando os fast_gradients na estratégia
-            ma_fast_values = calculate_moving_average(self, prices, window=7)
+            # A SMA de 7 vem do registro em vez de ser recalculada sobre a lista
+            ma_fast_values = indicator_registry.compute(self.stock_data, "sma", window=7)
+            ma_fast_values = ma_fast_values[6:] if len(self.stock_data) >= 7 else []
             fast_gradients = calculate_fast_gradients(self, ma_fast_values)
 
             # Atualizar o buffer de gradientes rápidos
@@ -250,10 +265,6 @@ class getMovingAverageVergenceRSI:
             rsi_rate_of_change = (
                 last_rsi - self.prev_rsi
             ) / self.prev_rsi  # Representa a taxa de mudança percentual do RSI (Índice de Força Relativa).
-            # Recuperar posição atual
-            self.actual_trade_position = getActualTradePositionForBinance(
-                self, self.operation_code
-            )
 
             # CONDIÇÕES DE COMPRA
             # 1
@@ -269,19 +280,7 @@ class getMovingAverageVergenceRSI:
                 )  # Confirmando aceleração do gradiente
             ):
                 ma_trade_decision = True
-                print(
-                    "Compra: A diferença atual é maior que a volatilidade ajustada, indicando uma possível tendência de alta. "
-                    "A volatilidade atual é menor que a média, sugerindo estabilidade no mercado, "
-                    "e o RSI está dentro do intervalo desejado, sinalizando uma condição de compra favorável. "
-                    "O gradiente rápido também está acelerando."
-                )
-                message = (
-                    "Compra: A diferença atual é maior que a volatilidade ajustada, indicando uma possível tendência de alta.\n "
-                    "A volatilidade atual é menor que a média, sugerindo estabilidade no mercado, \n"
-                    "e o RSI está dentro do intervalo desejado, sinalizando uma condição de compra favorável.\n"
-                    "O gradiente rápido também está acelerando."
-                )
-                bot_logger.info(message)
+                report.fire("compra_aceleracao")
 
             # 2
             elif (
@@ -296,17 +295,7 @@ class getMovingAverageVergenceRSI:
                 and rsi_rate_of_change > 0.01  # RSI em aumento
             ):
                 ma_trade_decision = True  # Sinal de compra
-                print(
-                    f"Compra: MA rápida está {last_ma_fast:.3f} acima da MA lenta {last_ma_slow:.3f}, indicando tendência de alta. "
-                    f"A volatilidade atual {last_volatility:.3f} é maior que a média ({volatility:.3f}), "
-                    f"e o RSI está dentro da faixa {self.rsi_lower}-{self.rsi_upper}, sugerindo um sinal de compra favorável.\n"
-                )
-                message = (
-                    f"Compra: MA rápida está {last_ma_fast:.3f} acima da MA lenta {last_ma_slow:.3f} ajustada por histerese ({hysteresis}), "
-                    f"indicando tendência de alta. A volatilidade atual {last_volatility:.3f} é maior que a média ({volatility:.3f}), "
-                    f"e o RSI está dentro da faixa {self.rsi_lower}-{self.rsi_upper}, sugerindo um sinal de compra favorável.\n"
-                )
-                bot_logger.info(message)
+                report.fire("compra_gap_medias")
 
             # 3
             elif (
@@ -320,17 +309,7 @@ class getMovingAverageVergenceRSI:
                 > volatility * 1.2  # Volatilidade significativamente acima da média
             ):
                 ma_trade_decision = True
-                print(
-                    f"Compra: Gradiente rápido ({fast_gradient:.2f}) maior que lento ({slow_gradient:.2f}), "
-                    f"RSI ({last_rsi:.2f}) entre limites ({self.rsi_lower}-{self.rsi_upper}), "
-                    f"e volatilidade atual ({last_volatility:.2f}) acima da média ({volatility:.2f})."
-                )
-                message = (
-                    f"Compra: Gradiente rápido ({fast_gradient:.2f}) maior que lento ({slow_gradient:.2f}), "
-                    f"RSI ({last_rsi:.2f}) entre limites ({self.rsi_lower}-{self.rsi_upper}), "
-                    f"e volatilidade atual ({last_volatility:.2f}) acima da média ({volatility:.2f})."
-                )
-                bot_logger.info(message)
+                report.fire("compra_gradiente")
 
             # 4
             elif (
@@ -340,14 +319,8 @@ class getMovingAverageVergenceRSI:
                 and fast_gradient < slow_gradient
                 and current_difference > volatility * volatility_factor
             ):
-                print(
-                    f"-------------\n"
-                    f"O RSI está baixo de 30 indicando que o ativo está fortemente sobrevendido.\n Esse é um sinal claro de que o preço pode estar próximo de um fundo e uma reversão para a alta é possível. \n Este é um indicativo forte de que a pressão vendedora pode estar se esgotando\n"
-                    f"-------------\n"
-                )
-                message = f"O RSI está baixo de 30 indicando que o ativo está fortemente sobrevendido.\n Esse é um sinal claro de que o preço pode estar próximo de um fundo e uma reversão para a alta é possível. \n Este é um indicativo forte de que a pressão vendedora pode estar se esgotando\n"
-                bot_logger.info(message)
                 ma_trade_decision = True  # Sinal de compra
+                report.fire("compra_rsi_sobrevendido")
 
             # CONDIÇÕES DE VENDA
             # 1
@@ -358,19 +331,8 @@ class getMovingAverageVergenceRSI:
                 and self.current_price < self.last_max_price_down_resistanceZone
             ):
                 ma_trade_decision = False  # Sinal de venda
+                report.fire("venda_queda_gradiente")
                 self.alerta_de_crescimento_rapido = False
-                print(
-                    "Venda: a porcentagem de decremento do gradiente rapido despencou mais que 30%\n"
-                    "Ultimo RSI está abaixo do limite superior e o preço atual está abaixo da zona de resistência recente.\n"
-                    "sugere um possível inicio de reversão para baixa.\n"
-                    "realizando a venda.\n"
-                )
-                message = (
-                    f"Venda: a porcentagem de decremento do gradiente rapido despencou mais que 30%\n"
-                    f"Ultimo RSI está abaixo do limite superior e o preço atual está abaixo da zona de resistência recente.\n"
-                    f"sugere um possível inicio de reversão para baixa.\n Realizando a venda.\n"
-                )
-                bot_logger.info(message)
 
             # 2
             elif (
@@ -380,11 +342,7 @@ class getMovingAverageVergenceRSI:
                 and self.alerta_de_crescimento_rapido == False
             ):
                 ma_trade_decision = False  # Sinal de venda
-                print(
-                    "Venda: A MA rápida cruzou abaixo da MA lenta ajustada por histerese, sinalizando uma possível reversão de tendência para baixa.\n"
-                )
-                message = f"Venda: A MA rápida cruzou abaixo da MA lenta ajustada por histerese, sinalizando uma possível reversão de tendência para baixa.\n"
-                bot_logger.info(message)
+                report.fire("venda_cruzamento")
             # 3
             elif (
                 last_ma_fast > last_ma_slow
@@ -395,15 +353,7 @@ class getMovingAverageVergenceRSI:
                 and self.alerta_de_crescimento_rapido == False
             ):
                 ma_trade_decision = False  # Sinal de venda
-                print(
-                    "Venda: Apesar da MA rápida estar acima da lenta, a alta volatilidade e o gradiente rápido menor que o lento \n"
-                    "ou o RSI abaixo do limite inferior sugerem um risco de reversão. Melhor realizar vendas.\n"
-                )
-                message = (
-                    f"Venda: Apesar da MA rápida estar acima da lenta, a alta volatilidade e o gradiente rápido menor que o lento \n"
-                    f"ou o RSI abaixo do limite inferior sugerem um risco de reversão. Melhor realizar vendas.\n"
-                )
-                bot_logger.info(message)
+                report.fire("venda_risco_reversao")
             # 4
             elif (
                 fast_gradient < self.last_fast_gradient - hysteresis
@@ -413,29 +363,13 @@ class getMovingAverageVergenceRSI:
                 and self.alerta_de_crescimento_rapido == False
             ):
                 ma_trade_decision = False  # Sinal de venda
-                print(
-                    "Venda: O gradiente rápido diminuiu significativamente e o RSI abaixo do ultimo valor do RSI,\n e o RSI atual é menor que o minimo\n "
-                    "indicando uma possível reversão de tendência para baixa.\n"
-                )
-                message = (
-                    f"Venda: O gradiente rápido diminuiu significativamente e o RSI abaixo do ultimo valor do RSI, \n"
-                    f"indicando uma possível reversão de tendência para baixa.\n"
-                )
-                bot_logger.info(message)
+                report.fire("venda_gradiente_rsi")
 
             # 5
             # Verificar se o preço atual caiu abaixo do stop-loss
             elif self.current_price < stop_loss_price:
                 ma_trade_decision = False  # Sinal de venda devido ao stop-loss
-                print(
-                    f"\n ------------------ \nStop-Loss Ativado: O preço atual de {self.current_price:.3f} caiu abaixo do nível de stop-loss de {stop_loss_price:.2f}.\n "
-                    "Realizando venda para limitar as perdas.\n ------------------ \n"
-                )
-                message = (
-                    f"Stop-Loss Ativado: O preço atual de {self.current_price:.3f} caiu abaixo do nível de stop-loss de {stop_loss_price:.2f}. \n"
-                    f"Realizando venda para limitar as perdas.\n"
-                )
-                bot_logger.info(message)
+                report.fire("stop_loss")
 
             # 6
             elif (
@@ -445,19 +379,8 @@ class getMovingAverageVergenceRSI:
                 and fast_gradient < slow_gradient
                 and current_difference < volatility * volatility_factor
             ):
-                print(
-                    f"\n ------------------ \n"
-                    f"A alta volatilidade diminuiu significativamente e o RSI ultrapassou o limite superior, \n"
-                    f"indicando uma possível reversão de tendência para baixa.\n"
-                    f"Realizando venda para limitar as perdas.\n ------------------ \n"
-                )
-                message = (
-                    f"A alta volatilidade diminuiu significativamente e o RSI ultrapassou o limite superior, \n"
-                    f"indicando uma possível reversão de tendência para baixa.\n"
-                    f"Realizando venda para limitar as perdas.\n"
-                )
-                bot_logger.info(message)
                 ma_trade_decision = False  # Sinal de venda
+                report.fire("venda_rsi_extremo")
             # 7
             # Detectar queda apos atingir preço maximo do preço
             elif (
@@ -466,25 +389,18 @@ class getMovingAverageVergenceRSI:
                 and self.percentage_fromDOWN_fast_gradient > 10
             ):
                 ma_trade_decision = False  # Sinal de venda
-                print(
-                    f"detectado queda apos atingir preço máximo do preço: O preço atual de {self.current_price:.3f} está abaixo do nível de preço máximo e caindo\n"
-                )
-                message = f"detectado queda apos atingir preço máximo do preço: O preço atual de {self.current_price:.3f} está abaixo do nível de preço máximo e caindo\n"
-                bot_logger.info(message)
+                report.fire("venda_abaixo_suporte")
             # 8
             # Detectar crescimento rápido no gradiente rápido
             if self.recent_average > growth_threshold * prev_ma_fast:
-                print(
-                    f"\n ------------------ \n Crescimento Consistente Detectado: O gradiente médio recente aumentou significativamente, indicando uma forte tendência de alta.\n ------------------ \n"
-                )
-                message = f"Crescimento Consistente Detectado: O gradiente médio recente aumentou significativamente, indicando uma forte tendência de alta.\n"
-                bot_logger.info(message)
                 ma_trade_decision = True  # Sinal de compra
+                report.fire("crescimento_rapido")
                 self.alerta_de_crescimento_rapido = True
 
                 # Após o crescimento rápido, verificar se está começando a corrigir
                 if fast_gradient < self.last_fast_gradient - correction_threshold:
                     ma_trade_decision = False  # Sinal de venda
+                    report.fire("correcao")
                     self.alerta_de_crescimento_rapido = (
                         False  # Desativar alerta de alta
                     )
@@ -492,123 +408,143 @@ class getMovingAverageVergenceRSI:
                         True  # Ativar estado de espera para nova alta
                     )
 
-                    print(
-                        f"\n ------------------ \nCorreção Detectada: O gradiente rápido começou a corrigir, caindo de {self.last_fast_gradient:.5f} para {fast_gradient:.3f},\n "
-                        "indicando uma possível reversão ou ajuste no mercado.\n ------------------ \n"
-                    )
-                    message = (
-                        f"Correção Detectada: O gradiente rápido começou a corrigir, caindo de {self.last_fast_gradient:.5f} para {fast_gradient:.3f},\n "
-                        f"indicando uma possível reversão ou ajuste no mercado."
-                    )
-                    bot_logger.info(message)
-
                 elif self.state_after_correction:
                     # Verificar se há uma continuação na alta
                     if detect_new_price_jump(
                         self, fast_gradient, prices, jump_threshold
                     ):
                         ma_trade_decision = True  # Confirmação de alta pós-correção
+                        report.fire("retomada_alta")
                         self.state_after_correction = False  # Resetar estado
-                        print(
-                            f"\n ------------------ \nContinuação da Alta Confirmada: O preço ou gradiente mostram um novo salto significativo, validando a retomada da alta.\n ------------------ \n"
-                        )
-                        bot_logger.info(
-                            f"Continuação da Alta Confirmada: O preço ou gradiente mostram um novo salto significativo, validando a retomada da alta.\n"
-                        )
                     else:
-                        print(
-                            "\n ------------------ \nEspera: Ainda não foi detectado um novo salto no preço ou gradiente. Continuar monitorando.\n ------------------ \n"
-                        )
-                        bot_logger.info(
-                            f"Espera: Ainda não foi detectado um novo salto no preço ou gradiente. Continuar monitorando.\n"
-                        )
+                        report.note("espera_salto")
             else:
                 self.alerta_de_crescimento_rapido = False
 
-            if ma_trade_decision == None:
-                print("\n Nenhuma condição de compra ou venda atendida.")
-                bot_logger.info("\n Nenhuma condição de compra ou venda atendida.")
-
-            print("-----")
-            print(
-                f"Estratégia executada: Moving Average com Volatilidade + Gradiente + RSI"
+            # Valores crus do tick; o texto só é montado para os destinos ativos
+            report.update(
+                open_time=self.stock_data.open_time[-1],
+                price=self.current_price,
+                position=self.actual_trade_position == True,
+                volume=self.current_volume,
+                ma_fast=last_ma_fast,
+                ma_slow=last_ma_slow,
+                difference=current_difference,
+                volatility=last_volatility,
+                volatility_mean=volatility,
+                volatility_by_purchase=volatility_by_purshase,
+                hysteresis=hysteresis,
+                rsi=last_rsi,
+                prev_rsi=self.prev_rsi,
+                rsi_lower=self.rsi_lower,
+                rsi_upper=self.rsi_upper,
+                fast_gradient=fast_gradient,
+                slow_gradient=slow_gradient,
+                last_fast_gradient=self.last_fast_gradient,
+                last_slow_gradient=self.last_slow_gradient,
+                recent_average=self.recent_average,
+                growth_target=growth_threshold * prev_ma_fast,
+                exit_gradient=self.last_fast_gradient - correction_threshold,
+                pct_up=self.percentage_fromUP_fast_gradient,
+                pct_down=self.percentage_fromDOWN_fast_gradient,
+                support=self.min_price_supportZone,
+                resistance=self.max_price_resistenceZone,
+                recent_resistance=self.last_max_price_down_resistanceZone,
+                recent_support=self.last_min_price_up_supportZone,
+                jump_threshold=jump_threshold,
+                stop_loss_price=stop_loss_price,
             )
-            print(
-                f"{self.operation_code}:\n {last_ma_fast:.3f} - Última Média Rápida \n {last_ma_slow:.3f} - Última Média Lenta"
+            report.decision = ma_trade_decision
+            report.emit()
+
+            features = quantize_features(
+                self.operation_code,
+                self.actual_trade_position,
+                self.current_price,
+                last_ma_fast,
+                last_ma_slow,
+                last_rsi,
+                fast_gradient,
+                last_volatility,
+                volatility,
             )
-            print(f"Última Volatilidade: {last_volatility:.3f}")
-            print(f"Média da Volatilidade: {volatility:.3f}")
-            print(f"Diferença Atual das medias moveis: {current_difference:.3f}")
-            print(f"volatibilidade * volatilidade_factor: {volatility_by_purshase:.3f}")
-            print(f"Último RSI: {last_rsi:.3f}")
-            print(
-                f"^indicador de tendencia de alta:\n"
-                f"  - Media recente dos Gradientes rapidos: {self.recent_average:.3f}\n"
-                f"  - Media necessaria para tendecia de alta: {growth_threshold * prev_ma_fast:.3f}\n"
-                f"  - gradiente rapido maximo para sair da tendencia: ({ self.last_fast_gradient - correction_threshold:.3f})"
-            )
-            print(
-                f'Gradiente rápido: {fast_gradient:.3f} ({ "Subindo" if fast_gradient > self.last_fast_gradient else "Descendo" })'
-            )
-            print(
-                f'Gradiente lento: {slow_gradient:.3f} ({ "Subindo" if slow_gradient > self.last_slow_gradient else "Descendo" })'
-            )
-            print(
-                f"  -Porcentagem de crescimento do gradiente rápido: (\033[1m{self.percentage_fromUP_fast_gradient:.3f}%)\033[0m\n"
-                f"  -Porcentagem de Decremento do gradiente rápdido: (\033[1m{self.percentage_fromDOWN_fast_gradient:.3f}%)\033[0m\n"
-            )
-            if ma_trade_decision is None:
-                print("Decisao: Manter Posição")
+            rule_decision = ma_trade_decision
+            local_model = get_local_classifier()
+            if local_model is not None:
+                advisor = "local"
+                # Classificador local (LOCAL_MODEL_PATH): decide no processo, sem o Gemini
+                vector = feature_vector(
+                    self.current_price,
+                    last_ma_fast,
+                    last_ma_slow,
+                    last_volatility,
+                    volatility,
+                    last_rsi,
+                    fast_gradient,
+                    slow_gradient,
+                )
+                if local_batch_predictor.enabled:
+                    # Vários robôs no processo: uma predição para os símbolos da janela
+                    try:
+                        decision_bool, confidence = local_batch_predictor.submit(
+                            local_model, vector
+                        ).result(timeout=local_batch_predictor.deadline)
+                    except TimeoutError:
+                        bot_logger.warning(
+                            f"Lote do classificador local sem resposta para {self.operation_code}; "
+                            "decidindo só este símbolo."
+                        )
+                        decision_bool, confidence = local_model.decide(vector)
+                else:
+                    decision_bool, confidence = local_model.decide(vector)
+                label = CLASSES[CLASS_DECISIONS.index(decision_bool)]
+                on_time, answer = True, (
+                    f"Modelo local: {label} (confiança {confidence:.0%})",
+                    decision_bool,
+                )
+            # Consulta em segundo plano com prazo: resposta atrasada não segura o tick
+            elif gemini_batch_advisor.enabled:
+                advisor = "lote"
+                # Vários robôs no processo: um pedido para todos os símbolos da janela
+                on_time, answer = gemini_advisor.advise_future(
+                    self.operation_code,
+                    lambda: gemini_batch_advisor.submit(
+                        self.operation_code, report.render_prompt(), features
+                    ),
+                    bot=self.bot_name,
+                    on_late=self._late_answer_writer(advisor, report),
+                )
             else:
-                print(f"Decisao: {'Comprar' if ma_trade_decision else 'Vender'}")
-            print("-----")
-
-            message = (
-                f"{'---------------'}\n"
-                f"Estratégia executada: Moving Average com Volatilidade + Gradiente\n"
-                f"{self.operation_code}:\n"
-                f"{last_ma_fast:.3f} - Ultima Media Rapida \n{last_ma_slow:.3f} - Ultima Media Lenta\n"
-                f"Ultima Volatilidade: {last_volatility:.3f}\n"
-                f"Media da Volatilidade: {volatility:.3f}\n"
-                f"Diferenca Atual: {current_difference:.3f}\n"
-                f"Ultimo RSI: {last_rsi:.3f}\n"
-                f"^indicador de tendencia de alta:\n"
-                f"  - Media recente dos Gradientes rapidos: {self.recent_average:.3f}\n"
-                f"  - Media necessaria para tendecia de alta: {growth_threshold * prev_ma_fast:.3f}\n"
-                f"  - gradiente rapido maximo para sair da tendencia: ({ self.last_fast_gradient - correction_threshold:.3f})\n"
-                f'Gradiente rápido: {fast_gradient:.3f} ({ "Subindo" if fast_gradient > self.last_fast_gradient else "Descendo" })\n'
-                f'Gradiente lento: {slow_gradient:.3f} ({ "Subindo" if slow_gradient > self.last_slow_gradient else "Descendo" })\n'
-                f"  -Porcentagem de crescimento do gradiente rapido: {self.percentage_fromUP_fast_gradient:.3f}%\n"
-                f"  -Porcentagem de Decremento do gradiente rapdido: {self.percentage_fromDOWN_fast_gradient:.3f}%\n"
-                f'Decisao: {"Comprar" if ma_trade_decision == True else "Vender"}\n'
-                f"{'---------------'}\n"
-            )
-            bot_logger.info(message)
-
-            dados_from_gemini = (
-                f'posição atual do ativo: {"Comprado" if self.actual_trade_position == True else "Vendido"}\n'
-                f"{self.operation_code}:\n"
-                f"{last_ma_fast:.3f} - Ultima Media Rapida \n{last_ma_slow:.3f} - Ultima Media Lenta\n"
-                f"Ultima Volatilidade: {last_volatility:.3f}\n"
-                f"Media da Volatilidade: {volatility:.3f}\n"
-                f"Diferenca Atual: {current_difference:.3f}\n"
-                f"Ultimo RSI: {last_rsi:.3f}\n"
-                f"^indicador de tendencia de alta:\n"
-                f"  - Media recente dos Gradientes rapidos: {self.recent_average:.3f}\n"
-                f"  - Media necessaria para tendecia de alta: {growth_threshold * prev_ma_fast:.3f}\n"
-                f"  - gradiente rapido maximo para sair da tendencia: ({ self.last_fast_gradient - correction_threshold:.3f})\n"
-                f'Gradiente rápido: {fast_gradient:.3f} ({ "Subindo" if fast_gradient > self.last_fast_gradient else "Descendo" })\n'
-                f'Gradiente lento: {slow_gradient:.3f} ({ "Subindo" if slow_gradient > self.last_slow_gradient else "Descendo" })\n'
-                f"  -Porcentagem de crescimento do gradiente rapido: {self.percentage_fromUP_fast_gradient:.3f}%\n"
-                f"  -Porcentagem de Decremento do gradiente rapdido: {self.percentage_fromDOWN_fast_gradient:.3f}%\n"
+                advisor = "gemini"
+                gemini = GeminiTradingBot(report.render_prompt(), features=features)
+                on_time, answer = gemini_advisor.advise(
+                    self.operation_code,
+                    gemini.geminiTrader,
+                    bot=self.bot_name,
+                    on_late=self._late_answer_writer(advisor, report),
+                )
+            decision, decision_bool = answer if on_time else (None, None)
+            if decision is not None:
+                ma_trade_decision = decision_bool
+                if console_enabled():
+                    print(decision)
+                bot_logger.info(decision)
+            else:
+                # Gemini fora do ar, atrasado ou com circuito aberto: mantém a
+                # decisão das regras
+                bot_logger.warning(
+                    "Gemini indisponível ou fora do prazo; usando a decisão da estratégia por regras."
+                )
+                advisor = None
+
+            # Decisões do tick para o diário (gravado pelo StrategyEngine)
+            report.update(
+                rule_decision=decision_index(rule_decision),
+                advisor=advisor,
+                advisor_decision=decision_index(decision_bool) if advisor else -1,
+                final_decision=decision_index(ma_trade_decision),
             )
-
-            gemini = GeminiTradingBot(dados_from_gemini)
-            decision, decision_bool = gemini.geminiTrader()
-            ma_trade_decision = decision_bool
-
-            print(decision)
-            bot_logger.info(decision)
+            self.report = report
 
             #  if ma_trade_decision is not None:
             #       if ma_trade_decision != decision_bool:
@@ -629,7 +565,7 @@ class getMovingAverageVergenceRSI:
             #           ma_trade_decision = True
 
         except IndexError:
-            message(
+            message = (
                 "Erro: Dados insuficientes para calcular a estratégia Moving Average Vergence."
             )
             erro_logger.error(message)
@@ -0,0 +1,171 @@
+import numpy as np
+
+FIELDS = {
+    "open_time": "i8",
+    "open": "f8",
+    "high": "f8",
+    "low": "f8",
+    "close": "f8",
+    "volume": "f8",
+    "close_time": "i8",
+}
+
+
+class CandleSeries:
+    """
+    Série de candles em colunas NumPy pré-alocadas (buffer circular).
+
+    Cada coluna é gravada duas vezes (posições i e i + capacity), então a
+    janela atual é sempre um trecho contíguo do array: as colunas são views
+    somente-leitura, sem cópia, prontas para os indicadores. Quem recebe a
+    série não consegue alterá-la; `version` muda a cada atualização.
+    """
+
+    __slots__ = (
+        "symbol",
+        "interval",
+        "capacity",
+        "version",
+        "_columns",
+        "_start",
+        "_length",
+        "__weakref__",  # Permite usar a série como chave do IndicatorRegistry
+    )
+
+    def __init__(self, capacity=1000, symbol=None, interval=None):
+        """
+        Args:
+            capacity (int): Número máximo de candles mantidos.
+            symbol (str): Par de negociação (informativo).
+            interval (str): Intervalo dos candles (informativo).
+        """
+        self.symbol = symbol
+        self.interval = interval
+        self.capacity = capacity
+        self.version = 0
+        self._columns = {
+            name: np.zeros(2 * capacity, dtype=dtype) for name, dtype in FIELDS.items()
+        }
+        self._start = 0
+        self._length = 0
+
+    @classmethod
+    def from_klines(cls, candles, capacity=None, symbol=None, interval=None):
+        """
+        Cria a série a partir do array de parse_klines.
+
+        Args:
+            candles (np.ndarray): Array estruturado com dtype KLINE_DTYPE.
+            capacity (int): Capacidade. Padrão: len(candles).
+        """
+        series = cls(capacity or max(len(candles), 1), symbol, interval)
+        series.extend(candles)
+        return series
+
+    @classmethod
+    def wrap(cls, stock_data):
+        """
+        Retorna stock_data como CandleSeries.
+
+        Aceita uma CandleSeries (devolvida como está) ou um DataFrame com a
+        coluna 'close_price' (copiado uma vez, sem alterar o original).
+        """
+        if isinstance(stock_data, cls):
+            return stock_data
+        close = np.asarray(stock_data["close_price"], dtype="f8")
+        candles = np.zeros(len(close), dtype=list(FIELDS.items()))
+        candles["close"] = close
+        if "volume" in stock_data:
+            candles["volume"] = np.asarray(stock_data["volume"], dtype="f8")
+        if "open_time" in stock_data:
+            candles["open_time"] = np.asarray(stock_data["open_time"]).astype("i8")
+        else:
+            candles["open_time"] = np.arange(len(close))
+        series = cls(max(len(close), 1))
+        series.extend(candles)
+        return series
+
+    def extend(self, candles):
+        """
+        Acrescenta candles em ordem cronológica.
+
+        Candles já conhecidos são ignorados e um candle com o mesmo open_time
+        do último (ainda aberto) substitui o último.
+
+        Args:
+            candles (np.ndarray): Array estruturado com os campos de FIELDS.
+        """
+        if len(candles) == 0:
+            return
+        if self._length:
+            last_open_time = self._columns["open_time"][self._start + self._length - 1]
+            candles = candles[candles["open_time"] >= last_open_time]
+            if len(candles) and candles["open_time"][0] == last_open_time:
+                position = (self._start + self._length - 1) % self.capacity
+                self._write(np.array([position]), candles[:1])
+                candles = candles[1:]
+
+        candles = candles[-self.capacity :]
+        count = len(candles)
+        if count:
+            positions = (self._start + self._length + np.arange(count)) % self.capacity
+            self._write(positions, candles)
+            overflow = max(0, self._length + count - self.capacity)
+            self._start = (self._start + overflow) % self.capacity
+            self._length = min(self.capacity, self._length + count)
+        self.version += 1
+
+    def _write(self, positions, candles):
+        for name, column in self._columns.items():
+            column[positions] = candles[name]
+            column[positions + self.capacity] = candles[name]
+
+    def to_array(self):
+        """Cópia dos candles atuais como array estruturado (para checkpoints)."""
+        candles = np.zeros(self._length, dtype=list(FIELDS.items()))
+        for name in FIELDS:
+            candles[name] = self.column(name)
+        return candles
+
+    def column(self, name):
+        """View somente-leitura da coluna `name`, do candle mais antigo ao mais novo."""
+        view = self._columns[name][self._start : self._start + self._length]
+        view.flags.writeable = False
+        return view
+
+    def last(self, name="close", offset=1):
+        """Valor de `name` no candle `offset` a partir do fim (1 = último)."""
+        if offset > self._length:
+            raise IndexError("CandleSeries sem candles suficientes.")
+        return self._columns[name][self._start + self._length - offset]
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def open_time(self):
+        return self.column("open_time")
+
+    @property
+    def open(self):
+        return self.column("open")
+
+    @property
+    def high(self):
+        return self.column("high")
+
+    @property
+    def low(self):
+        return self.column("low")
+
+    @property
+    def close(self):
+        return self.column("close")
+
+    @property
+    def volume(self):
+        return self.column("volume")
+
+    @property
+    def close_time(self):
+        return self.column("close_time")
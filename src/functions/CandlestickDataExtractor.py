@@ -3,7 +3,6 @@ import pandas as pd
 from binance.client import Client
 from db.neonDbConfig import connect_to_db
 from functions.logger import erro_logger
-from psycopg2 import sql
 
 
 class CandlestickDataExtractor:
@@ -146,10 +145,15 @@ class CandlestickDataExtractor:
         Args:
          conn: Conexão com o banco de dados.
         """
+        from psycopg2 import sql
+
         # Conexão com o banco de dados
         conn = None
         try:
             conn = connect_to_db()
+            if conn is None:
+                erro_logger.error("Banco de dados indisponível; candles não salvos.")
+                return
             if self.df is None:
                 erro_logger.error(
                     "Erro: Dados de candlestick não disponíveis para salvar."
@@ -1,9 +1,10 @@
 import requests
+from functions.binance.create_client import get_api_base_url
 
 
 class BinanceTopGainers:
     def __init__(self):
-        self.url = "https://api.binance.com/api/v3/ticker/24hr"
+        self.url = f"{get_api_base_url()}/v3/ticker/24hr"
 
     def fetch_tickers(self):
         try:
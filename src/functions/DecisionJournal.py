@@ -0,0 +1,339 @@
+import json
+import os
+import threading
+import time
+import numpy as np
+from functions.logger import erro_logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem trava entre processos
+    fcntl = None
+
+# Colunas do diário, na ordem de gravação. Decisões usam os índices de
+# LocalClassifier.CLASSES (0 vender, 1 manter, 2 comprar) e -1 sem decisão.
+JOURNAL_COLUMNS = {
+    "time": "i8",  # Momento do tick (ms desde a época, UTC)
+    "open_time": "i8",  # open_time do último candle da série
+    "price": "f8",
+    "position": "i1",  # 1 comprado, 0 vendido
+    "volume": "f8",
+    "ma_fast": "f8",
+    "ma_slow": "f8",
+    "difference": "f8",  # ma_fast - ma_slow
+    "volatility": "f8",
+    "volatility_mean": "f8",
+    "rsi": "f8",
+    "prev_rsi": "f8",
+    "fast_gradient": "f8",
+    "slow_gradient": "f8",
+    "last_fast_gradient": "f8",
+    "last_slow_gradient": "f8",
+    "recent_average": "f8",
+    "growth_target": "f8",
+    "exit_gradient": "f8",
+    "pct_up": "f8",
+    "pct_down": "f8",
+    "support": "f8",
+    "resistance": "f8",
+    "recent_resistance": "f8",
+    "recent_support": "f8",
+    "jump_threshold": "f8",
+    "stop_loss_price": "f8",
+    "rule": "S24",  # Regra que definiu a decisão ('' quando nenhuma)
+    "rule_decision": "i1",
+    "advisor": "S8",  # 'local', 'gemini', 'lote' ou '' sem resposta
+    "advisor_decision": "i1",
+    "final_decision": "i1",
+}
+
+# Respostas da IA que chegaram depois do prazo do tick (não usadas na decisão)
+LATE_ANSWER_COLUMNS = {
+    "time": "i8",  # Chegada da resposta (ms desde a época, UTC)
+    "open_time": "i8",  # open_time do tick que fez a consulta
+    "advisor": "S8",  # 'gemini' ou 'lote'
+    "advisor_decision": "i1",  # -1 sem resposta válida
+    "latency": "f8",  # Segundos entre a consulta e a resposta
+}
+
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", "journal")
+
+
+def decision_index(decision):
+    """Índice de CLASSES de uma decisão (True comprar, False vender, None manter)."""
+    if decision is None:
+        return 1
+    return 2 if decision else 0
+
+
+class DecisionJournal:
+    """
+    Diário colunar, somente de acréscimo, com uma linha por (robô, tick).
+
+    Cada robô tem um diretório (pelo nome, como os checkpoints) com um
+    arquivo binário por coluna (`<coluna>.bin`, valores NumPy crus) e um
+    schema.json com o símbolo. A gravação só acrescenta bytes ao fim dos
+    arquivos; a leitura mapeia as colunas com np.memmap, sem copiar nem
+    interpretar texto. Uma linha incompleta (queda no meio da gravação) é
+    ignorada: o número de linhas é o da coluna mais curta.
+
+    Só um processo grava em cada diretório: `<robô>.lock` fica travado
+    enquanto ele está aberto, e um segundo processo com o mesmo robô não
+    grava (nem descarta as linhas do primeiro).
+
+    Se as colunas mudarem entre versões, o diretório antigo é renomeado para
+    `<robô>.<ms>` e continua disponível para consulta.
+    """
+
+    def __init__(self, directory=JOURNAL_DIR, columns=JOURNAL_COLUMNS):
+        """
+        Args:
+            directory (str): Diretório do diário. Vazio desativa a gravação.
+            columns (dict): {coluna: dtype NumPy}.
+        """
+        self.directory = directory
+        self.columns = {name: np.dtype(dtype) for name, dtype in columns.items()}
+        self._files = {}  # robô -> {coluna: arquivo aberto}
+        self._locks = {}  # robô -> arquivo <robô>.lock travado
+        self._blocked = set()  # Robôs cujo diário está com outro processo
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return bool(self.directory)
+
+    def _schema(self, bot, symbol):
+        return {
+            "bot": bot,
+            "symbol": symbol,
+            "columns": {name: dtype.str for name, dtype in self.columns.items()},
+        }
+
+    def _acquire(self, bot):
+        # Trava <robô>.lock até o close(); BlockingIOError se outro processo grava
+        if bot in self._locks:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        lock = open(os.path.join(self.directory, f"{bot}.lock"), "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                lock.close()
+                raise
+        self._locks[bot] = lock
+
+    def _open(self, bot, symbol):
+        self._acquire(bot)
+        path = os.path.join(self.directory, bot)
+        schema_file = os.path.join(path, "schema.json")
+        schema = self._schema(bot, symbol)
+        if os.path.exists(schema_file):
+            with open(schema_file, encoding="utf-8") as file:
+                if json.load(file) != schema:
+                    archived = f"{path}.{int(time.time() * 1000)}"
+                    os.replace(path, archived)
+                    erro_logger.warning(
+                        f"Colunas do diário de {bot} mudaram; diário anterior movido para {archived}."
+                    )
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(schema_file):
+            with open(schema_file, "w", encoding="utf-8") as file:
+                json.dump(schema, file)
+
+        files = {name: open(os.path.join(path, f"{name}.bin"), "ab") for name in self.columns}
+        # Descarta uma linha incompleta deixada por uma queda no meio da gravação
+        rows = min(file.tell() // self.columns[name].itemsize for name, file in files.items())
+        for name, file in files.items():
+            file.truncate(rows * self.columns[name].itemsize)
+            file.seek(0, os.SEEK_END)
+        return files
+
+    def append(self, symbol, row, bot=None):
+        """
+        Acrescenta a linha de um tick.
+
+        Args:
+            symbol (str): Par de negociação (ex: 'SOLUSDT').
+            row (dict): {coluna: valor}. Colunas ausentes ficam com NaN (ou 0,
+                nas inteiras); 'time' padrão é o momento da gravação.
+            bot (str): Nome do robô (diretório do diário). Padrão: symbol.
+        """
+        if not self.enabled:
+            return
+        bot = bot or symbol
+        row = {"time": int(time.time() * 1000), **row}
+        try:
+            with self._lock:
+                if bot in self._blocked:
+                    return
+                files = self._files.get(bot)
+                if files is None:
+                    try:
+                        files = self._files[bot] = self._open(bot, symbol)
+                    except BlockingIOError:
+                        self._blocked.add(bot)
+                        erro_logger.error(
+                            f"Diário de decisões de {bot} em uso por outro processo; "
+                            "este processo não vai gravá-lo."
+                        )
+                        return
+                # Converte a linha inteira antes de gravar: um valor inválido
+                # descarta a linha sem desalinhar as colunas
+                encoded = {}
+                for name, dtype in self.columns.items():
+                    value = row.get(name)
+                    if value is None:
+                        value = np.nan if dtype.kind == "f" else (b"" if dtype.kind == "S" else 0)
+                    elif dtype.kind == "S" and isinstance(value, str):
+                        value = value.encode("utf-8")
+                    encoded[name] = np.asarray(value, dtype=dtype).tobytes()
+                try:
+                    for name, data in encoded.items():
+                        files[name].write(data)
+                    for file in files.values():
+                        file.flush()
+                except OSError:
+                    # Gravação interrompida (ex: disco cheio): reabre na próxima
+                    # linha, descartando a linha incompleta
+                    self._discard(bot)
+                    raise
+        except (OSError, ValueError, TypeError) as e:
+            erro_logger.error(f"Erro ao gravar o diário de decisões de {bot}: {e}")
+
+    def _discard(self, bot):
+        for file in self._files.pop(bot, {}).values():
+            try:
+                file.close()
+            except OSError:
+                pass
+
+    def close(self):
+        with self._lock:
+            for files in self._files.values():
+                for file in files.values():
+                    file.close()
+            for lock in self._locks.values():
+                lock.close()
+            self._files = {}
+            self._locks = {}
+            self._blocked = set()
+
+    def _partitions(self):
+        # Diretórios com schema.json; por robô, os arquivados (mais antigos)
+        # vêm antes do atual. Diários antigos, sem "bot", eram por símbolo
+        if not os.path.isdir(self.directory):
+            return []
+        partitions = []
+        for entry in os.listdir(self.directory):
+            schema_file = os.path.join(self.directory, entry, "schema.json")
+            if os.path.exists(schema_file):
+                with open(schema_file, encoding="utf-8") as file:
+                    schema = json.load(file)
+                schema.setdefault("bot", schema["symbol"])
+                key = (schema["bot"], entry == schema["bot"], entry)
+                partitions.append((key, os.path.join(self.directory, entry), schema))
+        return [(path, schema) for _, path, schema in sorted(partitions)]
+
+    def symbols(self):
+        """Símbolos com linhas no diário."""
+        return sorted({schema["symbol"] for _, schema in self._partitions()})
+
+    def bots(self, symbols=None):
+        """Robôs com linhas no diário (só os de `symbols`, se informado)."""
+        return sorted(
+            {
+                schema["bot"]
+                for _, schema in self._partitions()
+                if not symbols or schema["symbol"] in symbols
+            }
+        )
+
+    @staticmethod
+    def _map_partition(path, schema):
+        dtypes = {name: np.dtype(dtype) for name, dtype in schema["columns"].items()}
+        sizes = {
+            name: os.path.getsize(os.path.join(path, f"{name}.bin")) // dtype.itemsize
+            for name, dtype in dtypes.items()
+            if os.path.exists(os.path.join(path, f"{name}.bin"))
+        }
+        rows = min(sizes.values()) if len(sizes) == len(dtypes) else 0
+        if not rows:
+            return {}
+        return {
+            name: np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in dtypes.items()
+        }
+
+    def query(self, symbols=None, columns=None, start=None, end=None, last=None, bots=None):
+        """
+        Consulta o diário.
+
+        Args:
+            symbols (list): Símbolos a incluir. Padrão: todos.
+            bots (list): Robôs a incluir. Padrão: todos.
+            columns (list): Colunas a retornar. Padrão: todas.
+            start (int): Início do intervalo de 'time' (ms, inclusivo).
+            end (int): Fim do intervalo de 'time' (ms, exclusivo).
+            last (int): Só as últimas `last` linhas de cada robô.
+
+        Returns:
+            dict: {coluna: np.ndarray} mais as colunas 'symbol' e 'bot'. Com um único
+                diretório os arrays são visões somente-leitura do memmap.
+                Colunas de texto vêm como bytes (use .astype(str)).
+                pd.DataFrame(resultado) monta uma tabela.
+        """
+        with self._lock:
+            for files in self._files.values():
+                for file in files.values():
+                    file.flush()
+
+        wanted = set(symbols) if symbols else None
+        wanted_bots = set(bots) if bots else None
+        parts = []
+        for path, schema in self._partitions():
+            if wanted is not None and schema["symbol"] not in wanted:
+                continue
+            if wanted_bots is not None and schema["bot"] not in wanted_bots:
+                continue
+            mapped = self._map_partition(path, schema)
+            if not mapped:
+                continue
+            # 'time' cresce em cada diretório: o intervalo sai por busca binária
+            times = mapped["time"]
+            first = 0 if start is None else int(np.searchsorted(times, start, side="left"))
+            stop = len(times) if end is None else int(np.searchsorted(times, end, side="left"))
+            if last is not None:
+                first = max(first, stop - last)
+            if stop <= first:
+                continue
+            # Colunas que faltam em um diretório arquivado vêm como NaN
+            names = columns or list(self.columns)
+            part = {
+                name: mapped[name][first:stop]
+                if name in mapped
+                else np.full(stop - first, np.nan)
+                for name in names
+                if name not in ("symbol", "bot")
+            }
+            part["symbol"] = np.full(stop - first, schema["symbol"])
+            part["bot"] = np.full(stop - first, schema["bot"])
+            parts.append(part)
+
+        if not parts:
+            names = [name for name in (columns or self.columns) if name not in ("symbol", "bot")]
+            empty = {name: np.empty(0, dtype=self.columns.get(name, "f8")) for name in names}
+            empty["symbol"] = np.empty(0, dtype="U1")
+            empty["bot"] = np.empty(0, dtype="U1")
+            return empty
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+# Diário compartilhado por todos os robôs do processo (JOURNAL_DIR vazio desativa)
+decision_journal = DecisionJournal()
+# Respostas atrasadas, em JOURNAL_DIR/atrasadas (fora das consultas do diário principal)
+late_answer_journal = DecisionJournal(
+    os.path.join(JOURNAL_DIR, "atrasadas") if JOURNAL_DIR else "", LATE_ANSWER_COLUMNS
+)
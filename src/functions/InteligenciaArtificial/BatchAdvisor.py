@@ -0,0 +1,223 @@
+import json
+import os
+import threading
+from concurrent.futures import CancelledError, Future
+from functions.logger import bot_logger, erro_logger
+from functions.metrics import metrics
+from functions.resilience import retry_call
+from functions.InteligenciaArtificial.DecisionCache import gemini_decision_cache
+from functions.InteligenciaArtificial.GeminiSession import GeminiSession
+from functions.InteligenciaArtificial.LLMAdvisor import gemini_advisor
+from functions.InteligenciaArtificial.GeminiTradingBot import (
+    DECISION_SCHEMA,
+    DECISION_VALUES,
+    FEATURE_LEGEND,
+    GEMINI_REQUEST_TIMEOUT,
+    GeminiTradingBot,
+    gemini_breaker,
+)
+
+# Uma entrada por símbolo, com os mesmos campos da resposta individual
+BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "decisoes": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "simbolo": {"type": "string"},
+                    **DECISION_SCHEMA["properties"],
+                },
+                "required": ["simbolo", *DECISION_SCHEMA["required"]],
+            },
+        }
+    },
+    "required": ["decisoes"],
+}
+
+BATCH_SYSTEM_PROMPT = (
+    "Você é um analista de trading altamente especializado, com ampla experiência em mercados financeiros e criptomoedas. "
+    "Cada linha dos dados é um ativo no formato 'SIMBOLO chave=valor ...', com as chaves: "
+    + "; ".join(f"{key}={meaning}" for key, meaning in FEATURE_LEGEND.items())
+    + ". Para CADA linha escolha UMA decisão: comprar, vender ou manter. "
+    "Responda somente com o JSON pedido: 'decisoes', uma entrada por símbolo com "
+    "'simbolo', 'decisao', 'confianca' (de 0 a 1) e 'motivos' (no máximo 3 frases curtas)."
+)
+
+
+def _forward(source, target):
+    """Repassa a resposta da consulta individual ao Future do lote."""
+    try:
+        target.set_result(source.result())
+    except CancelledError:
+        # Pool encerrado antes da consulta: segue só com as regras
+        target.set_result((None, None))
+    except Exception as e:
+        target.set_exception(e)
+
+
+class BatchAdvisor:
+    """
+    Agrupa as consultas ao modelo de vários símbolos em um único pedido.
+
+    Pedidos que chegam dentro de `window` segundos (ex: robôs cujos candles
+    fecham juntos) são enviados juntos, uma linha por símbolo, e a resposta
+    (BATCH_SCHEMA) é separada de volta por símbolo. Símbolos que faltarem na
+    resposta, ou um lote que falhar por inteiro, são consultados um a um
+    pelo GeminiTradingBot, no pool limitado do LLMAdvisor.
+    """
+
+    def __init__(
+        self,
+        session,
+        window=0.25,
+        max_batch=16,
+        cache=gemini_decision_cache,
+        advisor=gemini_advisor,
+    ):
+        """
+        Args:
+            session (GeminiSession): Sessão configurada com BATCH_SCHEMA.
+            window (float): Tempo de espera para juntar pedidos, em segundos.
+            max_batch (int): Número máximo de símbolos por pedido.
+            cache (DecisionCache): Cache de decisões compartilhado.
+            advisor (LLMAdvisor): Pool das consultas individuais de reserva.
+        """
+        self.session = session
+        self.window = window
+        self.max_batch = max_batch
+        self.cache = cache
+        self.advisor = advisor
+        self._batch = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    def submit(self, symbol, dados, features=None):
+        """
+        Enfileira a consulta de `symbol` no próximo lote.
+
+        Args:
+            symbol (str): Par de negociação.
+            dados (str): Linha de encode_features do símbolo.
+            features (tuple): Chave do cache (quantize_features).
+
+        Returns:
+            Future: Resolve para (tabela formatada, decisão), como geminiTrader.
+        """
+        future = Future()
+        # Sem chave de API a estratégia segue só com as regras
+        if not os.getenv("GEMINI_API_KEY"):
+            future.set_result((None, None))
+            return future
+        if features is not None:
+            cached = self.cache.get(features)
+            if cached is not None:
+                future.set_result(cached)
+                return future
+
+        batch = None
+        with self._lock:
+            self._batch.append((symbol, dados, features, future))
+            if len(self._batch) >= self.max_batch:
+                # Lote cheio: sai já, sem esperar a janela
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._batch = self._batch, []
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            threading.Thread(
+                target=self._run_batch, args=(batch,), name="llm-batch", daemon=True
+            ).start()
+        return future
+
+    def _flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+            self._timer = None
+        if batch:
+            self._run_batch(batch)
+
+    def _run_batch(self, batch):
+        decisions = {}
+        if len(batch) > 1 and gemini_breaker.available():
+            prompt = "\n".join(dados for _, dados, _, _ in batch)
+            try:
+                text = retry_call(
+                    self.session.generate,
+                    prompt,
+                    timeout=GEMINI_REQUEST_TIMEOUT,
+                    attempts=2,
+                    base_delay=1.0,
+                    breaker=gemini_breaker,
+                )
+                decisions = self.parse_batch(text)
+                metrics.increment("llm_batch.requests")
+                metrics.set_gauge("llm_batch.size", len(batch))
+            except Exception as e:
+                erro_logger.error(f"Erro na consulta em lote à IA ({len(batch)} símbolos): {e}")
+
+        for symbol, dados, features, future in batch:
+            try:
+                data = decisions.get(symbol.upper())
+                if data is not None:
+                    result = (
+                        GeminiTradingBot.format_structured_response(data),
+                        DECISION_VALUES[data["decisao"].lower()],
+                    )
+                    if features is not None:
+                        self.cache.put(features, result)
+                    future.set_result(result)
+                    continue
+                # Falha parcial (ou lote de um símbolo): consulta individual no
+                # pool limitado, sem segurar a thread do lote
+                if len(batch) > 1:
+                    metrics.increment("llm_batch.fallbacks")
+                    bot_logger.warning(
+                        f"{symbol} sem decisão no lote; consultando individualmente."
+                    )
+                self.advisor.submit(
+                    GeminiTradingBot(dados, features, self.cache).geminiTrader
+                ).add_done_callback(lambda done, future=future: _forward(done, future))
+            except Exception as e:
+                future.set_exception(e)
+
+    @staticmethod
+    def parse_batch(response_text):
+        """
+        Separa a resposta em lote por símbolo.
+
+        Returns:
+            dict: {símbolo: entrada de 'decisoes'}, só com decisões válidas.
+        """
+        decisions = {}
+        for entry in json.loads(response_text).get("decisoes", []):
+            try:
+                if str(entry["decisao"]).lower() in DECISION_VALUES:
+                    decisions[str(entry["simbolo"]).upper()] = entry
+            except (KeyError, TypeError):
+                continue
+        return decisions
+
+
+# Desativado por padrão; GEMINI_BATCH_WINDOW_MS > 0 liga o agrupamento
+gemini_batch_advisor = BatchAdvisor(
+    GeminiSession(
+        "gemini-1.5-flash",
+        BATCH_SYSTEM_PROMPT,
+        generation_config={
+            "response_mime_type": "application/json",
+            "response_schema": BATCH_SCHEMA,
+        },
+    ),
+    window=float(os.getenv("GEMINI_BATCH_WINDOW_MS", "0")) / 1000,
+    max_batch=int(os.getenv("GEMINI_BATCH_MAX", "16")),
+)
@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functions.metrics import metrics
+
+
+def quantize_features(
+    symbol,
+    actual_trade_position,
+    current_price,
+    last_ma_fast,
+    last_ma_slow,
+    last_rsi,
+    fast_gradient,
+    last_volatility,
+    volatility,
+):
+    """
+    Reduz o estado do mercado a uma chave discreta para o cache de decisões.
+
+    Estados quase iguais (mesma faixa de distância entre as médias, de RSI,
+    de gradiente e de volatilidade) caem na mesma chave.
+
+    Args:
+        symbol (str): Par de negociação (ex: 'SOLUSDT').
+        actual_trade_position (bool): Posição atual (True = comprado).
+        current_price (float): Preço atual.
+        last_ma_fast (float): Última média rápida.
+        last_ma_slow (float): Última média lenta.
+        last_rsi (float): Último RSI.
+        fast_gradient (float): Gradiente rápido atual.
+        last_volatility (float): Última volatilidade.
+        volatility (float): Média da volatilidade.
+
+    Returns:
+        tuple: Chave do cache.
+    """
+    price = float(current_price) or 1.0
+
+    # Distância entre as médias em faixas de 0,1% do preço (limitada a ±2%)
+    ma_gap = (last_ma_fast - last_ma_slow) / price
+    ma_gap_bucket = max(-20, min(20, round(ma_gap / 0.001)))
+
+    # RSI em faixas de 5 pontos
+    rsi_bucket = int(last_rsi // 5) if not math.isnan(last_rsi) else None
+
+    # Sinal e ordem de grandeza do gradiente rápido (em frações do preço)
+    gradient_sign = int(fast_gradient > 0) - int(fast_gradient < 0)
+    gradient_size = abs(fast_gradient) / price
+    gradient_bucket = (
+        max(-6, min(0, math.floor(math.log10(gradient_size)))) if gradient_size else None
+    )
+
+    # Regime de volatilidade: baixa (-1), normal (0) ou alta (1)
+    if last_volatility > volatility * 1.2:
+        volatility_regime = 1
+    elif last_volatility < volatility * 0.8:
+        volatility_regime = -1
+    else:
+        volatility_regime = 0
+
+    return (
+        symbol,
+        bool(actual_trade_position),
+        ma_gap_bucket,
+        rsi_bucket,
+        gradient_sign,
+        gradient_bucket,
+        volatility_regime,
+    )
+
+
+class DecisionCache:
+    """
+    Cache LRU com validade (TTL) das decisões do modelo de IA.
+
+    A chave é o vetor de características quantizado (quantize_features): em
+    ticks seguidos com o mesmo estado de mercado a decisão anterior é
+    reaproveitada sem uma nova chamada ao modelo.
+    """
+
+    def __init__(self, max_size=256, ttl=900, name="gemini_cache"):
+        """
+        Args:
+            max_size (int): Número máximo de decisões guardadas.
+            ttl (float): Validade de cada decisão em segundos (padrão: um candle de 15m).
+            name (str): Prefixo das métricas do cache.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.name = name
+        self._entries = OrderedDict()  # chave -> (instante de gravação, valor)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        Retorna o valor guardado para `key`, ou None se não houver ou tiver expirado.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                metrics.increment(f"{self.name}.misses")
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                metrics.increment(f"{self.name}.hits")
+            metrics.set_gauge(f"{self.name}.hit_rate", round(self._hit_rate(), 3))
+        return entry[1] if entry is not None else None
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """Retorna acertos, falhas, taxa de acerto e tamanho do cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self._hit_rate(),
+                "size": len(self._entries),
+            }
+
+
+# Cache compartilhado por todos os robôs do processo (a chave inclui o símbolo)
+gemini_decision_cache = DecisionCache()
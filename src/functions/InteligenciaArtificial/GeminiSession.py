@@ -0,0 +1,126 @@
+import os
+import threading
+import time
+from functions.logger import bot_logger
+from functions.metrics import metrics
+
+# genai.configure é global no processo: feito uma única vez
+_configure_lock = threading.Lock()
+_configured = None
+
+
+class GeminiSession:
+    """
+    Sessão reutilizável com um modelo Gemini.
+
+    A API é configurada uma vez e o modelo (com a instrução de sistema e o
+    formato de resposta) é criado no primeiro pedido e reaproveitado nos
+    seguintes. Cada pedido registra tokens de entrada e saída, tempo até o
+    primeiro token e latência total em `last_stats` e nas métricas.
+    """
+
+    def __init__(
+        self,
+        model_name,
+        system_instruction,
+        generation_config=None,
+        api_key=None,
+        api_url=None,
+    ):
+        """
+        Args:
+            model_name (str): Nome do modelo (ex: 'gemini-1.5-flash').
+            system_instruction (str): Instrução de sistema fixa da sessão.
+            generation_config (dict): Configuração de geração (ex: saída JSON).
+            api_key (str): Chave da API. Padrão: GEMINI_API_KEY do ambiente.
+            api_url (str): Endpoint alternativo (ex: StubModelServer local).
+                Padrão: GEMINI_API_URL do ambiente, se definido.
+        """
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+        self.generation_config = generation_config
+        self.api_key = api_key
+        self.api_url = api_url
+        self._model = None
+        self._lock = threading.Lock()
+        self.last_stats = None
+        self.requests = 0
+        self.total_tokens = 0
+
+    def _get_model(self):
+        global _configured
+        import google.generativeai as genai
+
+        with self._lock:
+            if self._model is not None:
+                return self._model
+            api_key = self.api_key or os.getenv("GEMINI_API_KEY")
+            api_url = self.api_url or os.getenv("GEMINI_API_URL")
+            with _configure_lock:
+                if _configured != (api_key, api_url):
+                    if api_url:
+                        # Servidor local: REST em vez de gRPC
+                        genai.configure(
+                            api_key=api_key,
+                            transport="rest",
+                            client_options={"api_endpoint": api_url},
+                        )
+                    else:
+                        genai.configure(api_key=api_key)
+                    _configured = (api_key, api_url)
+            self._model = genai.GenerativeModel(
+                self.model_name,
+                system_instruction=self.system_instruction,
+                generation_config=self.generation_config,
+            )
+            return self._model
+
+    def generate(self, prompt, timeout=30):
+        """
+        Envia `prompt` ao modelo e retorna o texto completo da resposta.
+
+        Args:
+            prompt (str): Conteúdo do pedido.
+            timeout (float): Tempo máximo da chamada, em segundos.
+
+        Returns:
+            str: Texto da resposta.
+        """
+        model = self._get_model()
+        started = time.monotonic()
+        response = model.generate_content(
+            prompt, stream=True, request_options={"timeout": timeout}
+        )
+
+        chunks = []
+        first_token_s = None
+        for chunk in response:
+            if first_token_s is None:
+                first_token_s = time.monotonic() - started
+            chunks.append(chunk.text)
+        latency_s = time.monotonic() - started
+
+        usage = getattr(response, "usage_metadata", None)
+        stats = {
+            "prompt_tokens": getattr(usage, "prompt_token_count", None),
+            "output_tokens": getattr(usage, "candidates_token_count", None),
+            "first_token_s": round(first_token_s or latency_s, 3),
+            "latency_s": round(latency_s, 3),
+        }
+        self._record(stats)
+        return "".join(chunks)
+
+    def _record(self, stats):
+        with self._lock:
+            self.last_stats = stats
+            self.requests += 1
+            self.total_tokens += (stats["prompt_tokens"] or 0) + (stats["output_tokens"] or 0)
+        metrics.increment("gemini.requests")
+        for name, value in stats.items():
+            if value is not None:
+                metrics.set_gauge(f"gemini.{name}", value)
+        bot_logger.info(
+            f"Gemini ({self.model_name}): "
+            f"tokens entrada={stats['prompt_tokens']} saída={stats['output_tokens']}, "
+            f"primeiro token {stats['first_token_s']:.3f}s, total {stats['latency_s']:.3f}s"
+        )
@@ -1,69 +1,149 @@
-import google.generativeai as genai
+import json
 import os
-from tabulate import tabulate
 import textwrap
-from rich.console import Console
 from files import palavras_ignorar
+from functions.resilience import get_breaker, retry_call, CircuitOpenError
+from functions.metrics import metrics
+from functions.logger import bot_logger, erro_logger
+from functions.TickReport import console_enabled
+from functions.InteligenciaArtificial.DecisionCache import gemini_decision_cache
+from functions.InteligenciaArtificial.GeminiSession import GeminiSession
+
+# Após 2 falhas seguidas o Gemini é ignorado por 5 minutos e a estratégia
+# segue apenas com a decisão das regras.
+gemini_breaker = get_breaker("gemini", failure_threshold=2, reset_timeout=300)
+
+# Limite de cada chamada ao modelo; o prazo do tick é controlado pelo LLMAdvisor
+GEMINI_REQUEST_TIMEOUT = 30
+
+# Formato da resposta pedido ao modelo (saída JSON restrita ao esquema)
+DECISION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "decisao": {"type": "string", "enum": ["comprar", "vender", "manter"]},
+        "confianca": {"type": "number"},
+        "motivos": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["decisao", "confianca", "motivos"],
+}
+DECISION_VALUES = {"comprar": True, "vender": False, "manter": None}
+
+# Legenda da codificação compacta dos indicadores (ver encode_features)
+FEATURE_LEGEND = {
+    "pos": "posição (1 comprado, 0 vendido)",
+    "px": "preço atual",
+    "maf": "última média rápida",
+    "mas": "última média lenta",
+    "gap": "maf - mas em % do preço",
+    "vol": "última volatilidade",
+    "volm": "média da volatilidade",
+    "rsi": "último RSI",
+    "gf": "gradiente rápido",
+    "gfa": "gradiente rápido anterior",
+    "gs": "gradiente lento",
+    "gsa": "gradiente lento anterior",
+    "gmed": "média recente dos gradientes rápidos",
+    "galta": "média necessária para tendência de alta",
+    "gsaida": "gradiente rápido mínimo para continuar na tendência",
+    "cresc": "% de crescimento do gradiente rápido",
+    "queda": "% de queda do gradiente rápido",
+}
+
+SYSTEM_PROMPT = (
+    "Você é um analista de trading altamente especializado, com ampla experiência em mercados financeiros e criptomoedas. "
+    "Seu objetivo é analisar dados técnicos e fornecer estratégias precisas para tomada de decisão. "
+    "Os dados chegam como 'SIMBOLO chave=valor ...', com as chaves: "
+    + "; ".join(f"{key}={meaning}" for key, meaning in FEATURE_LEGEND.items())
+    + ". Escolha UMA decisão: comprar, vender ou manter. "
+    "Responda somente com o JSON pedido: 'decisao', 'confianca' (de 0 a 1) e 'motivos' "
+    "(no máximo 3 frases curtas)."
+)
+
+# Sessão compartilhada: configura a API e cria o modelo uma única vez
+gemini_session = GeminiSession(
+    "gemini-1.5-flash",
+    SYSTEM_PROMPT,
+    generation_config={
+        "response_mime_type": "application/json",
+        "response_schema": DECISION_SCHEMA,
+    },
+)
+
+
+def encode_features(symbol, features):
+    """
+    Codifica os indicadores em uma linha compacta para o modelo.
+
+    Args:
+        symbol (str): Par de negociação (ex: 'SOLUSDT').
+        features (dict): Valores por chave de FEATURE_LEGEND.
+
+    Returns:
+        str: Ex: 'SOLUSDT pos=0 px=151.2 maf=150.9 ...'.
+    """
+    values = []
+    for key, value in features.items():
+        if isinstance(value, bool):
+            value = int(value)
+        elif value is not None:
+            value = f"{float(value):.5g}"
+        values.append(f"{key}={value}")
+    return f"{symbol} " + " ".join(values)
 
 
 class GeminiTradingBot:
-    def __init__(self, dados):
+    def __init__(self, dados, features=None, cache=gemini_decision_cache):
+        """
+        Args:
+            dados (str): Texto com os indicadores enviado ao modelo.
+            features (tuple): Chave quantizada do estado (quantize_features).
+                Sem ela o cache de decisões não é usado.
+            cache (DecisionCache): Cache de decisões.
+        """
         self.api_key = os.getenv("GEMINI_API_KEY")
         self.dados = dados
+        self.features = features
+        self.cache = cache
+        self.confidence = None
+        self.reasons = []
 
     def geminiTrader(self):
-        # Verifica se a chave de API está configurada
+        # Roda nas threads do LLMAdvisor: mensagens vão para o log, e o console
+        # (rich) só é usado com STRATEGY_CONSOLE_REPORT ligado
+        # Sem chave de API a estratégia segue só com as regras
         if not self.api_key:
-            raise ValueError(
+            erro_logger.warning(
                 "A chave de API do Gemini não foi encontrada. Configure GEMINI_API_KEY no ambiente."
             )
+            return None, None
 
         # Valida os dados fornecidos
         if not isinstance(self.dados, str) or not self.dados.strip():
             raise ValueError("Os dados para análise devem ser uma string não vazia.")
 
-        # Configura a API do Gemini
-        try:
-            genai.configure(api_key=self.api_key)
-        except Exception as e:
-            raise RuntimeError(f"Erro ao configurar a API do Gemini: {e}")
+        # Estado de mercado já visto há pouco: reaproveita a decisão anterior
+        if self.features is not None:
+            cached = self.cache.get(self.features)
+            if cached is not None:
+                bot_logger.info(
+                    f"Decisão do Gemini reaproveitada do cache "
+                    f"(taxa de acerto: {self.cache.stats()['hit_rate']:.0%})."
+                )
+                return cached
+
+        # Circuito aberto: falha rápida, sem esperar o timeout da API
+        if not gemini_breaker.available():
+            bot_logger.warning("Gemini indisponível (circuito aberto); usando apenas as regras.")
+            return None, None
 
         try:
-            # Inicializa o modelo de chat
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            chat = model.start_chat(
-                history=[
-                    {
-                        "role": "user",
-                        "parts": (
-                            "Você é um analista de trading altamente especializado, com ampla experiência em mercados financeiros e criptomoedas. "
-                            "Seu objetivo é analisar dados técnicos e fornecer estratégias precisas para tomada de decisão. "
-                            "Com base nas informações a seguir, analise os dados e forneça uma decisão de manter, comprar, vender"
-                            "!SOMENTE UMA ESCOLHA JAMAIS MAIS DE UMA!, explicando seus motivos para a escolha. "
-                            "evite usar as palavras 'comprar','vender','manter' na mesma resposta para evitar meu codigo de não identificar sua resposta. "
-                            "a primeira linha ja defina a decisão que você deseja fazer. para eu capturar sua decisão posteriormente e trasformala em um booleano."
-                            "Não use muitos caracteres para não ficar muito grande a resposta. "
-                            "!AS PALAVRAS manter, comprar, vender SÓ DEVEM SER USADAS UMA SÓ VEZ E SÓ DEVEM SER MENCIONADAS NA INTENSÃO DE INDICAR SUA DECISÃO,NÃO USE ELAS PARA COMPLEMENTAR FRASES E OUTROS AFINS ISSO PREJUDICA MEU CODIGO DE ANALISAR SUA DECISÃO!"
-                            f"Dados para análise:\n{self.dados}"
-                        ),
-                    }
-                ]
+            decision = retry_call(
+                self._ask_model, attempts=2, base_delay=1.0, breaker=gemini_breaker
             )
 
-            # Envia a mensagem e coleta a resposta
-            response = chat.send_message(self.dados, stream=True)
-            console = Console()
-
-            # Processa a resposta do modelo
-            decision = ""
-            for chunk in response:
-                decision += chunk.text
-
-            # Formata a resposta para exibição em tabela
-            formatted_response = self.format_response_as_table(decision)
             try:
-                # Converte a decisão para booleano
-                decision_bool = self.convert_decision_to_bool(decision)
+                # Converte a resposta em tabela e a decisão em booleano
+                formatted_response, decision_bool = self.parse_response(decision)
 
                 # Formata a mensagem para o console
                 message = (
@@ -76,29 +156,71 @@ class GeminiTradingBot:
                     )
                 )
 
-                # Exibe no console com estilo apropriado
-                console.print(
-                    message,
-                    style=(
-                        "bold green"
-                        if decision_bool
-                        else "bold red" if decision_bool is False else "bold yellow"
-                    ),
-                )
+                bot_logger.info(message)
+                if console_enabled():
+                    from rich.console import Console
+
+                    # Exibe no console com estilo apropriado
+                    Console().print(
+                        message,
+                        style=(
+                            "bold green"
+                            if decision_bool
+                            else "bold red" if decision_bool is False else "bold yellow"
+                        ),
+                    )
 
             except ValueError as e:
                 # Tratamento para erro de decisão inválida
-                print(f"Erro ao processar decisão: {e}")
+                erro_logger.error(f"Erro ao processar decisão: {e}")
+                formatted_response = self.format_response_as_table(decision)
                 decision_bool = None
+            else:
+                # Só respostas válidas entram no cache
+                if self.features is not None:
+                    self.cache.put(self.features, (formatted_response, decision_bool))
 
             # Retorna a resposta formatada e o resultado booleano
             return formatted_response, decision_bool
 
+        except CircuitOpenError:
+            bot_logger.warning("Gemini indisponível (circuito aberto); usando apenas as regras.")
+            return None, None
         except Exception as e:
             # Tratamento para erros gerais
-            print(f"Erro ao processar os dados com o Gemini: {e}")
+            erro_logger.error(f"Erro ao processar os dados com o Gemini: {e}")
             return None, None
 
+    def _ask_model(self):
+        """Envia os dados ao Gemini pela sessão compartilhada e retorna o texto da resposta."""
+        return gemini_session.generate(self.dados, timeout=GEMINI_REQUEST_TIMEOUT)
+
+    def parse_response(self, response_text):
+        """
+        Interpreta a resposta do modelo.
+
+        A resposta JSON (DECISION_SCHEMA) é lida com um único json.loads; o
+        parser de texto livre só é usado se ela não vier nesse formato.
+
+        Returns:
+            tuple: (tabela formatada, decisão) com decisão True para comprar,
+                False para vender e None para manter.
+
+        Raises:
+            ValueError: Se a decisão não puder ser identificada.
+        """
+        try:
+            data = json.loads(response_text)
+            decision_bool = DECISION_VALUES[data["decisao"].lower()]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            metrics.increment("gemini.text_fallback")
+            formatted_response = self.format_response_as_table(response_text)
+            return formatted_response, self.convert_decision_to_bool(response_text)
+
+        self.confidence = data.get("confianca")
+        self.reasons = data.get("motivos") or []
+        return self.format_structured_response(data), decision_bool
+
     def convert_decision_to_bool(self, decision_text):
         """
         Transforma a decisão de texto em um valor booleano.
@@ -135,8 +257,24 @@ class GeminiTradingBot:
             f"Decisão inválida ou incompleta fornecida pelo Gemini: '{decision_text}'"
         )
 
+    @staticmethod
+    def format_structured_response(data, max_line_length=50):
+        """Formata a resposta JSON do modelo como tabela."""
+        from tabulate import tabulate
+
+        rows = [["Decisão", str(data["decisao"]).capitalize()]]
+        if data.get("confianca") is not None:
+            rows.append(["Confiança", f"{float(data['confianca']):.0%}"])
+        if data.get("motivos"):
+            rows.append(
+                ["Motivo", textwrap.fill(" ".join(data["motivos"]), width=max_line_length)]
+            )
+        return tabulate(rows, headers=["Campo", "Valor"], tablefmt="grid")
+
     @staticmethod
     def format_response_as_table(response, max_line_length=50):
+        from tabulate import tabulate
+
         # Inicializa os insights com valores padrão
         insights = {
             "Decisão": "",
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from functions.logger import bot_logger, erro_logger
+from functions.metrics import metrics
+
+
+class LLMAdvisor:
+    """
+    Executa as consultas ao modelo de IA em segundo plano, com prazo por tick.
+
+    Cada consulta roda em um pool com no máximo `max_concurrency` threads,
+    compartilhado por todos os robôs do processo. Quem pede espera até o
+    prazo; se a resposta não chegar a tempo o tick segue com a decisão das
+    regras e a resposta atrasada, quando chegar, é registrada no bot.log e
+    entregue ao `on_late` de quem pediu (ex: para o diário de decisões).
+    Só há uma consulta em andamento por robô.
+    """
+
+    def __init__(self, max_concurrency=4, deadline=5.0):
+        """
+        Args:
+            max_concurrency (int): Número máximo de consultas simultâneas.
+            deadline (float): Tempo máximo de espera por tick, em segundos.
+        """
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self._executor = None
+        self._pending = {}  # robô (ou símbolo) -> Future em andamento
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Criado no primeiro uso: sem IA configurada nenhuma thread é aberta
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency, thread_name_prefix="llm-advisor"
+            )
+        return self._executor
+
+    def submit(self, func, *args, **kwargs):
+        """Executa func(*args, **kwargs) no pool, sem prazo. Retorna o Future."""
+        return self._get_executor().submit(func, *args, **kwargs)
+
+    def advise(self, symbol, func, *args, deadline=None, bot=None, on_late=None, **kwargs):
+        """
+        Executa func(*args, **kwargs) no pool e espera a resposta até o prazo.
+
+        Args:
+            symbol (str): Par de negociação.
+            func: Função que consulta o modelo.
+            deadline (float): Prazo deste tick. Padrão: self.deadline.
+            bot (str): Nome do robô (uma consulta em andamento por robô). Padrão: symbol.
+            on_late: Função (resposta, segundos) chamada com a resposta que
+                chegar depois do prazo.
+
+        Returns:
+            tuple: (chegou_a_tempo, resposta). A resposta é None se não chegou
+                a tempo, se já havia consulta em andamento ou se func falhou.
+        """
+        return self.advise_future(
+            symbol,
+            lambda: self.submit(func, *args, **kwargs),
+            deadline=deadline,
+            bot=bot,
+            on_late=on_late,
+        )
+
+    def advise_future(self, symbol, submit, deadline=None, bot=None, on_late=None):
+        """
+        Como advise(), para consultas que já devolvem um Future (ex: BatchAdvisor).
+
+        Args:
+            symbol (str): Par de negociação.
+            submit: Função sem argumentos que inicia a consulta e retorna o Future.
+            deadline (float): Prazo deste tick. Padrão: self.deadline.
+            bot (str): Nome do robô. Padrão: symbol.
+            on_late: Função (resposta, segundos) para a resposta atrasada.
+        """
+        deadline = self.deadline if deadline is None else deadline
+        key = bot or symbol
+        with self._lock:
+            if key in self._pending:
+                metrics.increment("llm_advisor.skipped")
+                bot_logger.info(
+                    f"Consulta à IA de {key} ainda em andamento; tick segue com as regras."
+                )
+                return False, None
+            started = time.monotonic()
+            future = submit()
+            self._pending[key] = future
+
+        try:
+            result = future.result(timeout=deadline)
+        except TimeoutError:
+            metrics.increment("llm_advisor.late")
+            bot_logger.warning(
+                f"IA não respondeu em {deadline:.1f}s para {key}; usando a decisão das regras."
+            )
+            future.add_done_callback(
+                lambda done: self._log_late_answer(key, started, done, on_late)
+            )
+            return False, None
+        except Exception as e:
+            self._release(key)
+            erro_logger.error(f"Erro na consulta à IA de {key}: {e}")
+            return False, None
+
+        self._release(key)
+        metrics.set_gauge("llm_advisor.latency_s", round(time.monotonic() - started, 3))
+        return True, result
+
+    def _release(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _log_late_answer(self, key, started, future, on_late=None):
+        self._release(key)
+        elapsed = time.monotonic() - started
+        try:
+            result = future.result()
+        except Exception as e:
+            erro_logger.error(f"Consulta atrasada à IA de {key} falhou após {elapsed:.1f}s: {e}")
+            return
+        bot_logger.info(
+            f"Resposta atrasada da IA para {key} ({elapsed:.1f}s), não usada no tick: {result}"
+        )
+        if on_late is not None:
+            try:
+                on_late(result, elapsed)
+            except Exception as e:
+                erro_logger.error(f"Erro ao registrar a resposta atrasada da IA de {key}: {e}")
+
+    def shutdown(self, wait=False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+# Pool compartilhado por todos os robôs do processo
+gemini_advisor = LLMAdvisor(
+    max_concurrency=int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")),
+    deadline=float(os.getenv("GEMINI_DEADLINE_SECONDS", "5")),
+)
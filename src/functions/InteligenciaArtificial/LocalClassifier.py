@@ -0,0 +1,488 @@
+"""
+Classificador local (regressão logística multinomial em NumPy) que pode
+substituir a consulta ao Gemini na decisão final da estratégia.
+
+Treino offline a partir de klines (arquivo JSON {"SOLUSDT": [[kline], ...]},
+o mesmo formato do MockBinanceServer), do diário de decisões dos robôs ou de
+dados sintéticos:
+
+    python -m functions.InteligenciaArtificial.LocalClassifier --klines-file klines.json
+    python -m functions.InteligenciaArtificial.LocalClassifier --journal journal
+
+Com LOCAL_MODEL_PATH apontando para o modelo gravado, a estratégia usa o
+classificador no lugar do Gemini.
+"""
+
+import argparse
+import os
+import threading
+from concurrent.futures import Future
+import numpy as np
+from functions.checkpoint import atomic_write
+from functions.indicadores.rolling_indicators import rolling_mean, rolling_std, rsi
+
+# Ordem das colunas de feature_vector / features_from_series
+FEATURE_NAMES = ("gap", "vol_ratio", "rsi", "gf", "gs")
+CLASSES = ("vender", "manter", "comprar")
+CLASS_DECISIONS = (False, None, True)
+
+DEFAULT_MODEL_PATH = os.path.join("models", "local_classifier.npz")
+
+
+def feature_vector(
+    current_price,
+    last_ma_fast,
+    last_ma_slow,
+    last_volatility,
+    volatility,
+    last_rsi,
+    fast_gradient,
+    slow_gradient,
+):
+    """
+    Vetor de características de um tick, a partir dos valores da estratégia.
+
+    Todas as medidas são relativas ao preço, para o mesmo modelo servir a
+    qualquer símbolo.
+
+    Returns:
+        np.ndarray: Vetor com as colunas de FEATURE_NAMES.
+    """
+    price = float(current_price) or 1.0
+    return np.array(
+        [
+            (last_ma_fast - last_ma_slow) / price * 100,
+            last_volatility / volatility if volatility else 1.0,
+            last_rsi / 100,
+            fast_gradient / price * 1000,
+            slow_gradient / price * 1000,
+        ],
+        dtype="f8",
+    )
+
+
+def features_from_series(close, fast_window=7, slow_window=40, rsi_period=5):
+    """
+    Calcula o vetor de características de cada candle de uma série de fechamentos.
+
+    Args:
+        close (np.ndarray): Preços de fechamento, do mais antigo ao mais novo.
+        fast_window (int): Janela da média rápida.
+        slow_window (int): Janela da média lenta (e da volatilidade).
+        rsi_period (int): Período do RSI.
+
+    Returns:
+        np.ndarray: Matriz (len(close), len(FEATURE_NAMES)), com NaN nas linhas
+            sem histórico suficiente.
+    """
+    close = np.asarray(close, dtype="f8")
+    ma_fast = rolling_mean(close, fast_window)
+    ma_slow = rolling_mean(close, slow_window)
+    volatility = rolling_std(close, slow_window)
+    # Média da volatilidade dos últimos slow_window valores, como na estratégia
+    volatility_mean = rolling_mean(volatility, slow_window)
+    fast_gradient = np.diff(ma_fast, prepend=np.nan)
+    slow_gradient = np.diff(ma_slow, prepend=np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.column_stack(
+            [
+                (ma_fast - ma_slow) / close * 100,
+                volatility / volatility_mean,
+                rsi(close, rsi_period) / 100,
+                fast_gradient / close * 1000,
+                slow_gradient / close * 1000,
+            ]
+        )
+
+
+# Colunas do diário usadas por journal_features
+JOURNAL_FEATURE_COLUMNS = (
+    "price",
+    "ma_fast",
+    "ma_slow",
+    "volatility",
+    "volatility_mean",
+    "rsi",
+    "fast_gradient",
+    "slow_gradient",
+)
+
+
+def journal_features(rows):
+    """
+    Características de feature_vector para linhas do diário de decisões.
+
+    Args:
+        rows (dict): {coluna: np.ndarray} com JOURNAL_FEATURE_COLUMNS
+            (resultado de DecisionJournal.query).
+
+    Returns:
+        np.ndarray: Matriz (linhas, len(FEATURE_NAMES)).
+    """
+    price = np.asarray(rows["price"], dtype="f8")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.column_stack(
+            [
+                (rows["ma_fast"] - rows["ma_slow"]) / price * 100,
+                rows["volatility"] / rows["volatility_mean"],
+                rows["rsi"] / 100,
+                rows["fast_gradient"] / price * 1000,
+                rows["slow_gradient"] / price * 1000,
+            ]
+        )
+
+
+def label_outcomes(close, horizon=4, threshold=0.002):
+    """
+    Rótulo de cada candle pelo retorno dos `horizon` candles seguintes.
+
+    Returns:
+        np.ndarray: Índices de CLASSES (0 vender, 1 manter, 2 comprar), com -1
+            nos últimos candles, ainda sem resultado.
+    """
+    close = np.asarray(close, dtype="f8")
+    labels = np.full(len(close), -1, dtype="i8")
+    if len(close) > horizon:
+        future_return = close[horizon:] / close[:-horizon] - 1
+        labels[:-horizon] = np.where(
+            future_return > threshold, 2, np.where(future_return < -threshold, 0, 1)
+        )
+    return labels
+
+
+def _softmax(scores):
+    scores = scores - scores.max(axis=1, keepdims=True)
+    exp = np.exp(scores)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class LocalClassifier:
+    """
+    Regressão logística multinomial (softmax) treinada com gradiente descendente.
+
+    A predição é um produto de matrizes: um tick custa microssegundos, e
+    decide_batch() decide vários símbolos em uma única chamada.
+    """
+
+    def __init__(self):
+        self.weights = None
+        self.bias = None
+        self.mean = None
+        self.scale = None
+
+    def fit(self, features, labels, epochs=500, learning_rate=0.5, l2=1e-4):
+        """
+        Treina o modelo. Linhas com NaN ou rótulo -1 são descartadas.
+
+        Args:
+            features (np.ndarray): Matriz (n, len(FEATURE_NAMES)).
+            labels (np.ndarray): Índices de CLASSES.
+            epochs (int): Iterações do gradiente descendente.
+            learning_rate (float): Passo do gradiente.
+            l2 (float): Regularização L2.
+
+        Returns:
+            LocalClassifier: O próprio modelo.
+        """
+        valid = ~np.isnan(features).any(axis=1) & (labels >= 0)
+        features, labels = features[valid], labels[valid]
+        if not len(labels):
+            raise ValueError("Sem amostras válidas para treinar o classificador local.")
+
+        self.mean = features.mean(axis=0)
+        self.scale = features.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        normalized = (features - self.mean) / self.scale
+
+        # Pesos por classe inversos à frequência: "manter" domina os rótulos
+        counts = np.bincount(labels, minlength=len(CLASSES))
+        sample_weights = (len(labels) / (len(CLASSES) * np.maximum(counts, 1)))[labels]
+        sample_weights /= sample_weights.sum()
+        targets = np.eye(len(CLASSES))[labels]
+
+        self.weights = np.zeros((features.shape[1], len(CLASSES)))
+        self.bias = np.zeros(len(CLASSES))
+        for _ in range(epochs):
+            error = (_softmax(normalized @ self.weights + self.bias) - targets) * sample_weights[:, None]
+            self.weights -= learning_rate * (normalized.T @ error + l2 * self.weights)
+            self.bias -= learning_rate * error.sum(axis=0)
+        return self
+
+    def predict_proba(self, features):
+        """Probabilidade de cada classe para cada linha de `features`."""
+        features = np.atleast_2d(np.asarray(features, dtype="f8"))
+        features = np.nan_to_num((features - self.mean) / self.scale)
+        return _softmax(features @ self.weights + self.bias)
+
+    def decide(self, features):
+        """
+        Decide um tick.
+
+        Returns:
+            tuple: (decisão, confiança), com decisão True para comprar, False
+                para vender e None para manter.
+        """
+        probabilities = self.predict_proba(features)[0]
+        index = int(probabilities.argmax())
+        return CLASS_DECISIONS[index], float(probabilities[index])
+
+    def decide_batch(self, features_by_symbol):
+        """
+        Decide vários símbolos com uma única predição.
+
+        Args:
+            features_by_symbol (dict): {símbolo: feature_vector(...)}.
+
+        Returns:
+            dict: {símbolo: (decisão, confiança)}.
+        """
+        symbols = list(features_by_symbol)
+        if not symbols:
+            return {}
+        probabilities = self.predict_proba(np.vstack([features_by_symbol[s] for s in symbols]))
+        indexes = probabilities.argmax(axis=1)
+        return {
+            symbol: (CLASS_DECISIONS[index], float(probabilities[row, index]))
+            for row, (symbol, index) in enumerate(zip(symbols, indexes))
+        }
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Grava o modelo (.npz) de forma atômica."""
+        arrays = {
+            "weights": self.weights,
+            "bias": self.bias,
+            "mean": self.mean,
+            "scale": self.scale,
+            "feature_names": np.array(FEATURE_NAMES),
+        }
+        atomic_write(path, lambda file: np.savez(file, **arrays))
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH):
+        """
+        Carrega um modelo gravado com save().
+
+        Raises:
+            ValueError: Se o modelo foi treinado com outras características.
+        """
+        with np.load(path, allow_pickle=False) as data:
+            if tuple(data["feature_names"]) != FEATURE_NAMES:
+                raise ValueError(
+                    f"Modelo {path} usa outras características: {tuple(data['feature_names'])}"
+                )
+            model = cls()
+            model.weights = data["weights"]
+            model.bias = data["bias"]
+            model.mean = data["mean"]
+            model.scale = data["scale"]
+        return model
+
+
+_local_classifier = None
+_load_lock = threading.Lock()
+_load_failed = False
+
+
+def get_local_classifier():
+    """
+    Retorna o classificador de LOCAL_MODEL_PATH, carregado uma vez por processo.
+
+    Returns:
+        LocalClassifier: O modelo, ou None se LOCAL_MODEL_PATH não estiver
+            definido ou o modelo não puder ser carregado (a estratégia segue
+            então com o Gemini).
+    """
+    global _local_classifier, _load_failed
+    path = os.getenv("LOCAL_MODEL_PATH")
+    if not path or _load_failed:
+        return None
+    with _load_lock:
+        if _local_classifier is None and not _load_failed:
+            try:
+                _local_classifier = LocalClassifier.load(path)
+            except (OSError, ValueError, KeyError) as e:
+                from functions.logger import erro_logger
+
+                erro_logger.error(f"Modelo local {path} não carregado ({e}); usando o Gemini.")
+                _load_failed = True
+        return _local_classifier
+
+
+class LocalBatchPredictor:
+    """
+    Agrupa as predições do classificador local dos robôs do processo.
+
+    Pedidos que chegam dentro de `window` segundos (robôs cujos candles fecham
+    juntos) são decididos com uma única chamada a decide_batch, como o
+    BatchAdvisor faz com o Gemini.
+    """
+
+    def __init__(self, window=0.0, max_batch=64, timeout=1.0):
+        """
+        Args:
+            window (float): Tempo de espera para juntar pedidos, em segundos.
+            max_batch (int): Número máximo de pedidos por predição.
+            timeout (float): Espera máxima pela predição além da janela, em segundos.
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._batch = []
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.window > 0
+
+    @property
+    def deadline(self):
+        """Prazo para quem espera o Future de submit (janela + timeout)."""
+        return self.window + self.timeout
+
+    def submit(self, model, features):
+        """
+        Enfileira um vetor de feature_vector no próximo lote.
+
+        Returns:
+            Future: Resolve para (decisão, confiança), como LocalClassifier.decide.
+        """
+        future = Future()
+        batch = None
+        with self._lock:
+            self._batch.append((model, features, future))
+            if len(self._batch) >= self.max_batch:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                batch, self._batch = self._batch, []
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if batch:
+            self._run_batch(batch)
+        return future
+
+    def _flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+            self._timer = None
+        if batch:
+            self._run_batch(batch)
+
+    @staticmethod
+    def _run_batch(batch):
+        # Índices como chave: dois robôs do mesmo símbolo podem cair no mesmo lote
+        by_model = {}
+        for index, (model, features, _) in enumerate(batch):
+            by_model.setdefault(id(model), (model, {}))[1][index] = features
+        try:
+            results = {}
+            for model, features_by_index in by_model.values():
+                results.update(model.decide_batch(features_by_index))
+            for index, (_, _, future) in enumerate(batch):
+                future.set_result(results[index])
+        except Exception as e:
+            # Nenhum robô fica esperando: quem não recebeu resultado recebe o erro
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+
+# Desativado por padrão; LOCAL_BATCH_WINDOW_MS > 0 liga o agrupamento
+local_batch_predictor = LocalBatchPredictor(
+    window=float(os.getenv("LOCAL_BATCH_WINDOW_MS", "0")) / 1000,
+    max_batch=int(os.getenv("LOCAL_BATCH_MAX", "64")),
+)
+
+
+def training_data(closes, fast_window=7, slow_window=40, rsi_period=5, horizon=4, threshold=0.002):
+    """
+    Monta (características, rótulos) a partir de várias séries de fechamentos.
+
+    Args:
+        closes (list): Lista de arrays de fechamentos (um por símbolo).
+
+    Returns:
+        tuple: (np.ndarray, np.ndarray) prontos para LocalClassifier.fit.
+    """
+    features = [features_from_series(c, fast_window, slow_window, rsi_period) for c in closes]
+    labels = [label_outcomes(c, horizon, threshold) for c in closes]
+    return np.vstack(features), np.concatenate(labels)
+
+
+def journal_training_data(journal, symbols=None, horizon=4, threshold=0.002):
+    """
+    Monta (características, rótulos) a partir do diário de decisões.
+
+    As características são as mesmas de feature_vector, com os valores que a
+    estratégia calculou em cada tick; o rótulo vem do preço `horizon` ticks
+    depois, na série de cada robô (robôs do mesmo símbolo não se misturam).
+
+    Args:
+        journal (DecisionJournal): Diário de decisões.
+        symbols (list): Símbolos a usar. Padrão: todos do diário.
+
+    Returns:
+        tuple: (np.ndarray, np.ndarray) prontos para LocalClassifier.fit.
+    """
+    features, labels = [], []
+    for bot in journal.bots(symbols):
+        rows = journal.query(bots=[bot], columns=list(JOURNAL_FEATURE_COLUMNS))
+        features.append(journal_features(rows))
+        labels.append(label_outcomes(rows["price"], horizon, threshold))
+    if not features:
+        return np.empty((0, len(FEATURE_NAMES))), np.empty(0, dtype="i8")
+    return np.vstack(features), np.concatenate(labels)
+
+
+def load_closes(klines_file=None, symbols=("SOL/USDT",), seed=None):
+    """Fechamentos por símbolo do arquivo de klines (ou sintéticos, como no mock)."""
+    from functions.binance.MockBinanceServer import load_markets
+
+    markets = load_markets(list(symbols), klines_file, seed=seed)
+    return {
+        market.symbol: np.array([float(k[4]) for k in market.klines]) for market in markets
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Treina o classificador local a partir de klines ou do diário de decisões."
+    )
+    parser.add_argument("--klines-file", help='JSON {"SOLUSDT": [[kline], ...]}.')
+    parser.add_argument("--journal", help="Diretório do diário de decisões (JOURNAL_DIR).")
+    parser.add_argument("--symbols", nargs="+", help="Padrão: SOL/USDT (todos, com --journal).")
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--horizon", type=int, default=4)
+    parser.add_argument("--threshold", type=float, default=0.002)
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    if args.journal:
+        from functions.DecisionJournal import DecisionJournal
+
+        journal = DecisionJournal(args.journal)
+        # No diário os símbolos não têm barra (ex: SOLUSDT)
+        closes = [s.replace("/", "") for s in args.symbols or []] or journal.symbols()
+        features, labels = journal_training_data(
+            journal, closes, horizon=args.horizon, threshold=args.threshold
+        )
+    else:
+        closes = load_closes(args.klines_file, args.symbols or ["SOL/USDT"], args.seed)
+        features, labels = training_data(
+            list(closes.values()), horizon=args.horizon, threshold=args.threshold
+        )
+    model = LocalClassifier().fit(features, labels, epochs=args.epochs)
+
+    valid = ~np.isnan(features).any(axis=1) & (labels >= 0)
+    accuracy = (model.predict_proba(features[valid]).argmax(axis=1) == labels[valid]).mean()
+    model.save(args.out)
+    print(
+        f"Modelo gravado em {args.out}: {valid.sum()} amostras de {len(closes)} símbolo(s), "
+        f"acerto no treino {accuracy:.1%}"
+    )
+    print(f"Use: LOCAL_MODEL_PATH={args.out}")
@@ -0,0 +1,197 @@
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+class StubModelServer:
+    """
+    Servidor local que imita a API REST do Gemini (generateContent e
+    streamGenerateContent) com respostas prontas, para testar o
+    GeminiTradingBot e o BatchAdvisor offline.
+
+    Cada linha do pedido é lida como 'SIMBOLO chave=valor ...' (formato de
+    encode_features). Se o esquema pedido tiver 'decisoes' a resposta traz
+    uma decisão por símbolo; caso contrário, a decisão do primeiro símbolo.
+
+    Uso com o bot: GEMINI_API_URL=<base_url> e qualquer GEMINI_API_KEY.
+
+    Opções:
+        decisions: {símbolo: 'comprar' | 'vender' | 'manter'} (padrão: default_decision).
+        latency_ms / latency_jitter_ms: atraso artificial por requisição.
+        omit_symbols: símbolos deixados de fora das respostas em lote
+            (simula falha parcial do lote).
+    """
+
+    def __init__(
+        self,
+        decisions=None,
+        default_decision="manter",
+        host="127.0.0.1",
+        port=0,
+        latency_ms=0,
+        latency_jitter_ms=0,
+        omit_symbols=(),
+        seed=None,
+    ):
+        self.decisions = dict(decisions or {})
+        self.default_decision = default_decision
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.omit_symbols = set(omit_symbols)
+        self.requests = []  # símbolos de cada requisição recebida
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Inicia o servidor em uma thread daemon e retorna a si mesmo."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="stub-model", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _sleep(self):
+        delay = self.latency_ms + self._random.uniform(0, self.latency_jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _decision(self, symbol):
+        return {
+            "decisao": self.decisions.get(symbol, self.default_decision),
+            "confianca": 0.5,
+            "motivos": [f"Resposta pronta do servidor de teste para {symbol}."],
+        }
+
+    def generate(self, body):
+        """Monta a resposta (formato da API) para o corpo de um pedido generateContent."""
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        symbols = [line.split()[0] for line in prompt.splitlines() if line.strip()]
+        with self._lock:
+            self.requests.append(symbols)
+
+        schema = body.get("generationConfig", {}).get("responseSchema", {})
+        if "decisoes" in schema.get("properties", {}):
+            answer = {
+                "decisoes": [
+                    {"simbolo": symbol, **self._decision(symbol)}
+                    for symbol in symbols
+                    if symbol not in self.omit_symbols
+                ]
+            }
+        else:
+            answer = self._decision(symbols[0] if symbols else "")
+        text = json.dumps(answer, ensure_ascii=False)
+
+        return {
+            "candidates": [
+                {
+                    "content": {"parts": [{"text": text}], "role": "model"},
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ],
+            "usageMetadata": {
+                # Estimativa grosseira: ~4 caracteres por token
+                "promptTokenCount": len(prompt) // 4 + 1,
+                "candidatesTokenCount": len(text) // 4 + 1,
+                "totalTokenCount": (len(prompt) + len(text)) // 4 + 2,
+            },
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # Silencia o log padrão do http.server
+
+            def do_POST(self):
+                path = urlparse(self.path).path
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    return self._send(400, {"error": {"message": "JSON inválido"}})
+                if not path.endswith(("generateContent", "GenerateContent")):
+                    return self._send(404, {"error": {"message": f"{path} não existe"}})
+
+                server._sleep()
+                response = server.generate(body)
+                # O streaming REST do SDK espera um array JSON de respostas
+                self._send(200, [response] if "streamGenerateContent" in path else response)
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Servidor local com respostas prontas no formato da API do Gemini."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument(
+        "--decision",
+        action="append",
+        default=[],
+        metavar="SIMBOLO=DECISAO",
+        help="Decisão pronta por símbolo (ex: SOLUSDT=comprar).",
+    )
+    parser.add_argument("--default-decision", default="manter")
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--omit", nargs="*", default=[], help="Símbolos omitidos nos lotes.")
+    args = parser.parse_args()
+
+    stub = StubModelServer(
+        decisions=dict(item.split("=", 1) for item in args.decision),
+        default_decision=args.default_decision,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        omit_symbols=args.omit,
+    )
+    print(f"Stub do Gemini em {stub.base_url}")
+    print(f"Use: GEMINI_API_URL={stub.base_url}")
+    stub.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stub.stop()
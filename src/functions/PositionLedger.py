@@ -0,0 +1,258 @@
+import threading
+from dataclasses import dataclass, field
+from decimal import Decimal
+from binance.exceptions import BinanceAPIException
+from db.neonDbConfig import get_positions, save_position
+from db.writeBehind import write_behind
+from functions.logger import bot_logger, erro_logger
+
+
+@dataclass
+class Position:
+    """
+    Posição de um símbolo.
+
+    Attributes:
+        symbol (str): Par de negociação (ex: 'SOLUSDT').
+        quantity (Decimal): Quantidade do ativo em carteira.
+        avg_entry_price (Decimal): Preço médio de entrada.
+        realized_pnl (Decimal): Lucro/prejuízo realizado acumulado (moeda de cotação).
+        last_side (str): Lado da última execução ('BUY', 'SELL' ou None).
+        fees (dict): Comissões pagas em outros ativos (ex: BNB), {ativo: Decimal};
+            não entram no realized_pnl, que é só na moeda de cotação.
+    """
+
+    symbol: str
+    quantity: Decimal = Decimal("0")
+    avg_entry_price: Decimal = Decimal("0")
+    realized_pnl: Decimal = Decimal("0")
+    last_side: str = None
+    fees: dict = field(default_factory=dict)
+
+    @property
+    def is_long(self):
+        # Mesmo critério do get_my_trades(limit=1)['isBuyer']
+        return self.last_side == "BUY"
+
+
+class PositionLedger:
+    """
+    Registro local das posições, construído a partir das execuções das ordens.
+
+    Substitui os get_my_trades(limit=1) feitos a cada tick: a posição só é
+    conferida com a exchange na inicialização e em um timer lento.
+
+    As posições são gravadas no banco por (robô, modo, símbolo): robôs do
+    mesmo símbolo em modos diferentes (sim, paper, backtest, live) não
+    sobrescrevem nem carregam a posição um do outro.
+    """
+
+    # Negociações lidas na reconciliação (o peso do myTrades não muda com o limite)
+    RECONCILE_TRADES = 100
+
+    def __init__(self, client_binance, base_assets, reconcile_interval=900, bot=None, mode="live"):
+        """
+        Args:
+            client_binance: Instância do cliente Binance.
+            base_assets (dict): {symbol: ativo base}, ex: {'SOLUSDT': 'SOL'},
+                usado para descontar a comissão paga no próprio ativo.
+            reconcile_interval (float): Segundos entre conferências com a exchange.
+            bot (str): Nome do robô (chave no banco). Padrão: o primeiro símbolo.
+            mode (str): Modo do robô ('live', 'paper', 'sim' ou 'backtest').
+        """
+        self.client_binance = client_binance
+        self.base_assets = dict(base_assets)
+        self.bot = bot or next(iter(self.base_assets), "")
+        self.mode = mode
+        self.reconcile_interval = reconcile_interval
+        self.positions = {symbol: Position(symbol) for symbol in self.base_assets}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Carrega as posições salvas, reconcilia com a exchange e inicia o timer."""
+        for symbol, row in get_positions(self.bot, self.mode).items():
+            if symbol in self.positions:
+                quantity, avg_entry_price, realized_pnl, last_side, fees = row
+                self.positions[symbol] = Position(
+                    symbol,
+                    Decimal(quantity),
+                    Decimal(avg_entry_price),
+                    Decimal(realized_pnl),
+                    last_side,
+                    {asset: Decimal(amount) for asset, amount in (fees or {}).items()},
+                )
+        self.reconcile_all()
+        self._thread = threading.Thread(
+            target=self._reconcile_loop, name="position-reconcile", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _reconcile_loop(self):
+        while not self._stop.wait(self.reconcile_interval):
+            self.reconcile_all()
+
+    def get(self, symbol):
+        return self.positions.setdefault(symbol, Position(symbol))
+
+    def is_long(self, symbol):
+        return self.get(symbol).is_long
+
+    def _quote_asset(self, symbol):
+        base_asset = self.base_assets.get(symbol)
+        if base_asset and symbol.startswith(base_asset):
+            return symbol[len(base_asset) :]
+        return None
+
+    def _charge_commission(self, position, commission, commission_asset):
+        # Chamado com o lock: cada comissão sai do ativo em que foi paga
+        if not commission or commission_asset is None:
+            return
+        if commission_asset == self.base_assets.get(position.symbol):
+            position.quantity -= commission
+        elif commission_asset == self._quote_asset(position.symbol):
+            position.realized_pnl -= commission
+        else:
+            position.fees[commission_asset] = (
+                position.fees.get(commission_asset, Decimal("0")) + commission
+            )
+
+    def apply_fill(self, symbol, side, quantity, price, commission=0, commission_asset=None):
+        """
+        Atualiza a posição com uma execução.
+
+        Args:
+            symbol (str): Par de negociação.
+            side (str): 'BUY' ou 'SELL'.
+            quantity (Decimal): Quantidade executada.
+            price (Decimal): Preço da execução.
+            commission (Decimal): Comissão cobrada.
+            commission_asset (str): Ativo da comissão.
+        """
+        quantity = Decimal(quantity)
+        price = Decimal(price)
+        commission = Decimal(commission)
+
+        with self._lock:
+            position = self.get(symbol)
+            if side == "BUY":
+                total_cost = position.avg_entry_price * position.quantity + price * quantity
+                position.quantity += quantity
+                if position.quantity > 0:
+                    position.avg_entry_price = total_cost / position.quantity
+                self._charge_commission(position, commission, commission_asset)
+            else:
+                position.realized_pnl += (price - position.avg_entry_price) * quantity
+                position.quantity -= quantity
+                self._charge_commission(position, commission, commission_asset)
+                if position.quantity <= 0:
+                    position.quantity = Decimal("0")
+                    position.avg_entry_price = Decimal("0")
+            position.last_side = side
+        self._persist(position)
+
+    def apply_order(self, order):
+        """Aplica todas as execuções (`fills`) de uma resposta de create_order."""
+        for fill in order.get("fills", []):
+            self.apply_fill(
+                order["symbol"],
+                order["side"],
+                fill["qty"],
+                fill["price"],
+                fill.get("commission", 0),
+                fill.get("commissionAsset"),
+            )
+        return self.get(order["symbol"])
+
+    def _persist(self, position):
+        write_behind.submit(
+            save_position,
+            self.bot,
+            self.mode,
+            position.symbol,
+            position.quantity,
+            position.avg_entry_price,
+            position.realized_pnl,
+            position.last_side,
+            dict(position.fees),
+        )
+
+    def _position_from_trades(self, symbol, trades):
+        """
+        Lado, quantidade e preço médio da posição segundo as negociações.
+
+        Comprado, a posição são as compras desde a última venda (menos a
+        comissão paga no ativo base); vendido ou sem negociações, é zero.
+
+        Returns:
+            tuple: (lado, quantidade, preço médio).
+        """
+        if not trades:
+            return None, Decimal("0"), Decimal("0")
+        if not trades[-1]["isBuyer"]:
+            return "SELL", Decimal("0"), Decimal("0")
+        buys = []
+        for trade in reversed(trades):
+            if not trade["isBuyer"]:
+                break
+            buys.append(trade)
+        # Mesma conta de apply_fill, compra a compra, em ordem cronológica
+        base_asset = self.base_assets.get(symbol)
+        quantity = Decimal("0")
+        avg_entry_price = Decimal("0")
+        for trade in reversed(buys):
+            qty = Decimal(trade["qty"])
+            total_cost = avg_entry_price * quantity + Decimal(trade["price"]) * qty
+            quantity += qty
+            avg_entry_price = total_cost / quantity
+            if trade.get("commissionAsset") == base_asset:
+                quantity -= Decimal(trade.get("commission", 0))
+        return "BUY", quantity, avg_entry_price
+
+    def reconcile(self, symbol):
+        """
+        Confere a posição com as negociações recentes na exchange.
+
+        Se o lado ou a quantidade divergirem, adota a posição da exchange:
+        comprado, a quantidade e o preço médio vêm das compras desde a última
+        venda; vendido (ou sem negociações), a posição é zerada.
+        """
+        try:
+            trades = self.client_binance.get_my_trades(
+                symbol=symbol, limit=self.RECONCILE_TRADES
+            )
+        except BinanceAPIException as e:
+            erro_logger.exception(
+                f"Erro na Binance API ao reconciliar a posição de {symbol}: {e}"
+            )
+            return
+        except Exception as e:
+            erro_logger.exception(f"Erro ao reconciliar a posição de {symbol}: {e}")
+            return
+
+        exchange_side, quantity, avg_entry_price = self._position_from_trades(symbol, trades)
+
+        with self._lock:
+            position = self.get(symbol)
+            if position.last_side == exchange_side and (
+                exchange_side != "BUY" or position.quantity == quantity
+            ):
+                return
+            bot_logger.warning(
+                f"Posição de {symbol} divergente: ledger={position.last_side} "
+                f"{position.quantity}, exchange={exchange_side} {quantity}. "
+                "Adotando a da exchange."
+            )
+            position.last_side = exchange_side
+            position.quantity = quantity
+            position.avg_entry_price = avg_entry_price
+        self._persist(position)
+
+    def reconcile_all(self):
+        for symbol in list(self.positions):
+            self.reconcile(symbol)
@@ -0,0 +1,226 @@
+import logging
+import os
+from functions.DecisionJournal import JOURNAL_COLUMNS
+from functions.logger import bot_logger
+
+# Mensagem de cada regra da estratégia (e de alguns avisos), formatada com os
+# valores do tick só quando algum destino vai exibi-la
+RULE_MESSAGES = {
+    "primeira_execucao": "Primeira execução, sem gradiente anterior para comparar.",
+    "compra_aceleracao": (
+        "Compra: A diferença atual é maior que a volatilidade ajustada, indicando uma possível tendência de alta.\n"
+        "A volatilidade atual é menor que a média, sugerindo estabilidade no mercado,\n"
+        "e o RSI está dentro do intervalo desejado, sinalizando uma condição de compra favorável.\n"
+        "O gradiente rápido também está acelerando."
+    ),
+    "compra_gap_medias": (
+        "Compra: MA rápida está {ma_fast:.3f} acima da MA lenta {ma_slow:.3f} ajustada por histerese ({hysteresis}), "
+        "indicando tendência de alta. A volatilidade atual {volatility:.3f} é maior que a média ({volatility_mean:.3f}), "
+        "e o RSI está dentro da faixa {rsi_lower}-{rsi_upper}, sugerindo um sinal de compra favorável."
+    ),
+    "compra_gradiente": (
+        "Compra: Gradiente rápido ({fast_gradient:.2f}) maior que lento ({slow_gradient:.2f}), "
+        "RSI ({rsi:.2f}) entre limites ({rsi_lower}-{rsi_upper}), "
+        "e volatilidade atual ({volatility:.2f}) acima da média ({volatility_mean:.2f})."
+    ),
+    "compra_rsi_sobrevendido": (
+        "O RSI está baixo de 30 indicando que o ativo está fortemente sobrevendido.\n"
+        "Esse é um sinal claro de que o preço pode estar próximo de um fundo e uma reversão para a alta é possível.\n"
+        "Este é um indicativo forte de que a pressão vendedora pode estar se esgotando."
+    ),
+    "venda_queda_gradiente": (
+        "Venda: a porcentagem de decremento do gradiente rapido despencou mais que 30%\n"
+        "Ultimo RSI está abaixo do limite superior e o preço atual está abaixo da zona de resistência recente.\n"
+        "sugere um possível inicio de reversão para baixa.\nRealizando a venda."
+    ),
+    "venda_cruzamento": (
+        "Venda: A MA rápida cruzou abaixo da MA lenta ajustada por histerese, "
+        "sinalizando uma possível reversão de tendência para baixa."
+    ),
+    "venda_risco_reversao": (
+        "Venda: Apesar da MA rápida estar acima da lenta, a alta volatilidade e o gradiente rápido menor que o lento\n"
+        "ou o RSI abaixo do limite inferior sugerem um risco de reversão. Melhor realizar vendas."
+    ),
+    "venda_gradiente_rsi": (
+        "Venda: O gradiente rápido diminuiu significativamente e o RSI abaixo do ultimo valor do RSI,\n"
+        "indicando uma possível reversão de tendência para baixa."
+    ),
+    "stop_loss": (
+        "Stop-Loss Ativado: O preço atual de {price:.3f} caiu abaixo do nível de stop-loss de {stop_loss_price:.2f}.\n"
+        "Realizando venda para limitar as perdas."
+    ),
+    "venda_rsi_extremo": (
+        "A alta volatilidade diminuiu significativamente e o RSI ultrapassou o limite superior,\n"
+        "indicando uma possível reversão de tendência para baixa.\n"
+        "Realizando venda para limitar as perdas."
+    ),
+    "venda_abaixo_suporte": (
+        "detectado queda apos atingir preço máximo do preço: O preço atual de {price:.3f} "
+        "está abaixo do nível de preço máximo e caindo"
+    ),
+    "crescimento_rapido": (
+        "Crescimento Consistente Detectado: O gradiente médio recente aumentou significativamente, "
+        "indicando uma forte tendência de alta."
+    ),
+    "correcao": (
+        "Correção Detectada: O gradiente rápido começou a corrigir, caindo de {last_fast_gradient:.5f} "
+        "para {fast_gradient:.3f},\nindicando uma possível reversão ou ajuste no mercado."
+    ),
+    "retomada_alta": (
+        "Continuação da Alta Confirmada: O preço ou gradiente mostram um novo salto significativo, "
+        "validando a retomada da alta."
+    ),
+    "espera_salto": (
+        "Espera: Ainda não foi detectado um novo salto no preço ou gradiente. Continuar monitorando."
+    ),
+}
+
+# Chaves de encode_features -> valores do relatório
+PROMPT_FIELDS = {
+    "px": "price",
+    "maf": "ma_fast",
+    "mas": "ma_slow",
+    "vol": "volatility",
+    "volm": "volatility_mean",
+    "rsi": "rsi",
+    "gf": "fast_gradient",
+    "gfa": "last_fast_gradient",
+    "gs": "slow_gradient",
+    "gsa": "last_slow_gradient",
+    "gmed": "recent_average",
+    "galta": "growth_target",
+    "gsaida": "exit_gradient",
+    "cresc": "pct_up",
+    "queda": "pct_down",
+}
+
+
+def console_enabled():
+    """Relatório no console (print); STRATEGY_CONSOLE_REPORT=0 desliga."""
+    return os.getenv("STRATEGY_CONSOLE_REPORT", "1") != "0"
+
+
+def _decision_label(decision):
+    if decision is None:
+        return "Manter Posição"
+    return "Comprar" if decision else "Vender"
+
+
+class TickReport:
+    """
+    Valores de um tick da estratégia, guardados crus.
+
+    O texto do console, a mensagem do bot.log e a linha enviada ao modelo de
+    IA são montados a partir dos mesmos valores, e só quando o destino está
+    ativo: com o console desligado (STRATEGY_CONSOLE_REPORT=0, ex: vários
+    robôs no processo) e o bot.log acima de INFO nada é formatado.
+    """
+
+    def __init__(self, symbol):
+        """
+        Args:
+            symbol (str): Par de negociação (ex: 'SOLUSDT').
+        """
+        self.symbol = symbol
+        self.values = {}
+        self.rule = None  # Regra que definiu a decisão das regras
+        self.notes = []  # Chaves de RULE_MESSAGES, na ordem em que ocorreram
+        self.decision = None
+
+    @classmethod
+    def from_journal_row(cls, symbol, row):
+        """
+        Relatório refeito a partir de uma linha do diário de decisões.
+
+        Permite montar a mesma linha que a estratégia enviou ao modelo
+        (render_prompt) para ticks já gravados.
+        """
+        report = cls(symbol)
+        report.update(**row)
+        return report
+
+    def update(self, **values):
+        self.values.update(values)
+
+    def fire(self, rule):
+        """Registra a regra que definiu a decisão (e sua mensagem)."""
+        self.rule = rule
+        self.notes.append(rule)
+
+    def note(self, key):
+        """Registra uma mensagem de RULE_MESSAGES sem mudar a regra."""
+        self.notes.append(key)
+
+    def _messages(self):
+        messages = [RULE_MESSAGES[key].format(**self.values) for key in self.notes]
+        if self.rule is None:
+            messages.append("Nenhuma condição de compra ou venda atendida.")
+        return messages
+
+    def _summary(self, bold=False):
+        v = self.values
+        on, off = ("\033[1m", "\033[0m") if bold else ("", "")
+        fast_trend = "Subindo" if v["fast_gradient"] > v["last_fast_gradient"] else "Descendo"
+        slow_trend = "Subindo" if v["slow_gradient"] > v["last_slow_gradient"] else "Descendo"
+        return (
+            "-----\n"
+            "Estratégia executada: Moving Average com Volatilidade + Gradiente + RSI\n"
+            f"{self.symbol}:\n"
+            f" {v['ma_fast']:.3f} - Última Média Rápida \n {v['ma_slow']:.3f} - Última Média Lenta\n"
+            f"Última Volatilidade: {v['volatility']:.3f}\n"
+            f"Média da Volatilidade: {v['volatility_mean']:.3f}\n"
+            f"Diferença Atual das medias moveis: {v['difference']:.3f}\n"
+            f"volatibilidade * volatilidade_factor: {v['volatility_by_purchase']:.3f}\n"
+            f"Último RSI: {v['rsi']:.3f}\n"
+            "^indicador de tendencia de alta:\n"
+            f"  - Media recente dos Gradientes rapidos: {v['recent_average']:.3f}\n"
+            f"  - Media necessaria para tendecia de alta: {v['growth_target']:.3f}\n"
+            f"  - gradiente rapido maximo para sair da tendencia: ({v['exit_gradient']:.3f})\n"
+            f"Gradiente rápido: {v['fast_gradient']:.3f} ({fast_trend})\n"
+            f"Gradiente lento: {v['slow_gradient']:.3f} ({slow_trend})\n"
+            f"  -Porcentagem de crescimento do gradiente rápido: ({on}{v['pct_up']:.3f}%){off}\n"
+            f"  -Porcentagem de Decremento do gradiente rápido: ({on}{v['pct_down']:.3f}%){off}\n"
+            f"Decisao: {_decision_label(self.decision)}\n"
+            "-----"
+        )
+
+    def render_console(self):
+        """Texto do console: preços e zonas, mensagens das regras e resumo."""
+        v = self.values
+        header = (
+            f"Preço de stop-loss: {v['stop_loss_price']:.2f}\n"
+            f"Volume recente: {v['volume']:.3f}\n"
+            f"Preço atual: {v['price']:.2f}\n"
+            f"Resistência: {v['resistance']:.2f}\n"
+            f"Suporte: {v['support']:.2f}\n"
+            f"zona de resistência recente: {v['recent_resistance']:.2f}\n"
+            f"zona de suporte recente: {v['recent_support']:.2f}\n"
+        )
+        return "\n".join([header, *self._messages(), self._summary(bold=True)])
+
+    def render_log(self):
+        """Mensagem do bot.log: mensagens das regras e resumo, sem cores."""
+        return "\n".join([*self._messages(), self._summary()])
+
+    def render_prompt(self):
+        """Linha compacta de encode_features para o modelo de IA."""
+        from functions.InteligenciaArtificial.GeminiTradingBot import encode_features
+
+        v = self.values
+        features = {"pos": bool(v["position"])}
+        features.update({key: v[name] for key, name in PROMPT_FIELDS.items()})
+        features["gap"] = v["difference"] / float(v["price"]) * 100
+        return encode_features(self.symbol, features)
+
+    def journal_row(self):
+        """Linha do diário de decisões (colunas de JOURNAL_COLUMNS)."""
+        row = {name: self.values[name] for name in JOURNAL_COLUMNS if name in self.values}
+        row["rule"] = self.rule
+        return row
+
+    def emit(self):
+        """Envia o relatório para o console e o bot.log, se estiverem ativos."""
+        if console_enabled():
+            print(self.render_console())
+        if bot_logger.isEnabledFor(logging.INFO):
+            bot_logger.info(self.render_log())
@@ -0,0 +1,177 @@
+import threading
+import time
+from dataclasses import dataclass
+from decimal import Decimal
+from binance.exceptions import BinanceAPIException
+from functions.logger import bot_logger, erro_logger
+
+# Código de erro da Binance para ordens rejeitadas por filtro (LOT_SIZE, NOTIONAL...)
+FILTER_FAILURE_CODE = -1013
+
+
+@dataclass(frozen=True)
+class SymbolFilters:
+    """
+    Filtros de negociação de um símbolo, já convertidos para Decimal.
+
+    Attributes:
+        symbol (str): Par de negociação (ex: 'SOLUSDT').
+        step_size (Decimal): Incremento permitido da quantidade (LOT_SIZE).
+        min_qty (Decimal): Quantidade mínima (LOT_SIZE).
+        max_qty (Decimal): Quantidade máxima (LOT_SIZE).
+        min_notional (Decimal): Valor mínimo da ordem (NOTIONAL).
+        tick_size (Decimal): Incremento permitido do preço (PRICE_FILTER).
+    """
+
+    symbol: str
+    step_size: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    min_notional: Decimal
+    tick_size: Decimal
+
+    @classmethod
+    def from_symbol_info(cls, symbol_info):
+        """
+        Cria os filtros a partir do dicionário de get_symbol_info/exchangeInfo.
+
+        Raises:
+            ValueError: Se 'stepSize', 'minQty' ou 'minNotional' não existirem.
+        """
+        if not symbol_info or "filters" not in symbol_info:
+            raise ValueError("Os filtros não estão presentes para o símbolo.")
+
+        values = {}
+        for filter in symbol_info["filters"]:
+            if filter["filterType"] == "LOT_SIZE":
+                values["step_size"] = Decimal(filter["stepSize"])
+                values["min_qty"] = Decimal(filter["minQty"])
+                values["max_qty"] = Decimal(filter["maxQty"])
+            elif filter["filterType"] == "NOTIONAL":
+                values["min_notional"] = Decimal(filter["minNotional"])
+            elif filter["filterType"] == "MIN_NOTIONAL":
+                values.setdefault("min_notional", Decimal(filter["minNotional"]))
+            elif filter["filterType"] == "PRICE_FILTER":
+                values["tick_size"] = Decimal(filter["tickSize"])
+
+        # Zero é um filtro válido (ex: minQty 0); só a ausência é erro
+        if (
+            values.get("step_size") is None
+            or values.get("min_qty") is None
+            or values.get("min_notional") is None
+        ):
+            raise ValueError(
+                "Não foi possível obter 'stepSize', 'minQty' ou 'minNotional'"
+            )
+        values.setdefault("tick_size", Decimal("0"))
+        return cls(symbol=symbol_info["symbol"], **values)
+
+
+class ExchangeInfoCache:
+    """
+    Cache dos filtros de todos os símbolos da exchange.
+
+    Carrega o exchangeInfo completo em uma única chamada e o mantém em memória
+    até expirar o TTL ou até uma ordem ser rejeitada por filtro, evitando o
+    get_symbol_info a cada ordem.
+    """
+
+    def __init__(self, client_binance, ttl=3600):
+        """
+        Args:
+            client_binance: Instância do cliente Binance.
+            ttl (float): Tempo em segundos até recarregar o exchangeInfo.
+        """
+        self.client_binance = client_binance
+        self.ttl = ttl
+        self._filters = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()  # Um download por vez (cache compartilhado)
+
+    def refresh(self):
+        """Recarrega os filtros de todos os símbolos da exchange."""
+        exchange_info = self.client_binance.get_exchange_info()
+        filters = {}
+        for symbol_info in exchange_info["symbols"]:
+            try:
+                filters[symbol_info["symbol"]] = SymbolFilters.from_symbol_info(
+                    symbol_info
+                )
+            except ValueError:
+                continue  # Símbolos sem LOT_SIZE/NOTIONAL não são negociáveis aqui
+        with self._lock:
+            self._filters = filters
+            self._loaded_at = time.monotonic()
+        bot_logger.info(f"exchangeInfo carregado: {len(filters)} símbolos em cache")
+
+    def invalidate(self):
+        """Força o recarregamento na próxima consulta."""
+        with self._lock:
+            self._loaded_at = 0.0
+
+    def get(self, symbol):
+        """
+        Retorna os filtros do símbolo, recarregando o cache se necessário.
+
+        Raises:
+            ValueError: Se o símbolo não existir na exchange.
+        """
+        with self._lock:
+            expired = time.monotonic() - self._loaded_at > self.ttl
+            filters = self._filters.get(symbol)
+        if expired or filters is None:
+            with self._refresh_lock:
+                # Outro robô pode ter recarregado enquanto este esperava
+                with self._lock:
+                    loaded_at = self._loaded_at
+                    filters = self._filters.get(symbol)
+                if time.monotonic() - loaded_at > self.ttl or filters is None:
+                    self.refresh()
+                    with self._lock:
+                        filters = self._filters.get(symbol)
+        if filters is None:
+            raise ValueError(
+                f"Os filtros não estão presentes para o símbolo {symbol}. Verifique o par de moedas."
+            )
+        return filters
+
+    def handle_order_error(self, error):
+        """
+        Invalida o cache se a ordem foi rejeitada por falha de filtro.
+
+        Returns:
+            bool: True se o erro era de filtro e o cache foi invalidado.
+        """
+        if isinstance(error, BinanceAPIException) and error.code == FILTER_FAILURE_CODE:
+            erro_logger.error(
+                f"Ordem rejeitada por filtro ({error.message}); recarregando exchangeInfo."
+            )
+            self.invalidate()
+            return True
+        return False
+
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def shared_exchange_info(client_binance):
+    """
+    ExchangeInfoCache único por processo para cada URL da API.
+
+    O exchangeInfo completo pesa 20 e é igual para todos os robôs (e
+    PaperClients) que falam com a mesma API; assim ele é baixado uma vez.
+
+    Args:
+        client_binance: Cliente Binance (a chave é o seu API_URL).
+
+    Returns:
+        ExchangeInfoCache: O cache compartilhado.
+    """
+    key = getattr(client_binance, "API_URL", None)
+    with _shared_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = _shared_caches[key] = ExchangeInfoCache(client_binance)
+        return cache
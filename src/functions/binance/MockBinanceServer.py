@@ -0,0 +1,930 @@
+import argparse
+import base64
+import hashlib
+import json
+import random
+import struct
+import threading
+import time
+import uuid
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from functions.binance.request_weights import klines_weight
+
+# GUID fixo do protocolo WebSocket (RFC 6455) usado no handshake
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+    "2h": 7_200_000,
+    "4h": 14_400_000,
+    "1d": 86_400_000,
+}
+
+DEFAULT_FILTERS = {
+    "step_size": "0.00100000",
+    "min_qty": "0.00100000",
+    "max_qty": "9000000.00000000",
+    "min_notional": "5.00000000",
+    "tick_size": "0.01000000",
+}
+
+
+def _fmt(value, places=8):
+    """Formata um Decimal como a Binance (string com 8 casas decimais)."""
+    return f"{Decimal(value):.{places}f}"
+
+
+def market_order_response(
+    symbol,
+    side,
+    quantity,
+    price,
+    commission,
+    commission_asset,
+    order_id,
+    trade_id,
+    transact_time,
+):
+    """
+    Monta a resposta de uma ordem a mercado executada e o trade correspondente.
+
+    Returns:
+        tuple: (ordem no formato FULL do create_order, trade de myTrades).
+    """
+    notional = quantity * price
+    order = {
+        "symbol": symbol,
+        "orderId": order_id,
+        "orderListId": -1,
+        "clientOrderId": uuid.uuid4().hex[:22],
+        "transactTime": transact_time,
+        "price": _fmt(0),
+        "origQty": _fmt(quantity),
+        "executedQty": _fmt(quantity),
+        "cummulativeQuoteQty": _fmt(notional),
+        "status": "FILLED",
+        "timeInForce": "GTC",
+        "type": "MARKET",
+        "side": side,
+        "workingTime": transact_time,
+        "fills": [
+            {
+                "price": _fmt(price),
+                "qty": _fmt(quantity),
+                "commission": _fmt(commission),
+                "commissionAsset": commission_asset,
+                "tradeId": trade_id,
+            }
+        ],
+    }
+    trade = {
+        "symbol": symbol,
+        "id": trade_id,
+        "orderId": order_id,
+        "orderListId": -1,
+        "price": _fmt(price),
+        "qty": _fmt(quantity),
+        "quoteQty": _fmt(notional),
+        "commission": _fmt(commission),
+        "commissionAsset": commission_asset,
+        "time": transact_time,
+        "isBuyer": side == "BUY",
+        "isMaker": False,
+        "isBestMatch": True,
+    }
+    return order, trade
+
+
+def user_data_events(order, balances):
+    """
+    Eventos do user data stream de uma ordem executada.
+
+    Args:
+        order (dict): Resposta de market_order_response.
+        balances (dict): {ativo: saldo livre} dos ativos afetados.
+
+    Returns:
+        list: [executionReport, outboundAccountPosition].
+    """
+    fill = order["fills"][0]
+    execution_report = {
+        "e": "executionReport",
+        "E": order["transactTime"],
+        "s": order["symbol"],
+        "c": order["clientOrderId"],
+        "S": order["side"],
+        "o": order["type"],
+        "f": order["timeInForce"],
+        "q": order["origQty"],
+        "p": order["price"],
+        "x": "TRADE",
+        "X": order["status"],
+        "r": "NONE",
+        "i": order["orderId"],
+        "l": fill["qty"],
+        "z": order["executedQty"],
+        "L": fill["price"],
+        "n": fill["commission"],
+        "N": fill["commissionAsset"],
+        "T": order["transactTime"],
+        "t": fill["tradeId"],
+        "m": False,
+        "Z": order["cummulativeQuoteQty"],
+    }
+    account_position = {
+        "e": "outboundAccountPosition",
+        "E": order["transactTime"],
+        "u": order["transactTime"],
+        "B": [
+            {"a": asset, "f": _fmt(amount), "l": _fmt(0)}
+            for asset, amount in balances.items()
+        ],
+    }
+    return [execution_report, account_position]
+
+
+class MockMarket:
+    """
+    Mercado simulado de um único símbolo.
+
+    Mantém o histórico de klines (gravado ou sintético) e o preço atual, que
+    segue um passeio aleatório a cada leitura quando `volatility` > 0.
+    """
+
+    def __init__(
+        self,
+        symbol,
+        base_asset,
+        quote_asset,
+        klines=None,
+        start_price=100.0,
+        interval="15m",
+        history=1000,
+        volatility=0.0005,
+        filters=None,
+        seed=None,
+    ):
+        self.symbol = symbol
+        self.base_asset = base_asset
+        self.quote_asset = quote_asset
+        self.interval = interval
+        self.volatility = volatility
+        self.filters = {**DEFAULT_FILTERS, **(filters or {})}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.klines = (
+            [list(k) for k in klines]
+            if klines
+            else self._generate_klines(start_price, history)
+        )
+        self.price = Decimal(self.klines[-1][4])
+
+    def _generate_klines(self, start_price, history):
+        """Gera um histórico sintético de klines com passeio aleatório."""
+        step = INTERVAL_MS.get(self.interval, 900_000)
+        now = int(time.time() * 1000)
+        open_time = now - now % step - step * (history - 1)
+        price = float(start_price)
+        klines = []
+        for _ in range(history):
+            open_price = high = low = price
+            for _ in range(4):
+                price *= 1 + self._random.gauss(0, self.volatility * 4)
+                high = max(high, price)
+                low = min(low, price)
+            volume = self._random.uniform(50, 500)
+            klines.append(
+                [
+                    open_time,
+                    _fmt(open_price),
+                    _fmt(high),
+                    _fmt(low),
+                    _fmt(price),
+                    _fmt(volume),
+                    open_time + step - 1,
+                    _fmt(volume * price),
+                    self._random.randint(100, 2000),
+                    _fmt(volume / 2),
+                    _fmt(volume * price / 2),
+                    "0",
+                ]
+            )
+            open_time += step
+        return klines
+
+    def tick(self):
+        """Avança o preço atual e atualiza o último kline. Retorna o novo preço."""
+        with self._lock:
+            if self.volatility > 0:
+                change = Decimal(str(self._random.gauss(0, self.volatility)))
+                tick_size = Decimal(self.filters["tick_size"])
+                self.price = max(
+                    tick_size, (self.price * (1 + change)) // tick_size * tick_size
+                )
+            last = self.klines[-1]
+            last[4] = _fmt(self.price)
+            last[2] = _fmt(max(Decimal(last[2]), self.price))
+            last[3] = _fmt(min(Decimal(last[3]), self.price))
+            return self.price
+
+    def get_klines(self, limit=500, start_time=None, end_time=None):
+        with self._lock:
+            klines = self.klines
+            if start_time is not None:
+                klines = [k for k in klines if k[0] >= start_time]
+            if end_time is not None:
+                klines = [k for k in klines if k[0] <= end_time]
+            # Com startTime a Binance devolve a partir do início da janela
+            klines = klines[:limit] if start_time is not None else klines[-limit:]
+            return [list(k) for k in klines]
+
+    def ticker_24hr(self):
+        with self._lock:
+            window = self.klines[-96:]
+            open_price = Decimal(window[0][1])
+            high = max(Decimal(k[2]) for k in window)
+            low = min(Decimal(k[3]) for k in window)
+            volume = sum(Decimal(k[5]) for k in window)
+            quote_volume = sum(Decimal(k[7]) for k in window)
+            change = self.price - open_price
+            return {
+                "symbol": self.symbol,
+                "priceChange": _fmt(change),
+                "priceChangePercent": f"{change / open_price * 100:.3f}",
+                "weightedAvgPrice": _fmt(quote_volume / volume if volume else 0),
+                "prevClosePrice": window[0][4],
+                "lastPrice": _fmt(self.price),
+                "openPrice": _fmt(open_price),
+                "highPrice": _fmt(high),
+                "lowPrice": _fmt(low),
+                "volume": _fmt(volume),
+                "quoteVolume": _fmt(quote_volume),
+                "openTime": window[0][0],
+                "closeTime": window[-1][6],
+                "count": sum(k[8] for k in window),
+            }
+
+    def symbol_info(self):
+        f = self.filters
+        return {
+            "symbol": self.symbol,
+            "status": "TRADING",
+            "baseAsset": self.base_asset,
+            "baseAssetPrecision": 8,
+            "quoteAsset": self.quote_asset,
+            "quotePrecision": 8,
+            "quoteAssetPrecision": 8,
+            "orderTypes": ["LIMIT", "MARKET"],
+            "isSpotTradingAllowed": True,
+            "filters": [
+                {
+                    "filterType": "PRICE_FILTER",
+                    "minPrice": f["tick_size"],
+                    "maxPrice": "1000000.00000000",
+                    "tickSize": f["tick_size"],
+                },
+                {
+                    "filterType": "LOT_SIZE",
+                    "minQty": f["min_qty"],
+                    "maxQty": f["max_qty"],
+                    "stepSize": f["step_size"],
+                },
+                {
+                    "filterType": "NOTIONAL",
+                    "minNotional": f["min_notional"],
+                    "applyMinToMarket": True,
+                    "maxNotional": "9000000.00000000",
+                    "applyMaxToMarket": False,
+                    "avgPriceMins": 5,
+                },
+            ],
+        }
+
+
+class MockExchangeError(Exception):
+    """Erro de negócio no formato da Binance ({"code": ..., "msg": ...})."""
+
+    def __init__(self, code, msg, status=400):
+        super().__init__(msg)
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+class MockBinanceServer:
+    """
+    Servidor local que imita os endpoints REST e WebSocket da Binance usados
+    pelo bot, permitindo testes de carga offline.
+
+    Endpoints REST: ping, time, exchangeInfo, klines, ticker/price,
+    ticker/24hr, account, myTrades, allOrders, order (ordens a mercado) e
+    userDataStream. Streams WebSocket em /ws/<stream>: <symbol>@trade,
+    <symbol>@ticker, <symbol>@kline_<interval> e <listenKey> (dados do usuário).
+
+    Falhas configuráveis:
+        latency_ms / latency_jitter_ms: atraso artificial por requisição.
+        error_rate: fração das requisições que retornam erro 500 (-1001).
+        weight_limit: peso por minuto antes de responder 429; requisições
+            insistindo durante o Retry-After recebem 418 (ban do IP).
+        order_limit_10s: número de ordens em 10 s antes de responder 429.
+    """
+
+    def __init__(
+        self,
+        markets,
+        host="127.0.0.1",
+        port=0,
+        balances=None,
+        latency_ms=0,
+        latency_jitter_ms=0,
+        error_rate=0.0,
+        weight_limit=6000,
+        order_limit_10s=100,
+        retry_after=5,
+        stream_interval=1.0,
+        commission_rate="0.001",
+        seed=None,
+    ):
+        self.markets = {market.symbol: market for market in markets}
+        self.balances = {
+            asset: Decimal(str(amount))
+            for asset, amount in (balances or {"USDT": 1000}).items()
+        }
+        for market in markets:
+            self.balances.setdefault(market.base_asset, Decimal("0"))
+            self.balances.setdefault(market.quote_asset, Decimal("0"))
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.weight_limit = weight_limit
+        self.order_limit_10s = order_limit_10s
+        self.retry_after = retry_after
+        self.stream_interval = stream_interval
+        self.commission_rate = Decimal(commission_rate)
+
+        self.trades = {symbol: [] for symbol in self.markets}
+        self.orders = {symbol: [] for symbol in self.markets}
+        self.listen_keys = {}
+        self.request_count = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._weight_window = (0, 0)  # (minuto, peso usado)
+        self._order_timestamps = []
+        self._banned_until = 0.0
+        self._next_id = 1
+
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    # ------------------------------------------------------------------ ciclo de vida
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    @property
+    def stream_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"ws://{host}:{port}/ws"
+
+    def start(self):
+        """Inicia o servidor em uma thread daemon e retorna a si mesmo."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="mock-binance", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ------------------------------------------------------------------ limites e falhas
+
+    def _consume_weight(self, weight):
+        """Contabiliza o peso e retorna o peso usado no minuto corrente."""
+        now = time.time()
+        if now < self._banned_until:
+            raise MockExchangeError(
+                -1003, "Way too many requests; IP banned.", status=418
+            )
+        minute = int(now // 60)
+        current_minute, used = self._weight_window
+        if minute != current_minute:
+            used = 0
+        used += weight
+        self._weight_window = (minute, used)
+        if used > self.weight_limit:
+            # Insistir depois de um 429 gera ban (418), como na Binance
+            self._banned_until = now + self.retry_after
+            raise MockExchangeError(
+                -1003, "Too many requests; current limit is exceeded.", status=429
+            )
+        return used
+
+    def _consume_order(self):
+        now = time.time()
+        self._order_timestamps = [t for t in self._order_timestamps if now - t < 10]
+        self._order_timestamps.append(now)
+        if len(self._order_timestamps) > self.order_limit_10s:
+            raise MockExchangeError(
+                -1015, "Too many new orders; current limit is exceeded.", status=429
+            )
+        return len(self._order_timestamps)
+
+    def _inject_faults(self):
+        delay = self.latency_ms + self._random.uniform(0, self.latency_jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            raise MockExchangeError(
+                -1001, "Internal error; unable to process your request.", status=500
+            )
+
+    # ------------------------------------------------------------------ regras de negócio
+
+    def _market(self, symbol):
+        market = self.markets.get(symbol)
+        if market is None:
+            raise MockExchangeError(-1121, "Invalid symbol.")
+        return market
+
+    def _new_id(self):
+        with self._lock:
+            value = self._next_id
+            self._next_id += 1
+            return value
+
+    def account(self):
+        with self._lock:
+            return {
+                "makerCommission": 10,
+                "takerCommission": 10,
+                "canTrade": True,
+                "canWithdraw": True,
+                "canDeposit": True,
+                "updateTime": int(time.time() * 1000),
+                "accountType": "SPOT",
+                "balances": [
+                    {"asset": asset, "free": _fmt(amount), "locked": _fmt(0)}
+                    for asset, amount in self.balances.items()
+                ],
+                "permissions": ["SPOT"],
+            }
+
+    def create_market_order(self, symbol, side, quantity=None, quote_quantity=None):
+        """
+        Executa uma ordem a mercado contra o preço atual do símbolo.
+
+        Aplica os filtros LOT_SIZE e NOTIONAL e debita/credita os saldos.
+
+        Returns:
+            dict: Resposta no formato FULL da Binance, com `fills`.
+        """
+        market = self._market(symbol)
+        price = market.tick()
+        step = Decimal(market.filters["step_size"])
+
+        if quantity is None and quote_quantity is not None:
+            quantity = (Decimal(quote_quantity) / price // step) * step
+        if quantity is None:
+            raise MockExchangeError(
+                -1102, "Mandatory parameter 'quantity' was not sent."
+            )
+        quantity = Decimal(quantity)
+
+        if (
+            quantity < Decimal(market.filters["min_qty"])
+            or quantity > Decimal(market.filters["max_qty"])
+            or quantity % step != 0
+        ):
+            raise MockExchangeError(-1013, "Filter failure: LOT_SIZE")
+        notional = quantity * price
+        if notional < Decimal(market.filters["min_notional"]):
+            raise MockExchangeError(-1013, "Filter failure: NOTIONAL")
+
+        commission = (
+            quantity if side == "BUY" else notional
+        ) * self.commission_rate
+        commission_asset = market.base_asset if side == "BUY" else market.quote_asset
+
+        with self._lock:
+            base = self.balances[market.base_asset]
+            quote = self.balances[market.quote_asset]
+            if side == "BUY" and quote < notional:
+                raise MockExchangeError(
+                    -2010, "Account has insufficient balance for requested action."
+                )
+            if side == "SELL" and base < quantity:
+                raise MockExchangeError(
+                    -2010, "Account has insufficient balance for requested action."
+                )
+            if side == "BUY":
+                self.balances[market.quote_asset] = quote - notional
+                self.balances[market.base_asset] = base + quantity - commission
+            else:
+                self.balances[market.base_asset] = base - quantity
+                self.balances[market.quote_asset] = quote + notional - commission
+
+            order, trade = market_order_response(
+                symbol,
+                side,
+                quantity,
+                price,
+                commission,
+                commission_asset,
+                self._new_id(),
+                self._new_id(),
+                int(time.time() * 1000),
+            )
+            self.orders[symbol].append(order)
+            self.trades[symbol].append(trade)
+        self._publish_user_events(order, market)
+        return order
+
+    def _publish_user_events(self, order, market):
+        """Envia executionReport e outboundAccountPosition aos listenKeys ativos."""
+        with self._lock:
+            events = user_data_events(
+                order,
+                {
+                    asset: self.balances[asset]
+                    for asset in (market.base_asset, market.quote_asset)
+                },
+            )
+            queues = list(self.listen_keys.values())
+        for queue in queues:
+            queue.extend(events)
+
+    # ------------------------------------------------------------------ roteamento REST
+
+    def handle_rest(self, method, path, params):
+        """
+        Resolve uma requisição REST.
+
+        Returns:
+            tuple: (status HTTP, corpo JSON serializável, cabeçalhos extras)
+        """
+        symbol = params.get("symbol")
+        route = (method, path)
+        headers = {}
+
+        weights = {
+            ("GET", "/api/v3/ping"): 1,
+            ("GET", "/api/v3/time"): 1,
+            ("GET", "/api/v3/exchangeInfo"): 20,
+            ("GET", "/api/v3/klines"): klines_weight(int(params.get("limit", 500))),
+            ("GET", "/api/v3/ticker/price"): 2 if symbol else 4,
+            ("GET", "/api/v3/ticker/24hr"): 2 if symbol else 80,
+            ("GET", "/api/v3/account"): 20,
+            ("GET", "/api/v3/myTrades"): 20,
+            ("GET", "/api/v3/allOrders"): 20,
+            ("POST", "/api/v3/order"): 1,
+            ("POST", "/api/v3/userDataStream"): 2,
+            ("PUT", "/api/v3/userDataStream"): 2,
+            ("DELETE", "/api/v3/userDataStream"): 2,
+        }
+        if route not in weights:
+            return 404, {"code": -1000, "msg": f"Unknown endpoint {path}"}, headers
+
+        self.request_count += 1
+        self._inject_faults()
+        with self._lock:
+            used = self._consume_weight(weights[route])
+            headers["X-MBX-USED-WEIGHT-1M"] = str(used)
+            if route == ("POST", "/api/v3/order"):
+                headers["X-MBX-ORDER-COUNT-10S"] = str(self._consume_order())
+
+        if path == "/api/v3/ping":
+            return 200, {}, headers
+        if path == "/api/v3/time":
+            return 200, {"serverTime": int(time.time() * 1000)}, headers
+        if path == "/api/v3/exchangeInfo":
+            symbols = [m.symbol_info() for m in self.markets.values()]
+            if symbol:
+                symbols = [s for s in symbols if s["symbol"] == symbol]
+            return (
+                200,
+                {
+                    "timezone": "UTC",
+                    "serverTime": int(time.time() * 1000),
+                    "rateLimits": [
+                        {
+                            "rateLimitType": "REQUEST_WEIGHT",
+                            "interval": "MINUTE",
+                            "intervalNum": 1,
+                            "limit": self.weight_limit,
+                        },
+                        {
+                            "rateLimitType": "ORDERS",
+                            "interval": "SECOND",
+                            "intervalNum": 10,
+                            "limit": self.order_limit_10s,
+                        },
+                    ],
+                    "exchangeFilters": [],
+                    "symbols": symbols,
+                },
+                headers,
+            )
+        if path == "/api/v3/klines":
+            klines = self._market(symbol).get_klines(
+                limit=int(params.get("limit", 500)),
+                start_time=int(params["startTime"]) if "startTime" in params else None,
+                end_time=int(params["endTime"]) if "endTime" in params else None,
+            )
+            return 200, klines, headers
+        if path == "/api/v3/ticker/price":
+            if symbol:
+                price = self._market(symbol).tick()
+                return 200, {"symbol": symbol, "price": _fmt(price)}, headers
+            return (
+                200,
+                [{"symbol": s, "price": _fmt(m.tick())} for s, m in self.markets.items()],
+                headers,
+            )
+        if path == "/api/v3/ticker/24hr":
+            if symbol:
+                return 200, self._market(symbol).ticker_24hr(), headers
+            return 200, [m.ticker_24hr() for m in self.markets.values()], headers
+        if path == "/api/v3/account":
+            return 200, self.account(), headers
+        if path == "/api/v3/myTrades":
+            self._market(symbol)
+            limit = int(params.get("limit", 500))
+            # A Binance devolve os trades do mais antigo para o mais recente
+            return 200, self.trades[symbol][-limit:], headers
+        if path == "/api/v3/allOrders":
+            self._market(symbol)
+            limit = int(params.get("limit", 500))
+            return 200, self.orders[symbol][-limit:], headers
+        if path == "/api/v3/order":
+            if params.get("type", "MARKET") != "MARKET":
+                raise MockExchangeError(-1116, "Invalid orderType.")
+            order = self.create_market_order(
+                symbol,
+                params.get("side"),
+                quantity=params.get("quantity"),
+                quote_quantity=params.get("quoteOrderQty"),
+            )
+            return 200, order, headers
+        if path == "/api/v3/userDataStream":
+            if method == "POST":
+                listen_key = uuid.uuid4().hex
+                with self._lock:
+                    self.listen_keys[listen_key] = []
+                return 200, {"listenKey": listen_key}, headers
+            if method == "DELETE":
+                with self._lock:
+                    self.listen_keys.pop(params.get("listenKey"), None)
+            return 200, {}, headers
+        return 404, {"code": -1000, "msg": f"Unknown endpoint {path}"}, headers
+
+    # ------------------------------------------------------------------ streams WebSocket
+
+    def stream_events(self, stream):
+        """
+        Gera os próximos eventos de um stream (chamado a cada stream_interval).
+
+        Args:
+            stream (str): Nome do stream, ex: 'solusdt@kline_15m' ou um listenKey.
+
+        Returns:
+            list: Eventos (dicts) a serem enviados ao cliente.
+        """
+        with self._lock:
+            if stream in self.listen_keys:
+                events = self.listen_keys[stream]
+                self.listen_keys[stream] = []
+                return events
+
+        symbol_part, _, kind = stream.partition("@")
+        market = self._market(symbol_part.upper())
+        price = market.tick()
+        now = int(time.time() * 1000)
+        if kind.startswith("kline_"):
+            kline = market.get_klines(limit=1)[0]
+            return [
+                {
+                    "e": "kline",
+                    "E": now,
+                    "s": market.symbol,
+                    "k": {
+                        "t": kline[0],
+                        "T": kline[6],
+                        "s": market.symbol,
+                        "i": kind[len("kline_") :],
+                        "o": kline[1],
+                        "c": kline[4],
+                        "h": kline[2],
+                        "l": kline[3],
+                        "v": kline[5],
+                        "n": kline[8],
+                        "x": False,
+                        "q": kline[7],
+                    },
+                }
+            ]
+        if kind in ("ticker", "miniTicker"):
+            ticker = market.ticker_24hr()
+            return [
+                {
+                    "e": "24hrTicker" if kind == "ticker" else "24hrMiniTicker",
+                    "E": now,
+                    "s": market.symbol,
+                    "c": ticker["lastPrice"],
+                    "o": ticker["openPrice"],
+                    "h": ticker["highPrice"],
+                    "l": ticker["lowPrice"],
+                    "v": ticker["volume"],
+                    "q": ticker["quoteVolume"],
+                }
+            ]
+        return [
+            {
+                "e": "trade",
+                "E": now,
+                "s": market.symbol,
+                "t": self._new_id(),
+                "p": _fmt(price),
+                "q": _fmt(self._random.uniform(0.01, 5)),
+                "T": now,
+                "m": self._random.random() < 0.5,
+            }
+        ]
+
+    # ------------------------------------------------------------------ HTTP
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass  # Silencia o log padrão do http.server
+
+            def _params(self):
+                url = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    body = self.rfile.read(length).decode()
+                    params.update({k: v[-1] for k, v in parse_qs(body).items()})
+                return url.path, params
+
+            def _send_json(self, status, body, headers):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _dispatch(self):
+                path, params = self._params()
+                if path.startswith("/ws/") and self.headers.get("Upgrade", "").lower() == "websocket":
+                    return self._serve_websocket(path[len("/ws/") :])
+                try:
+                    status, body, headers = server.handle_rest(self.command, path, params)
+                except MockExchangeError as e:
+                    status, body = e.status, {"code": e.code, "msg": e.msg}
+                    headers = {}
+                    if e.status in (418, 429):
+                        headers["Retry-After"] = str(server.retry_after)
+                self._send_json(status, body, headers)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+            def _serve_websocket(self, stream):
+                key = self.headers.get("Sec-WebSocket-Key", "")
+                accept = base64.b64encode(
+                    hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()
+                ).decode()
+                self.send_response(101, "Switching Protocols")
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header("Sec-WebSocket-Accept", accept)
+                self.end_headers()
+                self.close_connection = True
+                try:
+                    while True:
+                        for event in server.stream_events(stream):
+                            self._send_frame(json.dumps(event).encode())
+                        time.sleep(server.stream_interval)
+                except (BrokenPipeError, ConnectionResetError, MockExchangeError):
+                    return
+
+            def _send_frame(self, payload):
+                # Frame de texto final, sem máscara (servidor -> cliente)
+                header = bytes([0x81])
+                length = len(payload)
+                if length < 126:
+                    header += bytes([length])
+                elif length < 1 << 16:
+                    header += bytes([126]) + struct.pack("!H", length)
+                else:
+                    header += bytes([127]) + struct.pack("!Q", length)
+                self.wfile.write(header + payload)
+                self.wfile.flush()
+
+        return Handler
+
+
+def load_markets(symbols, klines_file=None, interval="15m", volatility=0.0005, seed=None):
+    """
+    Cria os mercados simulados.
+
+    Args:
+        symbols (list): Pares no formato 'BASE/QUOTE' (ex: ['SOL/USDT']).
+        klines_file (str): JSON opcional {"SOLUSDT": [[kline], ...]} com
+            klines gravados da API; símbolos ausentes usam dados sintéticos.
+        interval (str): Intervalo dos klines sintéticos.
+        volatility (float): Desvio padrão do passeio aleatório por tick.
+        seed (int): Semente para reprodutibilidade.
+
+    Returns:
+        list: Lista de MockMarket.
+    """
+    recorded = {}
+    if klines_file:
+        with open(klines_file, encoding="utf-8") as file:
+            recorded = json.load(file)
+
+    markets = []
+    for index, pair in enumerate(symbols):
+        base_asset, quote_asset = pair.upper().split("/")
+        symbol = base_asset + quote_asset
+        markets.append(
+            MockMarket(
+                symbol,
+                base_asset,
+                quote_asset,
+                klines=recorded.get(symbol),
+                interval=interval,
+                volatility=volatility,
+                seed=None if seed is None else seed + index,
+            )
+        )
+    return markets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Servidor local que simula a API da Binance para testes offline."
+    )
+    parser.add_argument("--symbols", nargs="+", default=["SOL/USDT"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--klines-file")
+    parser.add_argument("--interval", default="15m")
+    parser.add_argument("--volatility", type=float, default=0.0005)
+    parser.add_argument("--usdt", type=float, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--weight-limit", type=int, default=6000)
+    parser.add_argument("--order-limit-10s", type=int, default=100)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    mock = MockBinanceServer(
+        load_markets(
+            args.symbols, args.klines_file, args.interval, args.volatility, args.seed
+        ),
+        host=args.host,
+        port=args.port,
+        balances={"USDT": args.usdt},
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        weight_limit=args.weight_limit,
+        order_limit_10s=args.order_limit_10s,
+        seed=args.seed,
+    )
+    print(f"Mock da Binance em {mock.base_url} (streams em {mock.stream_url})")
+    print(f"Use: BINANCE_API_URL={mock.base_url}")
+    mock.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        mock.stop()
@@ -0,0 +1,281 @@
+import json
+import random
+import threading
+import time
+from decimal import ROUND_DOWN, ROUND_UP, Decimal
+from binance.exceptions import BinanceAPIException
+from functions.binance.ExchangeInfoCache import shared_exchange_info
+from functions.binance.MockBinanceServer import market_order_response, user_data_events
+from functions.logger import erro_logger
+from functions.metrics import metrics
+
+
+def _fmt(value):
+    return f"{Decimal(value):.8f}"
+
+
+def _api_error(code, msg, status=400):
+    """Erro no mesmo formato que o cliente da Binance levanta."""
+    return BinanceAPIException(None, status, json.dumps({"code": code, "msg": msg}))
+
+
+class PaperExchange:
+    """
+    Exchange simulada no próprio processo, para paper trading.
+
+    Mantém saldos, ordens e trades de uma conta fictícia compartilhada pelos
+    robôs do processo. As ordens a mercado são executadas contra o último
+    preço visto do símbolo (preço real da Binance ou de um replay), com taxa
+    e slippage configuráveis, depois dos filtros LOT_SIZE e NOTIONAL do
+    símbolo. As respostas e os eventos do user data stream têm o formato da
+    API da Binance (os mesmos do MockBinanceServer).
+
+    Os robôs usam a exchange por meio de um PaperClient (client()), que
+    substitui o cliente da Binance: dados de mercado vêm do cliente real e
+    ordens e saldos ficam aqui, sem nenhuma requisição.
+    """
+
+    def __init__(
+        self,
+        balances=None,
+        fee_rate="0.001",
+        slippage_bps=0,
+        slippage_jitter_bps=0,
+        price_ttl=2.0,
+        seed=None,
+    ):
+        """
+        Args:
+            balances (dict): Saldos iniciais, ex: {'USDT': 1000}.
+            fee_rate (str): Taxa por execução (0.001 = 0,1%), cobrada no ativo
+                recebido, como na Binance sem BNB.
+            slippage_bps (float): Slippage fixo contra a ordem, em pontos-base.
+            slippage_jitter_bps (float): Slippage aleatório adicional (0 até
+                este valor), em pontos-base.
+            price_ttl (float): Idade máxima, em segundos, do último preço visto
+                antes de consultar o ticker na execução.
+            seed (int): Semente do slippage aleatório.
+        """
+        self.balances = {
+            asset: Decimal(str(amount))
+            for asset, amount in (balances or {"USDT": 1000}).items()
+        }
+        self.fee_rate = Decimal(str(fee_rate))
+        self.slippage_bps = Decimal(str(slippage_bps))
+        self.slippage_jitter_bps = float(slippage_jitter_bps)
+        self.price_ttl = price_ttl
+        self.orders = {}  # símbolo -> lista de ordens
+        self.trades = {}  # símbolo -> lista de trades
+        self._prices = {}  # símbolo -> (Decimal, time.monotonic())
+        self._listeners = []
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._next_id = 1
+
+    def client(self, market_client):
+        """Cliente para um robô: dados de mercado de `market_client`, ordens aqui."""
+        return PaperClient(self, market_client)
+
+    # ------------------------------------------------------------------ preços
+
+    def set_price(self, symbol, price):
+        """Atualiza o último preço do símbolo (ticker, stream ou replay)."""
+        with self._lock:
+            self._prices[symbol] = (Decimal(str(price)), time.monotonic())
+
+    def last_price(self, symbol):
+        """Último preço visto do símbolo, ou None se não houver um recente."""
+        with self._lock:
+            price, seen = self._prices.get(symbol, (None, 0.0))
+        if price is None or time.monotonic() - seen > self.price_ttl:
+            return None
+        return price
+
+    def fill_price(self, side, price, tick_size):
+        """Preço de execução com slippage contra a ordem, no tick_size do símbolo."""
+        slippage = self.slippage_bps
+        if self.slippage_jitter_bps:
+            slippage += Decimal(str(self._random.uniform(0, self.slippage_jitter_bps)))
+        factor = slippage / Decimal("10000")
+        if side == "BUY":
+            price = price * (1 + factor)
+            rounding = ROUND_UP
+        else:
+            price = price * (1 - factor)
+            rounding = ROUND_DOWN
+        return (price / tick_size).quantize(Decimal("1"), rounding=rounding) * tick_size
+
+    # ------------------------------------------------------------------ conta
+
+    def add_user_listener(self, callback):
+        """Recebe os eventos do user data stream (ex: UserDataStream.handle_event)."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def account(self):
+        with self._lock:
+            return {
+                "makerCommission": 10,
+                "takerCommission": 10,
+                "canTrade": True,
+                "accountType": "SPOT",
+                "updateTime": int(time.time() * 1000),
+                "balances": [
+                    {"asset": asset, "free": _fmt(amount), "locked": _fmt(0)}
+                    for asset, amount in self.balances.items()
+                ],
+                "permissions": ["SPOT"],
+            }
+
+    def _new_id(self):
+        value = self._next_id
+        self._next_id += 1
+        return value
+
+    def create_market_order(self, filters, base_asset, quote_asset, side, quantity, price):
+        """
+        Executa uma ordem a mercado.
+
+        Args:
+            filters (SymbolFilters): Filtros do símbolo.
+            base_asset (str): Ativo base (ex: 'SOL').
+            quote_asset (str): Ativo de cotação (ex: 'USDT').
+            side (str): 'BUY' ou 'SELL'.
+            quantity (Decimal): Quantidade pedida.
+            price (Decimal): Preço de mercado antes do slippage.
+
+        Returns:
+            dict: Resposta no formato FULL da Binance, com `fills`.
+
+        Raises:
+            BinanceAPIException: Filtro violado (-1013) ou saldo insuficiente (-2010).
+        """
+        symbol = filters.symbol
+        if (
+            quantity < filters.min_qty
+            or quantity > filters.max_qty
+            or quantity % filters.step_size != 0
+        ):
+            metrics.increment("paper.rejected")
+            raise _api_error(-1013, "Filter failure: LOT_SIZE")
+        price = self.fill_price(side, price, filters.tick_size)
+        notional = quantity * price
+        if notional < filters.min_notional:
+            metrics.increment("paper.rejected")
+            raise _api_error(-1013, "Filter failure: NOTIONAL")
+
+        commission = (quantity if side == "BUY" else notional) * self.fee_rate
+        commission_asset = base_asset if side == "BUY" else quote_asset
+
+        with self._lock:
+            base = self.balances.get(base_asset, Decimal("0"))
+            quote = self.balances.get(quote_asset, Decimal("0"))
+            if (side == "BUY" and quote < notional) or (side == "SELL" and base < quantity):
+                metrics.increment("paper.rejected")
+                raise _api_error(-2010, "Account has insufficient balance for requested action.")
+            if side == "BUY":
+                self.balances[quote_asset] = quote - notional
+                self.balances[base_asset] = base + quantity - commission
+            else:
+                self.balances[base_asset] = base - quantity
+                self.balances[quote_asset] = quote + notional - commission
+
+            order, trade = market_order_response(
+                symbol,
+                side,
+                quantity,
+                price,
+                commission,
+                commission_asset,
+                self._new_id(),
+                self._new_id(),
+                int(time.time() * 1000),
+            )
+            self.orders.setdefault(symbol, []).append(order)
+            self.trades.setdefault(symbol, []).append(trade)
+            events = user_data_events(
+                order,
+                {asset: self.balances[asset] for asset in (base_asset, quote_asset)},
+            )
+            listeners = list(self._listeners)
+
+        metrics.increment("paper.orders")
+        for listener in listeners:
+            for event in events:
+                try:
+                    listener(event)
+                except Exception as e:
+                    erro_logger.exception(f"Erro ao entregar evento da exchange simulada: {e}")
+        return order
+
+
+class PaperClient:
+    """
+    Cliente da Binance de um robô em paper trading.
+
+    Ordens, saldos e trades vão para a PaperExchange; qualquer outro método
+    (klines, exchangeInfo, ticker...) é repassado ao cliente de mercado. Os
+    preços lidos pelo ticker alimentam o preço de execução da exchange.
+    """
+
+    def __init__(self, exchange, market_client):
+        self.exchange = exchange
+        self.market_client = market_client
+        self.exchange_info = shared_exchange_info(market_client)
+        self._assets = {}  # símbolo -> (ativo base, ativo de cotação)
+
+    def __getattr__(self, name):
+        # Só chamado para o que não existe aqui: dados de mercado
+        return getattr(self.market_client, name)
+
+    def _symbol_assets(self, symbol):
+        if symbol not in self._assets:
+            info = self.market_client.get_symbol_info(symbol)
+            if not info:
+                raise _api_error(-1121, "Invalid symbol.")
+            self._assets[symbol] = (info["baseAsset"], info["quoteAsset"])
+        return self._assets[symbol]
+
+    def get_symbol_ticker(self, **params):
+        ticker = self.market_client.get_symbol_ticker(**params)
+        if isinstance(ticker, dict):
+            self.exchange.set_price(ticker["symbol"], ticker["price"])
+        return ticker
+
+    def create_order(self, symbol, side, type="MARKET", quantity=None, quoteOrderQty=None, **params):
+        if type != "MARKET":
+            raise _api_error(-1116, "Invalid orderType.")
+        filters = self.exchange_info.get(symbol)
+        price = self.exchange.last_price(symbol)
+        if price is None:
+            price = Decimal(self.get_symbol_ticker(symbol=symbol)["price"])
+        if quantity is None and quoteOrderQty is not None:
+            quantity = Decimal(str(quoteOrderQty)) / price // filters.step_size * filters.step_size
+        if quantity is None:
+            raise _api_error(-1102, "Mandatory parameter 'quantity' was not sent.")
+        base_asset, quote_asset = self._symbol_assets(symbol)
+        return self.exchange.create_market_order(
+            filters, base_asset, quote_asset, side, Decimal(str(quantity)), price
+        )
+
+    def get_account(self, **params):
+        return self.exchange.account()
+
+    def get_asset_balance(self, asset, **params):
+        balance = self.exchange.balances.get(asset, Decimal("0"))
+        return {"asset": asset, "free": _fmt(balance), "locked": _fmt(0)}
+
+    def get_my_trades(self, symbol, limit=500, **params):
+        return self.exchange.trades.get(symbol, [])[-limit:]
+
+    def get_all_orders(self, symbol, limit=500, **params):
+        return self.exchange.orders.get(symbol, [])[-limit:]
+
+    def get_order(self, symbol, orderId, **params):
+        for order in self.exchange.orders.get(symbol, []):
+            if order["orderId"] == int(orderId):
+                return order
+        raise _api_error(-2013, "Order does not exist.")
+
+    def add_user_listener(self, callback):
+        self.exchange.add_user_listener(callback)
@@ -0,0 +1,327 @@
+import copy
+import threading
+import time
+from urllib.parse import urlparse
+from functions.binance.request_weights import klines_weight
+from functions.logger import bot_logger
+from functions.resilience import CircuitOpenError
+
+# Prioridades (menor = mais urgente)
+PRIORITY_ORDER = 0
+PRIORITY_ACCOUNT = 1
+PRIORITY_MARKET_DATA = 2
+
+# Peso das chamadas REST usadas pelo bot (https://binance-docs.github.io/apidocs/spot/en/#limits)
+ENDPOINT_WEIGHTS = {
+    "ping": 1,
+    "time": 1,
+    "exchangeInfo": 20,
+    "ticker/price": 2,
+    "ticker/24hr": 2,
+    "depth": 5,
+    "account": 20,
+    "myTrades": 20,
+    "allOrders": 20,
+    "openOrders": 6,
+    "order": 1,
+    "userDataStream": 2,
+}
+
+ACCOUNT_ENDPOINTS = {"account", "myTrades", "allOrders", "openOrders", "userDataStream"}
+
+
+def classify_request(method, uri, params):
+    """
+    Identifica o peso, a prioridade e se a chamada é uma ordem.
+
+    Args:
+        method (str): Método HTTP ('get', 'post'...).
+        uri (str): URL completa da chamada.
+        params (dict): Parâmetros da chamada.
+
+    Returns:
+        tuple: (peso, prioridade, is_order)
+    """
+    path = urlparse(uri).path
+    endpoint = path.split("/v3/", 1)[-1] if "/v3/" in path else path.rsplit("/", 1)[-1]
+    symbol = params.get("symbol") if params else None
+
+    if endpoint == "klines":
+        return klines_weight(int(params.get("limit", 500))), PRIORITY_MARKET_DATA, False
+    if endpoint == "order":
+        is_order = method.lower() == "post"
+        return 1, PRIORITY_ORDER, is_order
+    if endpoint == "ticker/price" and not symbol:
+        return 4, PRIORITY_MARKET_DATA, False
+    if endpoint == "ticker/24hr" and not symbol:
+        return 80, PRIORITY_MARKET_DATA, False
+
+    weight = ENDPOINT_WEIGHTS.get(endpoint, 1)
+    priority = PRIORITY_ACCOUNT if endpoint in ACCOUNT_ENDPOINTS else PRIORITY_MARKET_DATA
+    return weight, priority, False
+
+
+class RateLimitedError(CircuitOpenError):
+    """Chamada recusada: a espera pelos limites da Binance passaria de max_wait."""
+
+
+class TokenBucket:
+    """Balde de tokens com reposição contínua para um limite da Binance."""
+
+    def __init__(self, capacity, interval):
+        """
+        Args:
+            capacity (int): Limite da janela (ex: 6000 de peso por minuto).
+            interval (float): Tamanho da janela em segundos.
+        """
+        self.capacity = capacity
+        self.rate = capacity / interval
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def time_until(self, amount, reserve=0):
+        """Segundos até haver `amount` tokens acima da reserva."""
+        self._refill()
+        missing = amount + reserve - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def consume(self, amount):
+        self._refill()
+        self.tokens -= amount
+
+    def sync(self, used):
+        """Ajusta os tokens ao uso informado pela Binance nos cabeçalhos."""
+        self._refill()
+        self.tokens = min(self.tokens, self.capacity - used)
+
+
+class RequestScheduler:
+    """
+    Agendador central das chamadas à API da Binance.
+
+    Mantém baldes de tokens para peso por minuto e ordens por 10 s / por dia,
+    sincronizados pelos cabeçalhos X-MBX-USED-WEIGHT-1M e X-MBX-ORDER-COUNT-*.
+    Ordens têm prioridade sobre consultas de conta, que têm prioridade sobre
+    dados de mercado; dados de mercado não usam a reserva final do limite e
+    chamadas idênticas próximas são agrupadas em uma só. Respostas 429/418
+    bloqueiam todas as chamadas até o Retry-After; quem precisaria esperar
+    mais que `max_wait` recebe RateLimitedError (o tick é pulado).
+    """
+
+    def __init__(
+        self,
+        weight_limit=6000,
+        orders_per_10s=50,
+        orders_per_day=160000,
+        market_data_reserve=0.1,
+        coalesce_window=1.0,
+        max_wait=30.0,
+    ):
+        """
+        Args:
+            weight_limit (int): Peso máximo por minuto (REQUEST_WEIGHT).
+            orders_per_10s (int): Ordens máximas em 10 segundos.
+            orders_per_day (int): Ordens máximas por dia.
+            market_data_reserve (float): Fração do peso reservada para ordens e conta.
+            coalesce_window (float): Segundos em que uma resposta de dados de
+                mercado é reaproveitada por chamadas idênticas.
+            max_wait (float): Espera máxima de uma chamada pelos limites, em segundos.
+        """
+        self.weight = TokenBucket(weight_limit, 60)
+        self.orders_10s = TokenBucket(orders_per_10s, 10)
+        self.orders_1d = TokenBucket(orders_per_day, 86400)
+        self.market_data_reserve = int(weight_limit * market_data_reserve)
+        self.coalesce_window = coalesce_window
+        self.max_wait = max_wait
+        self.banned_until = 0.0
+        self.stats = {
+            "requests": 0,
+            "coalesced": 0,
+            "delayed": 0,
+            "rate_limited": 0,
+            "rejected": 0,
+        }
+
+        self._condition = threading.Condition()
+        self._waiting = [0, 0, 0]
+        self._inflight = {}
+        self._recent = {}
+
+    # ------------------------------------------------------------------ limites
+
+    def acquire(self, weight, priority=PRIORITY_MARKET_DATA, is_order=False):
+        """
+        Bloqueia até a chamada poder ser feita sem estourar os limites.
+
+        Raises:
+            RateLimitedError: Se a chamada não puder sair em max_wait segundos
+                (ex: banimento 418 com Retry-After longo).
+        """
+        delayed = False
+        deadline = time.monotonic() + self.max_wait
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self.banned_until - time.monotonic()
+                    if wait <= 0 and any(self._waiting[:priority]):
+                        wait = 0.05  # Cede a vez para chamadas mais prioritárias
+                    if wait <= 0:
+                        reserve = (
+                            self.market_data_reserve
+                            if priority == PRIORITY_MARKET_DATA
+                            else 0
+                        )
+                        wait = self.weight.time_until(weight, reserve)
+                        if is_order:
+                            wait = max(
+                                wait,
+                                self.orders_10s.time_until(1),
+                                self.orders_1d.time_until(1),
+                            )
+                    if wait <= 0:
+                        self.weight.consume(weight)
+                        if is_order:
+                            self.orders_10s.consume(1)
+                            self.orders_1d.consume(1)
+                        self.stats["requests"] += 1
+                        if delayed:
+                            self.stats["delayed"] += 1
+                        return
+                    if time.monotonic() + wait > deadline:
+                        self.stats["rejected"] += 1
+                        raise RateLimitedError(
+                            f"Limite da Binance: chamada aguardaria {wait:.0f}s "
+                            f"(máximo {self.max_wait:.0f}s)"
+                        )
+                    delayed = True
+                    self._condition.wait(timeout=wait)
+            finally:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def update_from_headers(self, status_code, headers):
+        """Sincroniza os baldes com os cabeçalhos de uma resposta da Binance."""
+        with self._condition:
+            used_weight = headers.get("X-MBX-USED-WEIGHT-1M") or headers.get(
+                "X-MBX-USED-WEIGHT-1m"
+            )
+            if used_weight is not None:
+                self.weight.sync(int(used_weight))
+            order_count_10s = headers.get("X-MBX-ORDER-COUNT-10S") or headers.get(
+                "X-MBX-ORDER-COUNT-10s"
+            )
+            if order_count_10s is not None:
+                self.orders_10s.sync(int(order_count_10s))
+            order_count_1d = headers.get("X-MBX-ORDER-COUNT-1D") or headers.get(
+                "X-MBX-ORDER-COUNT-1d"
+            )
+            if order_count_1d is not None:
+                self.orders_1d.sync(int(order_count_1d))
+
+            if status_code in (418, 429):
+                retry_after = float(headers.get("Retry-After") or 60)
+                self.banned_until = max(
+                    self.banned_until, time.monotonic() + retry_after
+                )
+                self.stats["rate_limited"] += 1
+                bot_logger.warning(
+                    f"Binance respondeu {status_code}; pausando chamadas por {retry_after:.0f}s."
+                )
+            self._condition.notify_all()
+
+    # ------------------------------------------------------------------ integração com o Client
+
+    def install(self, client):
+        """
+        Faz todas as chamadas REST do cliente python-binance passarem pelo agendador.
+
+        Returns:
+            O próprio cliente.
+        """
+        if getattr(client, "_request_scheduler", None) is self:
+            return client
+
+        original_request = client._request
+        original_handle_response = client._handle_response
+
+        def handle_response(response, *args, **kwargs):
+            self.update_from_headers(response.status_code, response.headers)
+            return original_handle_response(response, *args, **kwargs)
+
+        def request(method, uri, signed, force_params=False, **kwargs):
+            params = kwargs.get("data") or kwargs.get("params") or {}
+            weight, priority, is_order = classify_request(method, uri, params)
+
+            if priority != PRIORITY_MARKET_DATA or method.lower() != "get":
+                self.acquire(weight, priority, is_order)
+                return original_request(method, uri, signed, force_params, **kwargs)
+
+            key = (uri, tuple(sorted((k, str(v)) for k, v in params.items())))
+            return self._coalesced(
+                key,
+                weight,
+                lambda: original_request(method, uri, signed, force_params, **kwargs),
+            )
+
+        client._request = request
+        client._handle_response = handle_response
+        client._request_scheduler = self
+        return client
+
+    def _coalesced(self, key, weight, call):
+        """
+        Executa a chamada ou reaproveita uma idêntica em andamento/recente.
+
+        Cada chamador recebe a sua cópia da resposta: um robô que altere a
+        lista de klines não muda a dos outros.
+        """
+        with self._condition:
+            recent = self._recent.get(key)
+            if recent and time.monotonic() - recent[0] < self.coalesce_window:
+                self.stats["coalesced"] += 1
+                return copy.deepcopy(recent[1])
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                inflight = self._inflight[key] = {"event": threading.Event()}
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            inflight["event"].wait()
+            with self._condition:
+                self.stats["coalesced"] += 1
+            if "error" in inflight:
+                raise inflight["error"]
+            return copy.deepcopy(inflight["result"])
+
+        try:
+            self.acquire(weight, PRIORITY_MARKET_DATA)
+            inflight["result"] = call()
+            with self._condition:
+                self._recent[key] = (time.monotonic(), inflight["result"])
+                if len(self._recent) > 256:
+                    now = time.monotonic()
+                    self._recent = {
+                        k: v
+                        for k, v in self._recent.items()
+                        if now - v[0] < self.coalesce_window
+                    }
+            return copy.deepcopy(inflight["result"])
+        except Exception as e:
+            inflight["error"] = e
+            raise
+        finally:
+            with self._condition:
+                self._inflight.pop(key, None)
+            inflight["event"].set()
+
+
+# Agendador compartilhado por todos os clientes do processo (mesmo IP)
+shared_scheduler = RequestScheduler()
@@ -0,0 +1,169 @@
+import threading
+from decimal import Decimal
+from functions.logger import bot_logger, erro_logger
+
+
+class UserDataStream:
+    """
+    Mantém saldos e ordens da conta atualizados pelo user data stream da Binance.
+
+    Os eventos outboundAccountPosition, balanceUpdate e executionReport
+    atualizam mapas locais, de modo que consultar um saldo é uma leitura de
+    dicionário em vez de um get_account. Uma reconciliação periódica via REST
+    corrige eventos perdidos e serve de fallback quando o stream cai.
+
+    `live` só fica verdadeiro depois do primeiro evento recebido: até lá (ou
+    sem websocket, ex: robôs contra o MockBinanceServer) o robô reconcilia os
+    saldos via REST a cada tick.
+    """
+
+    def __init__(self, client_binance, reconcile_interval=300, use_websocket=True):
+        """
+        Args:
+            client_binance: Instância do cliente Binance.
+            reconcile_interval (float): Segundos entre reconciliações via REST.
+            use_websocket (bool): Assina o user data stream da Binance; False
+                usa só REST.
+        """
+        self.client_binance = client_binance
+        self.reconcile_interval = reconcile_interval
+        self.use_websocket = use_websocket
+        self.balances = {}  # asset -> {"free": Decimal, "locked": Decimal}
+        self.orders = {}  # orderId -> último estado conhecido da ordem
+        self.live = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reconcile_now = threading.Event()
+        self._socket_manager = None
+        self._reconcile_thread = None
+
+    def start(self):
+        """
+        Carrega os saldos via REST e assina o user data stream.
+
+        Se o websocket não puder ser iniciado (ou use_websocket for False), os
+        saldos continuam sendo atualizados pela reconciliação periódica.
+        """
+        self.reconcile()
+        if hasattr(self.client_binance, "add_user_listener"):
+            # Exchange simulada no processo (PaperClient): eventos entregues direto
+            self.client_binance.add_user_listener(self.handle_event)
+            self.live = True
+            bot_logger.info("User data stream da exchange simulada iniciado.")
+            return self
+        if self.use_websocket:
+            try:
+                from binance import ThreadedWebsocketManager
+
+                self._socket_manager = ThreadedWebsocketManager(
+                    api_key=self.client_binance.API_KEY,
+                    api_secret=self.client_binance.API_SECRET,
+                )
+                self._socket_manager.start()
+                self._socket_manager.start_user_socket(callback=self.handle_event)
+                bot_logger.info("User data stream iniciado; aguardando o primeiro evento.")
+            except Exception as e:
+                erro_logger.exception(
+                    f"Erro ao iniciar o user data stream, usando apenas REST: {e}"
+                )
+
+        self._reconcile_thread = threading.Thread(
+            target=self._reconcile_loop, name="user-data-reconcile", daemon=True
+        )
+        self._reconcile_thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._reconcile_now.set()
+        self.live = False
+        if self._socket_manager is not None:
+            self._socket_manager.stop()
+
+    def _reconcile_loop(self):
+        while True:
+            # Acorda no intervalo ou antes, quando o stream reporta um erro
+            self._reconcile_now.wait(self.reconcile_interval)
+            self._reconcile_now.clear()
+            if self._stop.is_set():
+                return
+            try:
+                self.reconcile()
+            except Exception as e:
+                erro_logger.exception(f"Erro na reconciliação dos saldos: {e}")
+
+    def reconcile(self):
+        """
+        Substitui os saldos locais pelo get_account da Binance.
+
+        Returns:
+            dict: A resposta completa do get_account.
+        """
+        account_data = self.client_binance.get_account()
+        balances = {
+            stock["asset"]: {
+                "free": Decimal(stock["free"]),
+                "locked": Decimal(stock["locked"]),
+            }
+            for stock in account_data["balances"]
+        }
+        with self._lock:
+            self.balances = balances
+        return account_data
+
+    def handle_event(self, msg):
+        """Aplica um evento do user data stream aos mapas locais."""
+        event_type = msg.get("e")
+        if event_type != "error" and not self.live:
+            # Primeiro evento: o stream está entregando, o REST por tick pode parar
+            self.live = True
+        if event_type == "outboundAccountPosition":
+            with self._lock:
+                for balance in msg["B"]:
+                    self.balances[balance["a"]] = {
+                        "free": Decimal(balance["f"]),
+                        "locked": Decimal(balance["l"]),
+                    }
+        elif event_type == "balanceUpdate":
+            with self._lock:
+                balance = self.balances.setdefault(
+                    msg["a"], {"free": Decimal("0"), "locked": Decimal("0")}
+                )
+                balance["free"] += Decimal(msg["d"])
+        elif event_type == "executionReport":
+            with self._lock:
+                self.orders[msg["i"]] = {
+                    "symbol": msg["s"],
+                    "side": msg["S"],
+                    "type": msg["o"],
+                    "status": msg["X"],
+                    "origQty": msg["q"],
+                    "executedQty": msg["z"],
+                    "cummulativeQuoteQty": msg["Z"],
+                    "lastPrice": msg["L"],
+                    "updateTime": msg["E"],
+                }
+        elif event_type == "error":
+            erro_logger.error(f"Erro no user data stream: {msg.get('m')}")
+            self.live = False
+            # Reconcilia na thread de reconciliação, sem bloquear a do socket
+            self._reconcile_now.set()
+
+    def get_free(self, asset):
+        """Retorna o saldo livre do ativo (Decimal, 0 se não existir)."""
+        balance = self.balances.get(asset)
+        return balance["free"] if balance else Decimal("0")
+
+    def get_balance(self, asset):
+        """Retorna o saldo do ativo no mesmo formato de get_account()['balances']."""
+        balance = self.balances.get(asset)
+        if balance is None:
+            return None
+        return {
+            "asset": asset,
+            "free": f"{balance['free']:.8f}",
+            "locked": f"{balance['locked']:.8f}",
+        }
+
+    def get_order(self, order_id):
+        return self.orders.get(order_id)
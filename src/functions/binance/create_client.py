@@ -0,0 +1,71 @@
+import os
+import threading
+from binance.client import Client
+from functions.binance.RequestScheduler import shared_scheduler
+
+
+def get_api_base_url():
+    """
+    Retorna a URL base da API REST da Binance.
+
+    Usa a variável de ambiente BINANCE_API_URL quando definida (ex: o servidor
+    local de MockBinanceServer), caso contrário aponta para a exchange real.
+
+    Returns:
+        str: URL base no formato 'https://api.binance.com/api'.
+    """
+    return os.getenv("BINANCE_API_URL", "https://api.binance.com/api").rstrip("/")
+
+
+def serialize_requests(client):
+    """
+    Faz as chamadas REST do cliente acontecerem uma de cada vez.
+
+    O Client do python-binance guarda a resposta em `self.response` antes de
+    interpretá-la; com o tick e as threads de fundo (reconciliação de saldos
+    e de posição, polling de preços) usando o mesmo cliente, uma thread
+    poderia ler a resposta de outra.
+
+    Returns:
+        O próprio cliente.
+    """
+    lock = threading.Lock()
+    original_request = client._request
+
+    def request(*args, **kwargs):
+        with lock:
+            return original_request(*args, **kwargs)
+
+    client._request = request
+    return client
+
+
+def create_client(api_key=None, secret_key=None, base_url=None):
+    """
+    Cria um cliente da Binance respeitando a URL base configurada.
+
+    Todas as chamadas REST do cliente passam pelo agendador de limites
+    compartilhado (RequestScheduler), uma de cada vez (serialize_requests).
+
+    Args:
+        api_key (str): Chave da API. Padrão: BINANCE_API_KEY do ambiente.
+        secret_key (str): Chave secreta. Padrão: BINANCE_SECRET_KEY do ambiente.
+        base_url (str): URL base da API REST. Padrão: get_api_base_url().
+
+    Returns:
+        Client: Instância do cliente Binance.
+    """
+    api_key = api_key if api_key is not None else os.getenv("BINANCE_API_KEY")
+    secret_key = secret_key if secret_key is not None else os.getenv("BINANCE_SECRET_KEY")
+    base_url = (base_url or get_api_base_url()).rstrip("/")
+
+    if base_url == "https://api.binance.com/api":
+        client = Client(api_key, secret_key)
+    else:
+        # O Client formata API_URL no __init__ (e já faz um ping nele), por isso a
+        # URL precisa estar na classe antes da instância ser criada.
+        client_class = type("LocalClient", (Client,), {"API_URL": base_url})
+        client = client_class(api_key, secret_key)
+    # A trava fica por baixo do agendador: só a chamada HTTP a segura, não a
+    # espera por limites
+    return shared_scheduler.install(serialize_requests(client))
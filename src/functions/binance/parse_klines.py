@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+import numpy as np
+
+# Layout de um kline da API (o 12º campo, "ignore", é descartado).
+# Tempos ficam em epoch ms (int64); o fuso só é aplicado na exibição.
+KLINE_DTYPE = np.dtype(
+    [
+        ("open_time", "i8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f8"),
+        ("close_time", "i8"),
+        ("quote_volume", "f8"),
+        ("number_of_trades", "i8"),
+        ("taker_buy_base_volume", "f8"),
+        ("taker_buy_quote_volume", "f8"),
+    ]
+)
+
+DISPLAY_TIMEZONE = ZoneInfo("America/Sao_Paulo")
+
+
+def parse_klines(klines):
+    """
+    Converte a resposta de get_klines em um array NumPy tipado, em uma só passada.
+
+    Os preços e volumes chegam da API como strings e são convertidos direto
+    para float64 pelo dtype estruturado, sem DataFrame intermediário.
+
+    Args:
+        klines (list): Lista de klines no formato da API da Binance.
+
+    Returns:
+        np.ndarray: Array estruturado com dtype KLINE_DTYPE; cada campo
+        (ex: candles["close"]) é uma coluna contígua em memória.
+    """
+    return np.array([tuple(kline[:11]) for kline in klines], dtype=KLINE_DTYPE)
+
+
+def format_timestamp(timestamp_ms, tz=DISPLAY_TIMEZONE, fmt="%Y-%m-%d %H:%M:%S"):
+    """
+    Formata um tempo em epoch ms para exibição no fuso indicado.
+
+    Args:
+        timestamp_ms (int): Tempo em milissegundos desde a época (UTC).
+        tz (ZoneInfo): Fuso de exibição. Padrão: America/Sao_Paulo.
+        fmt (str): Formato do strftime.
+
+    Returns:
+        str: Data e hora formatadas.
+    """
+    moment = datetime.fromtimestamp(int(timestamp_ms) / 1000, tz=timezone.utc)
+    return moment.astimezone(tz).strftime(fmt)
@@ -0,0 +1,13 @@
+# Pesos da API REST da Binance compartilhados pelo RequestScheduler e pelo
+# MockBinanceServer; sem dependências, para o mock continuar só com a stdlib.
+
+
+def klines_weight(limit):
+    """Peso da chamada /api/v3/klines conforme o limite pedido."""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
@@ -1,36 +1,30 @@
 def getLastStockAccountBalance(self):
-    for stock in self.account_data["balances"]:
-        if stock["asset"] == self.stock_code:
-            return float(stock["free"])
-    return 0.0
+    return float(self.user_stream.get_free(self.stock_code))
 
 
 def printAllWallet(self):
     # Printa toda a carteira
-    for stock in self.account_data["balances"]:
-        if float(stock["free"]) > 0:
-            print(stock)
+    for asset, balance in self.user_stream.balances.items():
+        if balance["free"] > 0:
+            print(self.user_stream.get_balance(asset))
 
 
 def printStock(self):
     # Printa o ativo definido na classe
-    for stock in self.account_data["balances"]:
-        if stock["asset"] == self.stock_code:
-            print(stock)
+    stock = self.user_stream.get_balance(self.stock_code)
+    if stock:
+        print(stock)
 
 
 def printBrl(self):
-    for stock in self.account_data["balances"]:
-        if stock["asset"] == "BRL":
-            print(stock)
+    stock = self.user_stream.get_balance("BRL")
+    if stock:
+        print(stock)
 
 
 def getUpdatedAccountData(self):
-    return self.client_binance.get_account()
+    return self.user_stream.reconcile()
 
 
 def getLastStockAccountBalance(self):
-    for stock in self.account_data["balances"]:
-        if stock["asset"] == self.stock_code:
-            return float(stock["free"])
-    return 0.0
+    return float(self.user_stream.get_free(self.stock_code))
@@ -0,0 +1,87 @@
+import time
+from collections import deque
+from decimal import Decimal
+from binance.enums import ORDER_TYPE_MARKET
+from functions.logger import trade_logger
+
+
+def weighted_fill_price(order):
+    """
+    Calcula o preço médio ponderado de todas as execuções de uma ordem.
+
+    Args:
+        order (dict): Resposta do create_order (formato FULL, com `fills`).
+
+    Returns:
+        Decimal: Preço médio ponderado pela quantidade, ou None se a ordem não
+        tiver execuções.
+    """
+    fills = order.get("fills") or []
+    total_quantity = sum((Decimal(fill["qty"]) for fill in fills), Decimal("0"))
+    if total_quantity > 0:
+        total_cost = sum(
+            (Decimal(fill["price"]) * Decimal(fill["qty"]) for fill in fills),
+            Decimal("0"),
+        )
+        return total_cost / total_quantity
+
+    # Sem fills detalhados: usa o total negociado da própria ordem
+    executed_quantity = Decimal(order.get("executedQty", "0"))
+    if executed_quantity > 0:
+        return Decimal(order["cummulativeQuoteQty"]) / executed_quantity
+    return None
+
+
+class OrderExecutionEngine:
+    """
+    Envia ordens a mercado e mede a latência de cada uma.
+
+    Não faz chamadas extras antes ou depois da ordem: o preço de execução
+    sai dos `fills` da resposta e o estado da conta fica a cargo do user data
+    stream e do PositionLedger.
+    """
+
+    def __init__(self, client_binance, history_size=1000):
+        self.client_binance = client_binance
+        self.latencies = deque(maxlen=history_size)
+
+    def submit_market_order(self, symbol, side, quantity):
+        """
+        Envia uma ordem a mercado e registra a latência envio -> ack -> execução.
+
+        Args:
+            symbol (str): Par de negociação.
+            side (str): SIDE_BUY ou SIDE_SELL.
+            quantity (Decimal): Quantidade já ajustada aos filtros.
+
+        Returns:
+            dict: Resposta do create_order.
+        """
+        submit_time_ms = time.time() * 1000
+        submit_clock = time.perf_counter()
+        order = self.client_binance.create_order(
+            symbol=symbol,
+            side=side,
+            type=ORDER_TYPE_MARKET,
+            quantity=str(quantity),
+            newOrderRespType="FULL",
+        )
+        ack_ms = (time.perf_counter() - submit_clock) * 1000
+
+        # transactTime é o instante da execução na exchange (ordens a mercado
+        # são executadas no próprio ack); inclui a diferença de relógio local.
+        fill_ms = order.get("transactTime", submit_time_ms) - submit_time_ms
+        latency = {
+            "symbol": symbol,
+            "side": side,
+            "order_id": order.get("orderId"),
+            "status": order.get("status"),
+            "submit_to_ack_ms": ack_ms,
+            "submit_to_fill_ms": fill_ms,
+        }
+        self.latencies.append(latency)
+        trade_logger.info(
+            f"Latência da ordem {order.get('orderId')} ({side} {symbol}): "
+            f"envio->ack {ack_ms:.1f} ms, envio->execução {fill_ms:.1f} ms"
+        )
+        return order
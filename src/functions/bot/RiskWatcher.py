@@ -0,0 +1,302 @@
+import queue
+import threading
+import time
+from functions.calculators.calculate_profit_levels import profit_levels
+from functions.logger import bot_logger, erro_logger
+from functions.metrics import metrics
+
+
+class RiskWatcher:
+    """
+    Stop-loss, trailing stop e take profit avaliados a cada preço do stream.
+
+    Roda fora do tick da estratégia: cada negociação do stream <symbol>@trade
+    é comparada com os limites da posição aberta (só comparações de float,
+    sem consultas), e a saída é entregue a uma thread própria que chama
+    `on_exit`. O tick da estratégia continua decidindo as entradas e as
+    saídas por indicadores; aqui só se protege a posição entre um tick e
+    outro.
+
+    Limites, a partir do preço de compra:
+        stop_loss       vende se o preço cair esta fração abaixo da compra;
+        trailing_stop   vende se cair esta fração abaixo da máxima desde a
+                        compra (0 desativa);
+        níveis          ao atingir level_1 o stop sobe para o break-even, ao
+                        atingir level_2 sobe para o level_1, e take_profit
+                        (meta principal) vende (ver profit_levels).
+
+    Uma saída que falha (ex: ordem rejeitada) volta a ser vigiada com
+    retry(), sem perder a máxima, o stop e os degraus já atingidos, e só é
+    tentada de novo depois de uma espera que dobra a cada falha.
+
+    Sem websocket (ex: robôs contra o MockBinanceServer) o preço é
+    consultado pelo ticker a cada `poll_interval` segundos; com websocket o
+    polling também roda até a primeira negociação chegar pelo stream.
+    """
+
+    def __init__(
+        self,
+        symbol,
+        client_binance,
+        on_exit,
+        stop_loss=0.05,
+        trailing_stop=0.0,
+        take_profit=0.10,
+        level_1=0.03,
+        level_2=0.06,
+        total_fee=0.002,
+        use_websocket=True,
+        poll_interval=1.0,
+        retry_backoff=2.0,
+        max_retry_backoff=60.0,
+    ):
+        """
+        Args:
+            symbol (str): Par de negociação (ex: 'SOLUSDT').
+            client_binance: Cliente Binance do robô (usado no polling).
+            on_exit (callable): on_exit(reason, price), chamado na thread de
+                saída quando um limite é atingido.
+            stop_loss (float): Fração abaixo da compra (0.05 = 5%).
+            trailing_stop (float): Fração abaixo da máxima; 0 desativa.
+            take_profit (float): Meta principal acima da compra; 0 desativa.
+            level_1 (float): Nível que leva o stop ao break-even; 0 desativa.
+            level_2 (float): Nível que leva o stop ao level_1; 0 desativa.
+            total_fee (float): Taxa de compra + venda (define o break-even).
+            use_websocket (bool): Assina o stream de trades; False usa polling.
+            poll_interval (float): Segundos entre consultas no polling.
+            retry_backoff (float): Espera, em segundos, antes de tentar de novo
+                uma saída que falhou; dobra a cada nova falha.
+            max_retry_backoff (float): Espera máxima entre tentativas.
+        """
+        self.symbol = symbol
+        self.client_binance = client_binance
+        self.on_exit = on_exit
+        self.use_websocket = use_websocket
+        self.poll_interval = poll_interval
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self.params = {}
+        self.live = False  # True depois da primeira negociação recebida pelo stream
+        self._listeners = []
+        self._entry = None  # Preço de compra da posição vigiada (None: desarmado)
+        self._high = 0.0
+        self._stop_price = 0.0
+        self._stop_reason = "stop_loss"
+        self._take_profit_price = None
+        self._ladder = []  # [(preço que ativa, novo stop, motivo)]
+        self._exiting = False  # Saída entregue a on_exit e ainda sem resultado
+        self._failed_exits = 0  # Saídas seguidas que falharam nesta posição
+        self._retry_at = 0.0  # time.monotonic() a partir do qual a saída pode disparar de novo
+        self._lock = threading.Lock()
+        self._exits = queue.Queue()
+        self._stop = threading.Event()
+        self._socket_manager = None
+        self._threads = []
+        self.configure(
+            stop_loss=stop_loss,
+            trailing_stop=trailing_stop,
+            take_profit=take_profit,
+            level_1=level_1,
+            level_2=level_2,
+            total_fee=total_fee,
+        )
+
+    def configure(self, **params):
+        """Troca os limites (ex: reload da configuração); vale para a posição atual."""
+        with self._lock:
+            self.params = {**self.params, **{k: float(v) for k, v in params.items()}}
+            if self._entry is not None:
+                self._set_limits(self._entry)
+
+    def add_listener(self, callback):
+        """Recebe cada preço do stream: callback(symbol, price) (ex: PaperExchange.set_price)."""
+        self._listeners.append(callback)
+
+    # ------------------------------------------------------------------ posição
+
+    def _set_limits(self, entry_price):
+        # Chamado com o lock: recalcula stop, take profit e degraus a partir da compra
+        p = self.params
+        levels = profit_levels(
+            entry_price,
+            p["take_profit"] * 100,
+            p["level_1"] * 100,
+            p["level_2"] * 100,
+            p["total_fee"],
+        )
+        # Preços em 8 casas, como na Binance (110.00000000000001 não é 110)
+        price = {level: round(data["price"], 8) for level, data in levels.items()}
+        self._entry = entry_price
+        self._stop_price = round(entry_price * (1 - p["stop_loss"]), 8)
+        self._stop_reason = "stop_loss"
+        self._take_profit_price = price["main"] if p["take_profit"] else None
+        self._ladder = []
+        if p["level_1"]:
+            self._ladder.append((price["level_1"], price["break_even"], "break_even"))
+        if p["level_2"]:
+            self._ladder.append((price["level_2"], price["level_1"], "level_1"))
+        self._raise_stop()
+
+    def _raise_stop(self):
+        # Chamado com o lock: o stop só sobe (máxima e degraus atingidos)
+        trailing = self.params["trailing_stop"]
+        trailing_price = round(self._high * (1 - trailing), 8)
+        if trailing and trailing_price > self._stop_price:
+            self._stop_price = trailing_price
+            self._stop_reason = "trailing_stop"
+        for trigger, stop, reason in self._ladder:
+            if self._high >= trigger and stop > self._stop_price:
+                self._stop_price = stop
+                self._stop_reason = reason
+
+    def arm(self, entry_price):
+        """Passa a vigiar uma posição comprada a `entry_price`."""
+        entry_price = float(entry_price)
+        with self._lock:
+            self._high = entry_price
+            self._exiting = False
+            self._failed_exits = 0
+            self._retry_at = 0.0
+            self._set_limits(entry_price)
+        bot_logger.info(
+            f"{self.symbol}: risco vigiado a partir de {entry_price:.8f} "
+            f"(stop {self._stop_price:.8f}, alvo {self._take_profit_price or 0:.8f})"
+        )
+
+    def retry(self):
+        """
+        Volta a vigiar a posição depois de uma saída que falhou.
+
+        Mantém a máxima, o stop e os degraus já atingidos (arm() recomeçaria
+        do preço de compra); a saída só dispara de novo depois da espera.
+
+        Returns:
+            float: Segundos até a próxima tentativa.
+        """
+        with self._lock:
+            if self._entry is None:
+                return 0.0
+            self._failed_exits += 1
+            delay = min(
+                self.retry_backoff * 2 ** (self._failed_exits - 1), self.max_retry_backoff
+            )
+            self._retry_at = time.monotonic() + delay
+            self._exiting = False
+        return delay
+
+    def disarm(self):
+        with self._lock:
+            self._entry = None
+            self._exiting = False
+
+    @property
+    def armed(self):
+        return self._entry is not None
+
+    def sync(self, long_position, entry_price):
+        """Acompanha a posição do robô: arma se comprado (e desarmado), desarma se vendido."""
+        if not long_position:
+            self.disarm()
+        elif entry_price and not self.armed:
+            self.arm(entry_price)
+
+    # ------------------------------------------------------------------ preços
+
+    def on_price(self, price):
+        """Avalia um preço do stream; dispara a saída no máximo uma vez por posição."""
+        received = time.perf_counter()
+        price = float(price)
+        for listener in self._listeners:
+            listener(self.symbol, price)
+        with self._lock:
+            if self._entry is None or self._exiting:
+                return
+            if price > self._high:
+                self._high = price
+                self._raise_stop()
+            if time.monotonic() < self._retry_at:
+                return  # Saída anterior falhou: espera antes de tentar de novo
+            if price <= self._stop_price:
+                reason = self._stop_reason
+            elif self._take_profit_price is not None and price >= self._take_profit_price:
+                reason = "take_profit"
+            else:
+                return
+            self._exiting = True
+        self._exits.put((reason, price, received))
+
+    def _handle_message(self, msg):
+        if msg.get("e") == "error":
+            erro_logger.error(f"Erro no stream de preços de {self.symbol}: {msg.get('m')}")
+            self.live = False
+            self._start_polling()
+            return
+        if "p" in msg:
+            if not self.live:
+                # Primeira negociação pelo stream: o polling para de consultar
+                self.live = True
+                bot_logger.info(f"Stream de preços de {self.symbol} ativo.")
+            self.on_price(msg["p"])
+
+    def _exit_loop(self):
+        while True:
+            item = self._exits.get()
+            if item is None:
+                return
+            reason, price, received = item
+            metrics.set_gauge("risk.dispatch_ms", (time.perf_counter() - received) * 1000)
+            metrics.increment(f"risk.exits.{reason}")
+            bot_logger.warning(f"{self.symbol}: {reason} atingido a {price:.8f}; vendendo.")
+            try:
+                self.on_exit(reason, price)
+            except Exception as e:
+                erro_logger.exception(f"Erro na saída por {reason} de {self.symbol}: {e}")
+                self.retry()
+            metrics.set_gauge("risk.reaction_ms", (time.perf_counter() - received) * 1000)
+
+    def _poll_loop(self):
+        while not self._stop.wait(self.poll_interval):
+            if self.live:
+                continue  # O stream está entregando os preços
+            try:
+                ticker = self.client_binance.get_symbol_ticker(symbol=self.symbol)
+                self.on_price(ticker["price"])
+            except Exception as e:
+                erro_logger.error(f"Erro ao consultar o preço de {self.symbol}: {e}")
+
+    def _start_thread(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _start_polling(self):
+        if not any(thread.name == f"risk-poll-{self.symbol}" for thread in self._threads):
+            self._start_thread(self._poll_loop, f"risk-poll-{self.symbol}")
+
+    def start(self):
+        """Inicia a thread de saída e o polling, e assina o stream de trades."""
+        self._start_thread(self._exit_loop, f"risk-exit-{self.symbol}")
+        if self.use_websocket:
+            try:
+                from binance import ThreadedWebsocketManager
+
+                # Stream público: não precisa das chaves da conta
+                self._socket_manager = ThreadedWebsocketManager()
+                self._socket_manager.start()
+                self._socket_manager.start_trade_socket(
+                    callback=self._handle_message, symbol=self.symbol
+                )
+                bot_logger.info(f"Stream de preços de {self.symbol} iniciado.")
+            except Exception as e:
+                erro_logger.exception(
+                    f"Erro ao iniciar o stream de preços de {self.symbol}, usando polling: {e}"
+                )
+        self._start_polling()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.live = False
+        self._exits.put(None)
+        if self._socket_manager is not None:
+            self._socket_manager.stop()
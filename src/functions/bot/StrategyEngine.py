@@ -0,0 +1,158 @@
+import copy
+from functions.bot.load_bot_config import (
+    DEFAULT_STRATEGY_PARAMS,
+    STRATEGY_INIT_PARAMS,
+    STRATEGY_RUN_PARAMS,
+)
+from functions.checkpoint import checkpoint_path, load_json_checkpoint, save_json_checkpoint
+from functions.DecisionJournal import decision_journal
+from functions.logger import bot_logger, erro_logger
+
+# Estado da estratégia que precisa sobreviver entre ticks (e reinícios)
+STATE_FIELDS = (
+    "fast_gradients",
+    "previous_gradients",
+    "alerta_de_crescimento_rapido",
+    "state_after_correction",
+    "last_max_price_down_resistanceZone",
+    "last_min_price_up_supportZone",
+    "volatility_tracker",
+)
+
+
+class StrategyEngine:
+    """
+    Mantém uma única instância de getMovingAverageVergenceRSI por símbolo.
+
+    O estado acumulado da estratégia (gradientes recentes, alertas, zonas de
+    suporte/resistência) fica em memória entre os ticks e é gravado em um
+    checkpoint JSON junto com o checkpoint periódico do robô (só quando mudou
+    desde a última gravação), para ser recuperado em um reinício.
+    Os valores de cada tick vão para o diário de decisões (DecisionJournal).
+    """
+
+    def __init__(
+        self,
+        operation_code,
+        client_binance,
+        candle_period,
+        strategy_params=None,
+        checkpoint_dir=None,
+        checkpoint_name=None,
+    ):
+        """
+        Args:
+            operation_code (str): Par de negociação (ex: 'SOLUSDT').
+            client_binance: Cliente Binance do robô (reaproveitado pela estratégia).
+            candle_period (str): Intervalo dos candles (ex: '15m').
+            strategy_params (dict): Parâmetros da estratégia (ver load_bot_config).
+            checkpoint_dir (str): Diretório dos checkpoints. Padrão: CHECKPOINT_DIR.
+            checkpoint_name (str): Nome do checkpoint. Padrão: operation_code.
+        """
+        self.operation_code = operation_code
+        self.client_binance = client_binance
+        self.candle_period = candle_period
+        self.strategy_params = {**DEFAULT_STRATEGY_PARAMS, **(strategy_params or {})}
+        # Nome do robô: checkpoint e diário de decisões são por robô
+        self.name = checkpoint_name or operation_code
+        self.checkpoint_file = checkpoint_path(f"{self.name}.strategy", directory=checkpoint_dir)
+        self.strategy = None
+        # Último estado gravado, para não regravar (e sincronizar) o mesmo conteúdo
+        self._saved_state = None
+
+    @property
+    def current_price(self):
+        return self.strategy.current_price if self.strategy is not None else None
+
+    def _create_strategy(self, stock_data, actual_trade_position, current_price_from_buy_order):
+        # Importado no primeiro tick: a estratégia puxa o Gemini e os indicadores
+        from estrategias.getMovingAverageVergenceRSI import getMovingAverageVergenceRSI
+
+        strategy = getMovingAverageVergenceRSI(
+            stock_data=stock_data,
+            operation_code=self.operation_code,
+            actual_trade_position=actual_trade_position,
+            current_price_from_buy_order=current_price_from_buy_order,
+            client_binance=self.client_binance,
+            **{
+                key: value
+                for key, value in self.strategy_params.items()
+                if key in STRATEGY_INIT_PARAMS
+            },
+        )
+        strategy.interval = self.candle_period
+        strategy.bot_name = self.name
+
+        state = load_json_checkpoint(self.checkpoint_file)
+        if state:
+            for field in STATE_FIELDS:
+                if field in state:
+                    setattr(strategy, field, state[field])
+            if strategy.previous_gradients is not None:
+                # JSON não tem tupla
+                strategy.previous_gradients = tuple(strategy.previous_gradients)
+            bot_logger.info(f"Estado da estratégia de {self.operation_code} restaurado do checkpoint.")
+        return strategy
+
+    def decide(
+        self,
+        stock_data,
+        actual_trade_position,
+        current_price_from_buy_order,
+        initial_purchase_price,
+    ):
+        """
+        Executa a estratégia sobre os dados do tick, mantendo o estado anterior.
+
+        Returns:
+            bool: Decisão da estratégia (None para manter).
+        """
+        if self.strategy is None:
+            self.strategy = self._create_strategy(
+                stock_data, actual_trade_position, current_price_from_buy_order
+            )
+        else:
+            self.strategy.update_tick_data(
+                stock_data, actual_trade_position, current_price_from_buy_order
+            )
+
+        decision = self.strategy.getMovingAverageVergenceRSI(
+            initial_purchase_price=initial_purchase_price,
+            **{
+                key: value
+                for key, value in self.strategy_params.items()
+                if key in STRATEGY_RUN_PARAMS
+            },
+        )
+        if self.strategy.report is not None:
+            decision_journal.append(
+                self.operation_code, self.strategy.report.journal_row(), bot=self.name
+            )
+        return decision
+
+    def update_params(self, strategy_params):
+        """Aplica novos parâmetros sem perder o estado acumulado da estratégia."""
+        self.strategy_params = {**DEFAULT_STRATEGY_PARAMS, **strategy_params}
+        if self.strategy is not None:
+            for key, value in self.strategy_params.items():
+                if key in STRATEGY_INIT_PARAMS:
+                    setattr(self.strategy, key, value)
+
+    def state(self):
+        """Retorna o estado acumulado da estratégia como dicionário."""
+        if self.strategy is None:
+            return {}
+        return {field: getattr(self.strategy, field) for field in STATE_FIELDS}
+
+    def save_checkpoint(self):
+        """Grava o estado da estratégia, se mudou desde a última gravação."""
+        state = self.state()
+        if not state or state == self._saved_state:
+            return
+        try:
+            save_json_checkpoint(self.checkpoint_file, state)
+            self._saved_state = copy.deepcopy(state)
+        except (OSError, TypeError) as e:
+            erro_logger.error(
+                f"Erro ao gravar o checkpoint da estratégia de {self.operation_code}: {e}"
+            )
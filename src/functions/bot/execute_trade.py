@@ -9,43 +9,20 @@ def execute_trade(
 ):
     quantity = None  # Inicializa quantity como None
     try:
-        # Obtenha informações do símbolo para obter stepSize e minQty (quantidade mínima)
         current_price = Decimal(
             self.client_binance.get_symbol_ticker(symbol=self.operation_code)["price"]
         )
-        symbol_info = self.client_binance.get_symbol_info(self.operation_code)
-
-        step_size = min_quantity = min_notional = None
-
-        # Processa os filtros necessários
-        step_size = min_quantity = min_notional = 0
-        for filter in symbol_info["filters"]:
-            if filter["filterType"] == "LOT_SIZE":
-                step_size = Decimal(filter["stepSize"])
-                min_quantity = Decimal(filter["minQty"])
-            elif filter["filterType"] == "NOTIONAL":
-                min_notional = Decimal(filter["minNotional"])
-
-        # Validação
-        if step_size == 0 or min_quantity == 0 or min_notional == 0:
-            raise ValueError(
-                "Não foi possível obter 'stepSize', 'minQty' ou 'minNotional'"
-            )
-
-        # Verificando se os filtros estão presentes
-        if "filters" not in symbol_info:
-            raise ValueError(
-                f"Os filtros não estão presentes para o símbolo {self.operation_code}. Verifique o par de moedas."
-            )
-        # Logar os filtros disponíveis para depuração
-        # for filter in symbol_info['filters']:
-        # print(filter)  # Isso ajudará a ver quais filtros estão disponíveis
+        # Filtros (stepSize, minQty, minNotional) vêm do cache do exchangeInfo
+        symbol_filters = self.exchange_info.get(self.operation_code)
+        step_size = symbol_filters.step_size
+        min_quantity = symbol_filters.min_qty
+        min_notional = symbol_filters.min_notional
 
         if side == SIDE_BUY:
             balance = self.get_balance()
 
             quantity = self.quantity_calculator.calculate_max_buy_quantity(
-                symbol_info, balance, current_price
+                symbol_filters, balance, current_price
             )
 
             # Arredonda para baixo para o step_size mais próximo
@@ -82,7 +59,7 @@ def execute_trade(
                 erro_logger.error(f"iniciando correção do valor da venda")
 
                 quantity = self.quantity_calculator.calculate_max_sell_quantity(
-                    symbol_info, available_balance, current_price
+                    symbol_filters, available_balance, current_price
                 )
 
                 # Arredonda para baixo para o step_size mais próximo
@@ -151,6 +128,7 @@ def execute_trade(
         return order
 
     except BinanceAPIException as e:
+        self.exchange_info.handle_order_error(e)
         erro_logger.exception(
             f"Erro da Binance API ({side}): {e}, quantity: {quantity}"
         )
@@ -0,0 +1,159 @@
+import os
+
+MODES = ("live", "paper", "sim", "backtest")
+
+# Parâmetros do construtor de getMovingAverageVergenceRSI
+STRATEGY_INIT_PARAMS = (
+    "volume_threshold",
+    "rsi_period",
+    "rsi_upper",
+    "rsi_lower",
+    "stop_loss",
+    "stop_gain",
+)
+
+# Parâmetros do método getMovingAverageVergenceRSI (a cada tick)
+STRATEGY_RUN_PARAMS = (
+    "fast_window",
+    "slow_window",
+    "volatility_factor",
+    "hysteresis",
+    "growth_threshold",
+)
+
+DEFAULT_STRATEGY_PARAMS = {"fast_window": 7, "slow_window": 40, "volatility_factor": 0.3}
+
+# Limites do RiskWatcher (frações do preço de compra; 0 desativa o limite)
+DEFAULT_RISK_PARAMS = {
+    "stop_loss": 0.05,
+    "trailing_stop": 0.0,
+    "take_profit": 0.10,
+    "level_1": 0.03,
+    "level_2": 0.06,
+    "total_fee": 0.002,
+}
+
+# Exchange simulada no processo (PaperExchange) dos robôs em modo sim
+DEFAULT_SIM_CONFIG = {
+    "balance_usdt": 1000.0,
+    "fee_rate": "0.001",
+    "slippage_bps": 0.0,
+    "slippage_jitter_bps": 0.0,
+    "market": "live",  # live: preços da Binance; replay: candles do MockBinanceServer
+}
+
+# Campos que só mudam reiniciando o robô (o resto é recarregado em execução)
+RESTART_FIELDS = ("symbol", "stock_code", "interval", "mode", "traded_quantity", "traded_percentage")
+
+
+def _read_file(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".toml":
+        import tomllib
+
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+    if extension in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Instale o PyYAML para usar configurações .yaml.")
+        with open(path, encoding="utf-8") as file:
+            return yaml.safe_load(file) or {}
+    raise ValueError(f"Formato de configuração não suportado: {path} (use .toml ou .yaml)")
+
+
+def _check_strategy(name, strategy):
+    unknown = set(strategy) - set(STRATEGY_INIT_PARAMS) - set(STRATEGY_RUN_PARAMS)
+    if unknown:
+        raise ValueError(
+            f"Robô {name}: parâmetros de estratégia desconhecidos: {', '.join(sorted(unknown))}"
+        )
+
+
+def _check_risk(name, risk):
+    unknown = set(risk) - set(DEFAULT_RISK_PARAMS)
+    if unknown:
+        raise ValueError(
+            f"Robô {name}: parâmetros de risco desconhecidos: {', '.join(sorted(unknown))}"
+        )
+
+
+def load_bot_config(path):
+    """
+    Lê a configuração dos robôs de um arquivo TOML ou YAML.
+
+    Cada item de `bots` herda os valores de `defaults` (as tabelas `strategy`
+    e `risk` são mescladas chave a chave). Exemplo em bots.example.toml.
+
+    Args:
+        path (str): Caminho do arquivo .toml, .yaml ou .yml.
+
+    Returns:
+        dict: {"workers", "tick_seconds", "reload_seconds", "sim", "bots": [...]},
+        onde cada robô tem name, symbol, stock_code, interval, mode,
+        traded_quantity, traded_percentage, tick_seconds, strategy e risk, e `sim`
+        traz a tabela [sim] completada com DEFAULT_SIM_CONFIG.
+
+    Raises:
+        ValueError: Se a configuração estiver incompleta ou inválida.
+    """
+    raw = _read_file(path)
+    defaults = raw.get("defaults", {})
+    config = {
+        "workers": int(raw.get("workers", 0)),
+        "tick_seconds": float(raw.get("tick_seconds", 60)),
+        "reload_seconds": float(raw.get("reload_seconds", 5)),
+        "sim": {**DEFAULT_SIM_CONFIG, **raw.get("sim", {})},
+        "bots": [],
+    }
+    if config["sim"]["market"] not in ("live", "replay"):
+        raise ValueError(
+            f"[sim] market {config['sim']['market']!r} inválido (use live ou replay)."
+        )
+    if not raw.get("bots"):
+        raise ValueError(f"Nenhum robô configurado em {path} (lista `bots`).")
+
+    names = set()
+    for entry in raw["bots"]:
+        bot = {**defaults, **entry}
+        bot["strategy"] = {
+            **DEFAULT_STRATEGY_PARAMS,
+            **defaults.get("strategy", {}),
+            **entry.get("strategy", {}),
+        }
+        bot["risk"] = {
+            **DEFAULT_RISK_PARAMS,
+            **defaults.get("risk", {}),
+            **entry.get("risk", {}),
+        }
+
+        for field in ("symbol", "stock_code"):
+            if not bot.get(field):
+                raise ValueError(f"Robô sem `{field}` em {path}: {entry}")
+        bot["symbol"] = bot["symbol"].upper()
+        bot["stock_code"] = bot["stock_code"].upper()
+        if not bot["symbol"].startswith(bot["stock_code"]):
+            raise ValueError(
+                f"Robô {bot['symbol']}: stock_code {bot['stock_code']} não é o ativo base do par."
+            )
+
+        bot["mode"] = bot.get("mode", "backtest")
+        if bot["mode"] not in MODES:
+            raise ValueError(
+                f"Robô {bot['symbol']}: modo {bot['mode']!r} inválido (use {', '.join(MODES)})."
+            )
+        bot["name"] = bot.get("name") or f"{bot['symbol']}-{bot['mode']}"
+        if bot["name"] in names:
+            raise ValueError(f"Nome de robô repetido: {bot['name']}")
+        names.add(bot["name"])
+
+        bot["interval"] = bot.get("interval", "15m")
+        bot["traded_quantity"] = float(bot.get("traded_quantity", 0))
+        bot["traded_percentage"] = float(bot.get("traded_percentage", 100))
+        bot["tick_seconds"] = float(bot.get("tick_seconds", config["tick_seconds"]))
+        _check_strategy(bot["name"], bot["strategy"])
+        _check_risk(bot["name"], bot["risk"])
+        config["bots"].append(bot)
+
+    return config
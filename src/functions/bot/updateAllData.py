@@ -3,7 +3,9 @@ from functions.logger import erro_logger
 
 def updateAllData(self):
     try:
-        self.account_data = self.getUpdatedAccountData()
+        # Com o user data stream ativo os saldos já estão atualizados
+        if not self.user_stream.live:
+            self.account_data = self.getUpdatedAccountData()
         self.last_stock_account_balance = self.getLastStockAccountBalance()
         self.actual_trade_position = self.getActualTradePositionForBinance()
         self.stock_data = self.getStockData()
@@ -0,0 +1,92 @@
+from decimal import Decimal, ROUND_CEILING, ROUND_DOWN
+from functions.logger import erro_logger
+
+
+def raise_to_min_notional(quantity, price, step_size, min_notional):
+    """
+    Sobe a quantidade em múltiplos de step_size até atingir o min_notional.
+
+    Equivale a `while quantity * price < min_notional: quantity += step_size`,
+    mas calcula o número de passos diretamente com divisão por teto.
+
+    Args:
+        quantity (Decimal): Quantidade inicial.
+        price (Decimal): Preço usado para o notional.
+        step_size (Decimal): Incremento da quantidade (LOT_SIZE).
+        min_notional (Decimal): Valor mínimo da ordem (NOTIONAL).
+
+    Returns:
+        Decimal: Menor quantity + k * step_size (k >= 0) com notional >= min_notional.
+    """
+    deficit = min_notional - quantity * price
+    if deficit <= 0:
+        return quantity
+
+    steps = (deficit / (step_size * price)).to_integral_value(rounding=ROUND_CEILING)
+
+    # A divisão Decimal é arredondada na precisão do contexto; corrige o
+    # possível erro de um passo usando a mesma comparação do laço original.
+    while steps > 0 and (quantity + (steps - 1) * step_size) * price >= min_notional:
+        steps -= 1
+    while (quantity + steps * step_size) * price < min_notional:
+        steps += 1
+
+    return quantity + steps * step_size
+
+
+def calculate_order_quantity(symbol_filters, funds, current_price):
+    """
+    Calcula a quantidade de uma ordem respeitando LOT_SIZE e NOTIONAL.
+
+    Args:
+        symbol_filters (SymbolFilters): Filtros do símbolo.
+        funds (Decimal): Saldo disponível em moeda de cotação (USDT).
+        current_price (Decimal): Preço atual do ativo.
+
+    Returns:
+        Decimal: Quantidade máxima para o saldo, elevada ao mínimo de
+        notional e de quantidade quando necessário.
+
+    Raises:
+        ValueError: Se funds ou current_price não forem positivos.
+    """
+    if not isinstance(funds, (int, float, Decimal)) or funds <= 0:
+        raise ValueError("O valor do balance deve ser um número positivo.")
+    if not isinstance(current_price, (int, float, Decimal)) or current_price <= 0:
+        raise ValueError("O valor do current_price deve ser um número positivo.")
+
+    price = Decimal(current_price)
+    step_size = symbol_filters.step_size
+
+    # Quantidade máxima teórica ajustada para baixo no step_size
+    quantity = (Decimal(funds) / price).quantize(step_size, rounding=ROUND_DOWN)
+    quantity = raise_to_min_notional(
+        quantity, price, step_size, symbol_filters.min_notional
+    )
+    return max(symbol_filters.min_qty, quantity)
+
+
+def calculate_order_quantities(orders):
+    """
+    Calcula as quantidades de várias ordens de uma vez (ex: rebalanceamento).
+
+    Args:
+        orders (iterable): Dicionários com 'symbol', 'filters' (SymbolFilters),
+            'funds' e 'price'.
+
+    Returns:
+        dict: {symbol: Decimal} com a quantidade de cada ordem, ou None para
+        as ordens com dados inválidos (o erro é registrado no erro_logger).
+    """
+    quantities = {}
+    for order in orders:
+        try:
+            quantities[order["symbol"]] = calculate_order_quantity(
+                order["filters"], order["funds"], order["price"]
+            )
+        except ValueError as e:
+            erro_logger.error(
+                f"Erro ao calcular a quantidade da ordem de {order['symbol']}: {e}"
+            )
+            quantities[order["symbol"]] = None
+    return quantities
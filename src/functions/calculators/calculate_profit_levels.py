@@ -1,3 +1,44 @@
+def profit_levels(buy_price, profit_percentage, profit_level_1, profit_level_2, total_fee):
+    """
+    Níveis de take profit de uma posição, sem consultar a Binance.
+
+    Meta principal, níveis 1 e 2 e break-even (preço que cobre as taxas de
+    compra e venda). Usado por calculate_profit_levels e pelo RiskWatcher.
+
+    Args:
+        buy_price (float): Preço de compra.
+        profit_percentage (float): Meta principal, em porcentagem (ex: 10).
+        profit_level_1 (float): Nível 1, em porcentagem.
+        profit_level_2 (float): Nível 2, em porcentagem.
+        total_fee (float): Taxa total (compra + venda), ex: 0.002 = 0,2%.
+
+    Returns:
+        dict: {nível: {"percentage", "price", "description"}}.
+    """
+    return {
+        "main": {
+            "percentage": profit_percentage,
+            "price": buy_price * (1 + (profit_percentage / 100)),
+            "description": "Meta principal",
+        },
+        "level_1": {
+            "percentage": profit_level_1,
+            "price": buy_price * (1 + (profit_level_1 / 100)),
+            "description": f"Nível 1 ({profit_level_1}%)",
+        },
+        "level_2": {
+            "percentage": profit_level_2,
+            "price": buy_price * (1 + (profit_level_2 / 100)),
+            "description": f"Nível 2 ({profit_level_2}%)",
+        },
+        "break_even": {
+            "percentage": total_fee * 100,
+            "price": buy_price * (1 + total_fee),
+            "description": "Break-even (sem lucro, sem prejuízo)",
+        },
+    }
+
+
 def init_bot(self, total_free, min_balance):
     """
     Inicializa o bot com valores essenciais.
@@ -25,28 +66,13 @@ def init_bot(self, total_free, min_balance):
             current_price = float(ticker["price"])
 
             # Calcular níveis de lucro
-            profit_levels = {
-                "main": {
-                    "percentage": self.profit_percentage,
-                    "price": self.last_buy_price * (1 + (self.profit_percentage / 100)),
-                    "description": "Meta principal",
-                },
-                "level_1": {
-                    "percentage": self.profit_level_1,
-                    "price": self.last_buy_price * (1 + (self.profit_level_1 / 100)),
-                    "description": f"Nível 1 ({self.profit_level_1}%)",
-                },
-                "level_2": {
-                    "percentage": self.profit_level_2,
-                    "price": self.last_buy_price * (1 + (self.profit_level_2 / 100)),
-                    "description": f"Nível 2 ({self.profit_level_2}%)",
-                },
-                "break_even": {
-                    "percentage": total_fee * 100,
-                    "price": self.last_buy_price * (1 + total_fee),
-                    "description": "Break-even (sem lucro, sem prejuízo)",
-                },
-            }
+            levels = profit_levels(
+                self.last_buy_price,
+                self.profit_percentage,
+                self.profit_level_1,
+                self.profit_level_2,
+                total_fee,
+            )
 
             # Calcular lucro atual em porcentagem
             current_profit = (
@@ -54,9 +80,9 @@ def init_bot(self, total_free, min_balance):
             ) * 100
 
             # Exibir informações detalhadas
-            self._display_profit_levels(profit_levels, current_price, current_profit)
+            self._display_profit_levels(levels, current_price, current_profit)
 
-            return profit_levels, current_profit
+            return levels, current_profit
 
         except Exception as e:
             print(f"Erro ao calcular níveis de lucro: {str(e)}")
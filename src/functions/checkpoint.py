@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+import numpy as np
+from functions.logger import erro_logger
+
+# Diretório padrão dos checkpoints (como logs/, relativo ao diretório de execução)
+CHECKPOINT_DIR = os.getenv("BOT_CHECKPOINT_DIR", "checkpoints")
+
+
+def _encode(value):
+    if isinstance(value, Decimal):
+        return {"__decimal__": str(value)}
+    if hasattr(value, "tolist"):  # Escalares e arrays NumPy
+        return value.tolist()
+    raise TypeError(f"Valor não serializável no checkpoint: {type(value).__name__}")
+
+
+def _decode(obj):
+    if "__decimal__" in obj:
+        return Decimal(obj["__decimal__"])
+    return obj
+
+
+def checkpoint_path(name, extension="json", directory=None):
+    """Caminho do checkpoint `name` (ex: 'SOLUSDT.strategy') no diretório de checkpoints."""
+    return os.path.join(directory or CHECKPOINT_DIR, f"{name}.{extension}")
+
+
+def atomic_write(path, write):
+    """
+    Grava um arquivo de forma atômica: escreve em um temporário no mesmo
+    diretório, faz fsync e substitui o destino com os.replace. Uma queda no
+    meio da gravação deixa o arquivo anterior intacto.
+
+    Args:
+        path (str): Arquivo de destino.
+        write: Função write(file) que grava o conteúdo no arquivo binário aberto.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+def save_json_checkpoint(path, data):
+    """Grava `data` em JSON de forma atômica (Decimal e tipos NumPy suportados)."""
+    payload = json.dumps(data, default=_encode, separators=(",", ":")).encode("utf-8")
+    atomic_write(path, lambda file: file.write(payload))
+
+
+def save_array_checkpoint(path, array):
+    """Grava um array NumPy (ex: CandleSeries.to_array()) em .npy de forma atômica."""
+    atomic_write(path, lambda file: np.save(file, array, allow_pickle=False))
+
+
+def load_array_checkpoint(path):
+    """
+    Lê um checkpoint .npy.
+
+    Returns:
+        np.ndarray: Array gravado, ou None se não existir ou estiver corrompido.
+    """
+    try:
+        return np.load(path, allow_pickle=False)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        erro_logger.error(f"Checkpoint {path} ilegível ({e}); ignorando.")
+        return None
+
+
+def load_json_checkpoint(path):
+    """
+    Lê um checkpoint JSON.
+
+    Returns:
+        dict: Conteúdo do checkpoint, ou None se não existir ou estiver corrompido.
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            return json.load(file, object_hook=_decode)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        erro_logger.error(f"Checkpoint {path} ilegível ({e}); ignorando.")
+        return None
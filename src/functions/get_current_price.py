@@ -1,5 +1,7 @@
 import requests
 import decimal
+from functions.binance.create_client import get_api_base_url
+from functions.binance.RequestScheduler import PRIORITY_MARKET_DATA, shared_scheduler
 
 
 def get_current_price(symbol):
@@ -14,10 +16,12 @@ def get_current_price(symbol):
     """
     try:
         # Endpoint da API pública da Binance para obter preços
-        url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}"
+        url = f"{get_api_base_url()}/v3/ticker/price?symbol={symbol}"
 
-        # Faz a requisição GET
+        # Faz a requisição GET respeitando o limite de peso da API
+        shared_scheduler.acquire(2, PRIORITY_MARKET_DATA)
         response = requests.get(url)
+        shared_scheduler.update_from_headers(response.status_code, response.headers)
         response.raise_for_status()  # Levanta exceções para erros HTTP
 
         # Obtém o preço do JSON retornado
@@ -0,0 +1,87 @@
+import threading
+import weakref
+from functions.indicadores.rolling_indicators import ewm_mean, rolling_mean, rolling_std, rsi
+from functions.metrics import metrics
+
+
+class IndicatorRegistry:
+    """
+    Cache de indicadores por série de candles.
+
+    Cada resultado é guardado pela chave (série, versão da série, indicador,
+    parâmetros): no mesmo tick todas as estratégias que pedem, por exemplo,
+    a SMA de 7 sobre os fechamentos recebem o mesmo array, calculado uma vez.
+    Quando a série muda de versão os resultados antigos dela são descartados.
+    Os arrays devolvidos são somente-leitura.
+    """
+
+    def __init__(self):
+        self._indicators = {}
+        # série -> (versão, {(indicador, coluna, parâmetros): resultado})
+        self._cache = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, name, func):
+        """
+        Registra um indicador.
+
+        Args:
+            name (str): Nome usado em compute().
+            func: Função func(values, **params) que recebe a coluna da série
+                (np.ndarray) e retorna um array do mesmo tamanho.
+        """
+        self._indicators[name] = func
+
+    def compute(self, series, name, column="close", **params):
+        """
+        Retorna o indicador `name` da coluna `column` da série, do cache se possível.
+
+        Args:
+            series (CandleSeries): Série de candles.
+            name (str): Indicador registrado (ex: 'sma', 'std', 'rsi').
+            column (str): Coluna da série usada como entrada.
+            **params: Parâmetros do indicador (ex: window=7).
+
+        Returns:
+            np.ndarray: Resultado somente-leitura.
+        """
+        key = (name, column, tuple(sorted(params.items())))
+        with self._lock:
+            version, results = self._cache.get(series, (None, None))
+            if version != series.version:
+                results = {}
+                self._cache[series] = (series.version, results)
+            result = results.get(key)
+            if result is not None:
+                self.hits += 1
+                metrics.increment("indicators.hits")
+                return result
+
+        # Calculado fora do lock; no pior caso duas threads calculam o mesmo valor
+        result = self._indicators[name](series.column(column), **params)
+        result.flags.writeable = False
+        with self._lock:
+            self.misses += 1
+            metrics.increment("indicators.misses")
+            if self._cache.get(series, (None,))[0] == series.version:
+                self._cache[series][1][key] = result
+        return result
+
+    def stats(self):
+        """Retorna acertos, falhas e a taxa de acerto do cache."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# Registro compartilhado por todas as estratégias do processo
+indicator_registry = IndicatorRegistry()
+indicator_registry.register("sma", rolling_mean)
+indicator_registry.register("std", rolling_std)
+indicator_registry.register("ema", ewm_mean)
+indicator_registry.register("rsi", rsi)
@@ -49,9 +49,11 @@ class TechnicalIndicators:
         try:
 
             # Converte a coluna 'close_price' para numérico, substituindo erros por NaN
-            self.stock_data["close_price"] = pd.to_numeric(
-                self.stock_data["close_price"], errors="coerce"
-            )
+            # (só quando ainda vier como texto; parse_klines já entrega float64)
+            if not pd.api.types.is_numeric_dtype(self.stock_data["close_price"]):
+                self.stock_data["close_price"] = pd.to_numeric(
+                    self.stock_data["close_price"], errors="coerce"
+                )
 
             # Calcula a diferença entre os preços de fechamento
             delta = self.stock_data["close_price"].diff()
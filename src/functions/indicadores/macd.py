@@ -2,17 +2,25 @@ import os
 import talib
 import pandas as pd
 import numpy as np
-from binance.client import Client as client_binance
+from functions.binance.create_client import create_client
 
 # **Configurar a API da Binance**
-api_key = os.getenv("BINANCE_API_KEY")
-secret_key = os.getenv("BINANCE_SECRET_KEY")
-client_binance = client_binance(api_key, secret_key)
+_client_binance = None
+
+
+def get_client():
+    """Cria o cliente da Binance na primeira chamada, e não no import do módulo."""
+    global _client_binance
+    if _client_binance is None:
+        _client_binance = create_client(
+            os.getenv("BINANCE_API_KEY"), os.getenv("BINANCE_SECRET_KEY")
+        )
+    return _client_binance
 
 
 # **Função para obter dados históricos do ativo**
 def get_historical_data(symbol, interval, limit):
-    klines = client_binance.get_klines(symbol=symbol, interval=interval, limit=limit)
+    klines = get_client().get_klines(symbol=symbol, interval=interval, limit=limit)
     df = pd.DataFrame(
         klines,
         columns=[
@@ -70,14 +78,15 @@ def calculate_macd(df):
 
 
 # EXEMPLO: Utilizar o ativo SOLUSDT (Solana) com intervalo de 15 minutos e limite de 500 candlesticks
-# **Executar o código**
-df = get_historical_data(symbol="SOLUSDT", interval="15m", limit=500)
-macd_values = calculate_macd(df)
+if __name__ == "__main__":
+    # **Executar o código**
+    df = get_historical_data(symbol="SOLUSDT", interval="15m", limit=500)
+    macd_values = calculate_macd(df)
 
-# **Exibir os resultados**
-print("\n📊 Indicador MACD:")
-print(f"MACD: {macd_values['MACD']:.5f}")
-print(f"Linha de Sinal: {macd_values['Signal']:.5f}")
-print(f"Histograma: {macd_values['Histograma']:.5f}")
-print(f"Sinal de Compra: {macd_values['Buy_Signal']}")
-print(f"Sinal de Venda: {macd_values['Sell_Signal']}")
+    # **Exibir os resultados**
+    print("\n📊 Indicador MACD:")
+    print(f"MACD: {macd_values['MACD']:.5f}")
+    print(f"Linha de Sinal: {macd_values['Signal']:.5f}")
+    print(f"Histograma: {macd_values['Histograma']:.5f}")
+    print(f"Sinal de Compra: {macd_values['Buy_Signal']}")
+    print(f"Sinal de Venda: {macd_values['Sell_Signal']}")
@@ -0,0 +1,60 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _rolling(values, window, reducer):
+    values = np.asarray(values, dtype="f8")
+    result = np.full(len(values), np.nan)
+    if 0 < window <= len(values):
+        result[window - 1 :] = reducer(sliding_window_view(values, window))
+    return result
+
+
+def rolling_mean(values, window):
+    """
+    Média móvel simples, equivalente a Series.rolling(window).mean().
+
+    Returns:
+        np.ndarray: Mesmo tamanho de `values`, com NaN nas primeiras window-1 posições.
+    """
+    return _rolling(values, window, lambda windows: windows.mean(axis=1))
+
+
+def rolling_std(values, window):
+    """Desvio padrão móvel amostral, equivalente a Series.rolling(window).std()."""
+    return _rolling(values, window, lambda windows: windows.std(axis=1, ddof=1))
+
+
+def ewm_mean(values, span):
+    """Média móvel exponencial, equivalente a Series.ewm(span=span, adjust=False).mean()."""
+    values = np.asarray(values, dtype="f8")
+    result = np.empty(len(values))
+    if not len(values):
+        return result
+    alpha = 2.0 / (span + 1.0)
+    current = values[0]
+    for index, value in enumerate(values):
+        current = current + alpha * (value - current) if index else value
+        result[index] = current
+    return result
+
+
+def rsi(values, period=14):
+    """
+    RSI com médias exponenciais de ganhos e perdas, como TechnicalIndicators.calculate_rsi.
+
+    Args:
+        values (np.ndarray): Preços de fechamento.
+        period (int): Período do RSI.
+
+    Returns:
+        np.ndarray: RSI de cada candle (mesmo tamanho de `values`).
+    """
+    values = np.asarray(values, dtype="f8")
+    delta = np.diff(values, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    avg_gain = ewm_mean(gain, period)
+    avg_loss = ewm_mean(loss, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
@@ -136,6 +136,3 @@ def createLogOrder(order, operation_code):
     except Exception as e:
         erro_logger.exception(f"Erro ao registrar ordem: {e}")
 
-
-# Fechar handlers ao final da execução para liberar recursos
-logging.shutdown()
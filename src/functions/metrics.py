@@ -0,0 +1,63 @@
+import logging
+import threading
+import time
+
+# Mesmo logger de functions.logger; importado pelo nome porque db.neonDbConfig
+# usa este módulo e functions.logger importa db.neonDbConfig.
+bot_logger = logging.getLogger("bot")
+
+
+class Metrics:
+    """
+    Registro simples de contadores e medidores do bot, seguro entre threads.
+
+    Os valores ficam em memória e podem ser consultados com snapshot() ou
+    gravados no bot.log com log_snapshot().
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._gauges = {}
+        self._logged_at = None
+        self._lock = threading.Lock()
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name, value):
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name, default=0):
+        with self._lock:
+            return self._gauges.get(name, self._counters.get(name, default))
+
+    def snapshot(self):
+        """Retorna uma cópia de todos os contadores e medidores."""
+        with self._lock:
+            return {**self._counters, **self._gauges}
+
+    def log_snapshot(self, every=None):
+        """
+        Grava todos os valores no bot.log.
+
+        Args:
+            every (float): Intervalo mínimo em segundos entre gravações (no
+                processo todo, não por robô). None grava sempre.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if every is not None and self._logged_at is not None and now - self._logged_at < every:
+                return
+            self._logged_at = now
+        values = self.snapshot()
+        if values:
+            bot_logger.info(
+                "Métricas: "
+                + ", ".join(f"{name}={value}" for name, value in sorted(values.items()))
+            )
+
+
+# Registro compartilhado por todo o processo
+metrics = Metrics()
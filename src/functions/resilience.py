@@ -0,0 +1,202 @@
+import logging
+import random
+import threading
+import time
+from functions.metrics import metrics
+
+# Mesmos loggers de functions.logger; importados pelo nome porque
+# db.neonDbConfig usa este módulo e functions.logger importa db.neonDbConfig.
+bot_logger = logging.getLogger("bot")
+erro_logger = logging.getLogger("erros")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Valor do medidor circuit.<nome>.state em metrics
+STATE_GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Chamada recusada porque o circuito da dependência está aberto."""
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de uma dependência externa (Binance, NeonDB, Gemini).
+
+    Após `failure_threshold` falhas seguidas o circuito abre e as chamadas
+    falham imediatamente por `reset_timeout` segundos; depois disso uma
+    única chamada de teste (meio aberto) decide se o circuito fecha ou
+    reabre, e as demais continuam recusadas enquanto ela não termina (ou
+    até outro `reset_timeout`, se ela nunca informar o resultado).
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_started = None  # Momento em que a chamada de teste saiu
+        self._lock = threading.Lock()
+        metrics.set_gauge(f"circuit.{name}.state", STATE_GAUGE[CLOSED])
+
+    def _set_state(self, state):
+        if state != self.state:
+            bot_logger.warning(f"Circuito {self.name}: {self.state} -> {state}")
+            self.state = state
+            metrics.set_gauge(f"circuit.{self.name}.state", STATE_GAUGE[state])
+
+    def _probe_pending(self, now):
+        # Chamado com o lock: outra chamada de teste ainda está em andamento
+        return (
+            self.probe_started is not None
+            and now - self.probe_started < self.reset_timeout
+        )
+
+    def available(self):
+        """
+        True se uma chamada seria aceita agora, sem ocupar a chamada de teste.
+
+        Para checagens antes do trabalho (ex: pular o tick); a chamada em si
+        passa por allow() (retry_call/call).
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                return now - self.opened_at >= self.reset_timeout
+            if self.state == HALF_OPEN:
+                return not self._probe_pending(now)
+            return True
+
+    def allow(self):
+        """Retorna True se a chamada pode ser feita agora (no meio aberto, só uma)."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self.opened_at < self.reset_timeout:
+                    metrics.increment(f"circuit.{self.name}.short_circuits")
+                    return False
+                self._set_state(HALF_OPEN)
+                self.probe_started = None
+            if self.state == HALF_OPEN:
+                if self._probe_pending(now):
+                    metrics.increment(f"circuit.{self.name}.short_circuits")
+                    return False
+                self.probe_started = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.probe_started = None
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probe_started = None
+            metrics.increment(f"circuit.{self.name}.failures")
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Executa func pelo circuito.
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto.
+        """
+        if not self.allow():
+            raise CircuitOpenError(f"Circuito {self.name} aberto")
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success()
+        return result
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name, failure_threshold=5, reset_timeout=30):
+    """Retorna o circuit breaker compartilhado da dependência `name`."""
+    with _breakers_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout)
+        return _breakers[name]
+
+
+def backoff_delay(attempt, base_delay=0.5, max_delay=30.0):
+    """Atraso exponencial com jitter completo para a tentativa `attempt` (0, 1, 2...)."""
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
+
+
+def is_transient_http_error(error):
+    """
+    True se o erro pode passar sozinho: sem status HTTP (rede), 5xx, 429 ou 418.
+
+    Erros 4xx de requisição (ex: BinanceAPIException -1121, símbolo inválido)
+    não melhoram com nova tentativa nem indicam falha da dependência.
+    """
+    status = getattr(error, "status_code", None)
+    return status is None or status >= 500 or status in (418, 429)
+
+
+def retry_call(
+    func,
+    *args,
+    attempts=3,
+    base_delay=0.5,
+    max_delay=30.0,
+    retry_on=(Exception,),
+    retry_if=None,
+    breaker=None,
+    **kwargs,
+):
+    """
+    Executa func com novas tentativas e backoff exponencial com jitter.
+
+    Args:
+        func: Função a ser chamada com *args e **kwargs.
+        attempts (int): Número máximo de tentativas.
+        base_delay (float): Atraso base em segundos.
+        max_delay (float): Atraso máximo entre tentativas.
+        retry_on (tuple): Exceções que justificam uma nova tentativa.
+        retry_if (callable): Filtro das exceções de retry_on; as recusadas
+            sobem na hora, sem contar como falha no circuito.
+        breaker (CircuitBreaker): Circuito da dependência, se houver.
+
+    Raises:
+        CircuitOpenError: Se o circuito estiver (ou abrir) aberto.
+        Exception: A última exceção de func quando as tentativas acabam.
+    """
+    for attempt in range(attempts):
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError(f"Circuito {breaker.name} aberto")
+        try:
+            result = func(*args, **kwargs)
+        except retry_on as e:
+            if retry_if is not None and not retry_if(e):
+                raise
+            if breaker is not None:
+                breaker.record_failure()
+            # Sem mais tentativas, ou o circuito acabou de abrir: não adianta esperar
+            if attempt == attempts - 1 or (breaker is not None and breaker.state == OPEN):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            erro_logger.error(
+                f"Falha em {getattr(func, '__name__', func)} ({e}); "
+                f"nova tentativa em {delay:.2f}s ({attempt + 1}/{attempts})"
+            )
+            time.sleep(delay)
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
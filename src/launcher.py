@@ -0,0 +1,352 @@
+"""
+Inicia vários robôs a partir de um arquivo de configuração TOML ou YAML.
+
+Uso:
+    python launcher.py bots.toml                # todos os robôs neste processo
+    python launcher.py bots.toml --workers 4    # robôs divididos em 4 processos
+    python launcher.py bots.toml --only SOLUSDT-paper --once
+    python launcher.py bots.toml --check        # só valida a configuração
+
+Cada robô roda em sua própria thread. Modos:
+    live      ordens reais na Binance;
+    paper     ordens no MockBinanceServer local (saldos simulados);
+    sim       ordens em uma PaperExchange no próprio processo, com taxa e
+              slippage da tabela [sim], contra preços reais (market = "live")
+              ou o replay do MockBinanceServer (market = "replay"). Com
+              --workers, cada processo tem a sua PaperExchange e o
+              balance_usdt é dividido entre eles pelos robôs sim de cada um;
+    backtest  só calcula as decisões, sem enviar ordens.
+
+As tabelas `strategy` e `risk` e o `tick_seconds` de cada robô são recarregados
+quando o arquivo muda, sem recriar clientes, streams ou caches. Mudanças de
+símbolo, intervalo, modo ou quantidade, e robôs novos, exigem reiniciar.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from functions.bot.load_bot_config import RESTART_FIELDS, load_bot_config
+from functions.logger import bot_logger, erro_logger
+
+
+def _market_intervals(bots):
+    """
+    Intervalo dos candles de cada mercado simulado.
+
+    O MockBinanceServer tem um único mercado por símbolo: se dois robôs do
+    mesmo símbolo usam intervalos diferentes, vale o do primeiro.
+
+    Returns:
+        dict: {'BASE/QUOTE': intervalo}.
+    """
+    intervals = {}
+    for bot in bots:
+        pair = f"{bot['stock_code']}/{bot['symbol'][len(bot['stock_code']):]}"
+        interval = intervals.setdefault(pair, bot["interval"])
+        if interval != bot["interval"]:
+            bot_logger.warning(
+                f"Robô {bot['name']}: o mercado simulado de {bot['symbol']} usa candles "
+                f"de {interval}, não {bot['interval']}."
+            )
+    return intervals
+
+
+def _start_paper_exchange(bots):
+    """Sobe um MockBinanceServer com os mercados dos robôs (paper ou replay)."""
+    from functions.binance.MockBinanceServer import MockBinanceServer, load_markets
+
+    intervals = _market_intervals(bots)
+    pairs = sorted(intervals)
+    markets = [
+        market
+        for pair in pairs
+        for market in load_markets([pair], interval=intervals[pair])
+    ]
+    server = MockBinanceServer(markets).start()
+    bot_logger.info(f"Exchange simulada para {', '.join(pairs)} em {server.base_url}")
+    return server
+
+
+def _create_sim_exchange(sim, share=1.0):
+    """
+    PaperExchange compartilhada pelos robôs em modo sim do worker.
+
+    Args:
+        sim (dict): Tabela [sim] da configuração.
+        share (float): Parte de `balance_usdt` deste worker (ver sim_shares).
+    """
+    from functions.binance.PaperExchange import PaperExchange
+
+    balance = sim["balance_usdt"] * share
+    exchange = PaperExchange(
+        balances={"USDT": balance},
+        fee_rate=str(sim["fee_rate"]),
+        slippage_bps=sim["slippage_bps"],
+        slippage_jitter_bps=sim["slippage_jitter_bps"],
+    )
+    bot_logger.info(
+        f"Exchange simulada no processo: {balance:g} USDT, taxa {sim['fee_rate']}, "
+        f"slippage {sim['slippage_bps']} bps, mercado {sim['market']}"
+    )
+    return exchange
+
+
+def sim_shares(bots, groups):
+    """
+    Divide o `balance_usdt` do [sim] entre os workers.
+
+    Cada worker tem a sua PaperExchange; a parte de cada um é proporcional
+    aos seus robôs em modo sim, e a soma dos saldos é a da configuração.
+
+    Args:
+        bots (list): Robôs da configuração.
+        groups (list): Nomes dos robôs de cada worker.
+
+    Returns:
+        list: Parte (0 a 1) do saldo de cada worker.
+    """
+    sim_bots = {bot["name"] for bot in bots if bot["mode"] == "sim"}
+    total = sum(len(sim_bots.intersection(group)) for group in groups)
+    if not total:
+        return [1.0] * len(groups)
+    return [len(sim_bots.intersection(group)) / total for group in groups]
+
+
+class BotWorker:
+    """Roda um grupo de robôs no processo atual, uma thread por robô."""
+
+    def __init__(self, config_path, bot_names=None, once=False, sim_share=1.0):
+        """
+        Args:
+            config_path (str): Arquivo de configuração.
+            bot_names (list): Robôs deste worker. Padrão: todos.
+            once (bool): Executa um único tick de cada robô e termina.
+            sim_share (float): Parte do `balance_usdt` do [sim] deste worker.
+        """
+        self.config_path = config_path
+        self.once = once
+        self.sim_share = sim_share
+        self.config = load_bot_config(config_path)
+        self._mtime = os.path.getmtime(config_path)
+        self.specs = {
+            bot["name"]: bot
+            for bot in self.config["bots"]
+            if bot_names is None or bot["name"] in bot_names
+        }
+        self.traders = {}
+        self.paper_exchange = None
+        self.sim_exchange = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _create_traders(self):
+        from BinanceTrader2 import BinanceTraderBot
+        from functions.InteligenciaArtificial.LocalClassifier import local_batch_predictor
+
+        if len(self.specs) > 1:
+            # Vários robôs: o relatório de cada tick vai só para o bot.log
+            os.environ.setdefault("STRATEGY_CONSOLE_REPORT", "0")
+            # ...e as predições do classificador local saem em lote
+            os.environ.setdefault("LOCAL_BATCH_WINDOW_MS", "2")
+            local_batch_predictor.window = float(os.environ["LOCAL_BATCH_WINDOW_MS"]) / 1000
+        sim = self.config["sim"]
+        sim_bots = [bot for bot in self.specs.values() if bot["mode"] == "sim"]
+        replay_bots = sim_bots if sim["market"] == "replay" else []
+        paper_bots = [bot for bot in self.specs.values() if bot["mode"] == "paper"]
+        if sim_bots:
+            self.sim_exchange = _create_sim_exchange(sim, self.sim_share)
+        if paper_bots or replay_bots:
+            # Em replay, os robôs sim leem candles e preços do MockBinanceServer
+            self.paper_exchange = _start_paper_exchange(paper_bots + replay_bots)
+
+        for name, bot in self.specs.items():
+            mock_market = bot["mode"] == "paper" or (
+                bot["mode"] == "sim" and sim["market"] == "replay"
+            )
+            self.traders[name] = BinanceTraderBot(
+                bot["stock_code"],
+                bot["symbol"],
+                bot["traded_quantity"],
+                bot["traded_percentage"],
+                bot["interval"],
+                backtest_mode=bot["mode"] == "backtest",
+                strategy_params=bot["strategy"],
+                base_url=self.paper_exchange.base_url if mock_market else None,
+                name=name,
+                paper_exchange=self.sim_exchange if bot["mode"] == "sim" else None,
+                risk_params=bot["risk"],
+            )
+            bot_logger.info(f"Robô {name} iniciado ({bot['mode']}, {bot['interval']}).")
+
+    def _run_bot(self, name):
+        trader = self.traders[name]
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                trader.execute()
+            except Exception as e:
+                erro_logger.exception(f"Erro no tick do robô {name}: {e}")
+            if self.once:
+                return
+            # tick_seconds pode mudar em um reload
+            elapsed = time.monotonic() - started
+            self._stop.wait(max(0.0, self.specs[name]["tick_seconds"] - elapsed))
+
+    def reload(self):
+        """Aplica as mudanças do arquivo de configuração, se houver."""
+        try:
+            mtime = os.path.getmtime(self.config_path)
+        except OSError as e:
+            erro_logger.error(f"Configuração inacessível ({e}); mantendo a atual.")
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+
+        try:
+            config = load_bot_config(self.config_path)
+        except (OSError, ValueError) as e:
+            erro_logger.error(f"Configuração inválida ({e}); mantendo a atual.")
+            return
+
+        new_specs = {bot["name"]: bot for bot in config["bots"]}
+        for name, spec in self.specs.items():
+            new_spec = new_specs.get(name)
+            if new_spec is None:
+                bot_logger.warning(
+                    f"Robô {name} saiu da configuração; reinicie para pará-lo."
+                )
+                continue
+            changed = [field for field in RESTART_FIELDS if new_spec[field] != spec[field]]
+            if changed:
+                bot_logger.warning(
+                    f"Robô {name}: mudança em {', '.join(changed)} só vale após reiniciar."
+                )
+            if new_spec["strategy"] != spec["strategy"]:
+                self.traders[name].update_strategy_params(new_spec["strategy"])
+                spec["strategy"] = new_spec["strategy"]
+            if new_spec["risk"] != spec["risk"]:
+                self.traders[name].risk_watcher.configure(**new_spec["risk"])
+                spec["risk"] = new_spec["risk"]
+            spec["tick_seconds"] = new_spec["tick_seconds"]
+        self.config["reload_seconds"] = config["reload_seconds"]
+
+    def run(self):
+        """Cria os robôs, inicia as threads e recarrega a configuração até parar."""
+        from db.writeBehind import write_behind
+
+        self._create_traders()
+        for name in self.traders:
+            thread = threading.Thread(
+                target=self._run_bot, args=(name,), name=f"bot-{name}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+        try:
+            while any(thread.is_alive() for thread in self._threads):
+                self._stop.wait(self.config["reload_seconds"])
+                self.reload()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            write_behind.flush()
+
+    def stop(self):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=30)
+        for trader in self.traders.values():
+            trader.save_checkpoint()
+            trader.user_stream.stop()
+            trader.risk_watcher.stop()
+        if self.paper_exchange is not None:
+            self.paper_exchange.stop()
+
+
+def run_worker(config_path, bot_names, once=False, sim_share=1.0):
+    """Alvo dos processos de worker."""
+    BotWorker(config_path, bot_names, once, sim_share).run()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Inicia os robôs descritos em um arquivo TOML/YAML."
+    )
+    parser.add_argument("config", help="Arquivo .toml, .yaml ou .yml")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Número de processos (0 = todos os robôs neste processo). "
+        "Padrão: `workers` da configuração.",
+    )
+    parser.add_argument("--only", nargs="+", help="Nomes dos robôs a iniciar.")
+    parser.add_argument("--once", action="store_true", help="Um tick por robô e sai.")
+    parser.add_argument("--check", action="store_true", help="Só valida a configuração.")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    config = load_bot_config(args.config)
+    names = [bot["name"] for bot in config["bots"]]
+    if args.only:
+        unknown = set(args.only) - set(names)
+        if unknown:
+            parser.error(f"Robôs não encontrados: {', '.join(sorted(unknown))}")
+        names = [name for name in names if name in args.only]
+
+    if args.check:
+        for bot in config["bots"]:
+            if bot["name"] in names:
+                print(
+                    f"{bot['name']:<24}{bot['mode']:<10}{bot['interval']:<6}"
+                    f"{bot['tick_seconds']:>6.0f}s  {bot['strategy']}"
+                )
+        return
+
+    from db.neonDbConfig import create_tables
+
+    # Cria as tabelas do banco de dados uma vez, antes dos workers
+    create_tables()
+
+    workers = config["workers"] if args.workers is None else args.workers
+    workers = min(workers, len(names))
+    try:
+        if workers <= 1:
+            run_worker(args.config, names, args.once)
+            return
+
+        # spawn: cada worker começa limpo, sem threads herdadas do processo pai
+        context = multiprocessing.get_context("spawn")
+        groups = [names[index::workers] for index in range(workers)]
+        shares = sim_shares(config["bots"], groups)
+        processes = [
+            context.Process(
+                target=run_worker,
+                args=(args.config, group, args.once, share),
+                name=f"bot-worker-{index}",
+            )
+            for index, (group, share) in enumerate(zip(groups, shares))
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.join(timeout=30)
+                if process.is_alive():
+                    process.terminate()
+    finally:
+        # Fechar handlers ao final da execução para liberar recursos
+        logging.shutdown()
+
+
+if __name__ == "__main__":
+    main()
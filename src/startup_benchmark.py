@@ -0,0 +1,136 @@
+"""
+Benchmark de partida do robô: mede do processo frio até a primeira decisão.
+
+Sobe o MockBinanceServer local e, para cada rodada, inicia um processo Python
+novo que importa BinanceTrader2, cria o BinanceTraderBot (em modo backtest,
+sem enviar ordens) e executa o primeiro tick. Cada fase é cronometrada:
+
+    interpretador -> import -> __init__ do robô -> primeira decisão
+
+Uso:
+    python startup_benchmark.py --runs 5 --max-seconds 5
+
+Sai com código 1 se a mediana do tempo total passar de --max-seconds.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("python_s", "import_s", "init_s", "first_decision_s", "total_s")
+
+
+def run_child():
+    """Executado no processo filho: cronometra as fases e imprime um JSON."""
+    start = time.perf_counter()
+
+    import BinanceTrader2
+
+    imported = time.perf_counter()
+    trader = BinanceTrader2.BinanceTraderBot(
+        BinanceTrader2.STOCK_CODE,
+        BinanceTrader2.OPERATION_CODE,
+        BinanceTrader2.TRADED_QUANTITY,
+        100,
+        BinanceTrader2.CANDLE_PERIOD,
+        backtest_mode=True,
+    )
+    initialized = time.perf_counter()
+    decision = trader.execute()
+    decided = time.perf_counter()
+
+    print(
+        json.dumps(
+            {
+                "import_s": imported - start,
+                "init_s": initialized - imported,
+                "first_decision_s": decided - initialized,
+                "decision": None if decision is None else bool(decision),
+            }
+        )
+    )
+    sys.stdout.flush()
+    # Não espera as threads do stream/reconciliação terminarem
+    os._exit(0)
+
+
+def run_once(env):
+    """Roda um processo filho e retorna o tempo de cada fase."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child"],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+    )
+    total = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Processo filho falhou:\n{result.stderr}")
+
+    # A última linha da saída é o JSON (o robô também imprime no stdout)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["total_s"] = total
+    timings["python_s"] = total - (
+        timings["import_s"] + timings["init_s"] + timings["first_decision_s"]
+    )
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo de partida do robô até a primeira decisão."
+    )
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--symbol", default="SOL/USDT")
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="Falha se a mediana do tempo total passar deste valor.",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child()
+        return
+
+    from functions.binance.MockBinanceServer import MockBinanceServer, load_markets
+
+    mock = MockBinanceServer(load_markets([args.symbol], seed=1), seed=1).start()
+    env = dict(os.environ)
+    env["BINANCE_API_URL"] = mock.base_url
+    # Sem Gemini e sem banco: o benchmark mede só o caminho do próprio robô
+    env.pop("GEMINI_API_KEY", None)
+    env["NEON_DB_STRING_KEY"] = env.get("BENCHMARK_NEON_DB_STRING_KEY", "")
+    # O mock não confere assinaturas, mas o cliente exige chaves para assinar
+    env.setdefault("BINANCE_API_KEY", "benchmark")
+    env.setdefault("BINANCE_SECRET_KEY", "benchmark")
+
+    try:
+        runs = [run_once(env) for _ in range(args.runs)]
+    finally:
+        mock.stop()
+
+    print(f"{'fase':<18}{'mediana':>10}{'máximo':>10}")
+    for phase in PHASES:
+        values = [run[phase] for run in runs]
+        print(
+            f"{phase:<18}{statistics.median(values):>9.3f}s{max(values):>9.3f}s"
+        )
+
+    median_total = statistics.median(run["total_s"] for run in runs)
+    if args.max_seconds is not None and median_total > args.max_seconds:
+        print(
+            f"Partida lenta: mediana {median_total:.3f}s > limite {args.max_seconds:.3f}s"
+        )
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
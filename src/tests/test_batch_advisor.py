@@ -0,0 +1,73 @@
+"""
+BatchAdvisor: um pedido para os símbolos da janela, separado de volta por
+símbolo, com consulta individual (no pool do LLMAdvisor) para quem faltar.
+"""
+
+import json
+import threading
+import pytest
+from functions.InteligenciaArtificial import BatchAdvisor as batch_module
+from functions.InteligenciaArtificial.BatchAdvisor import BatchAdvisor
+from functions.InteligenciaArtificial.DecisionCache import DecisionCache
+from functions.InteligenciaArtificial.LLMAdvisor import LLMAdvisor
+
+
+class FakeSession:
+    def __init__(self, decisions):
+        self.decisions = decisions
+        self.prompts = []
+
+    def generate(self, prompt, timeout=None):
+        self.prompts.append(prompt)
+        return json.dumps({"decisoes": self.decisions})
+
+
+@pytest.fixture
+def advisor(monkeypatch):
+    monkeypatch.setenv("GEMINI_API_KEY", "teste")
+    pool = LLMAdvisor(max_concurrency=2)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def entry(symbol, decisao):
+    return {"simbolo": symbol, "decisao": decisao, "confianca": 0.8, "motivos": ["teste"]}
+
+
+def test_batch_answer_is_split_by_symbol(advisor):
+    session = FakeSession([entry("SOLUSDT", "comprar"), entry("BTCUSDT", "vender")])
+    batch = BatchAdvisor(session, window=0.05, cache=DecisionCache(), advisor=advisor)
+    sol = batch.submit("SOLUSDT", "SOLUSDT px=1")
+    btc = batch.submit("BTCUSDT", "BTCUSDT px=2")
+    assert sol.result(timeout=2)[1] is True
+    assert btc.result(timeout=2)[1] is False
+    assert session.prompts == ["SOLUSDT px=1\nBTCUSDT px=2"]
+
+
+def test_missing_symbols_fall_back_on_the_advisor_pool(advisor, monkeypatch):
+    threads = []
+
+    def gemini_trader(self):
+        threads.append(threading.current_thread().name)
+        return ("individual", None)
+
+    monkeypatch.setattr(batch_module.GeminiTradingBot, "geminiTrader", gemini_trader)
+    session = FakeSession([entry("SOLUSDT", "comprar")])
+    batch = BatchAdvisor(session, window=0.05, cache=DecisionCache(), advisor=advisor)
+    futures = [batch.submit(symbol, f"{symbol} px=1") for symbol in ("SOLUSDT", "BTCUSDT", "ETHUSDT")]
+    results = [future.result(timeout=2) for future in futures]
+    assert results[0][1] is True
+    assert results[1:] == [("individual", None)] * 2
+    assert len(threads) == 2
+    assert all(name.startswith("llm-advisor") for name in threads)
+
+
+def test_fallback_that_cannot_start_resolves_future(advisor, monkeypatch):
+    def submit(func):
+        raise RuntimeError("pool encerrado")
+
+    monkeypatch.setattr(advisor, "submit", submit)
+    batch = BatchAdvisor(FakeSession([]), window=0.01, cache=DecisionCache(), advisor=advisor)
+    future = batch.submit("SOLUSDT", "SOLUSDT px=1")
+    with pytest.raises(RuntimeError):
+        future.result(timeout=2)
@@ -0,0 +1,127 @@
+"""
+Propriedade: o cálculo em forma fechada de calculate_order_quantity dá o
+mesmo resultado que o laço original do QuantityCalculator, que subia a
+quantidade um step_size por vez até atingir o min_notional.
+"""
+
+import random
+from decimal import ROUND_DOWN, Decimal
+import pytest
+from functions.binance.ExchangeInfoCache import SymbolFilters
+from functions.calculators.calculate_max_buy_sell_quantity import QuantityCalculator
+from functions.calculators.calculate_order_quantity import (
+    calculate_order_quantities,
+    calculate_order_quantity,
+    raise_to_min_notional,
+)
+
+CASES = 5000
+STEP_SIZES = ["1", "0.1", "0.01", "0.001", "0.00001", "0.00000001", "0.5", "0.025", "5"]
+TICK_SIZES = ["0.01", "0.0001", "0.00000001", "0.05"]
+
+
+def original_raise(quantity, price, step_size, min_notional):
+    """Laço anterior ao cálculo em forma fechada."""
+    while quantity * price < min_notional:
+        quantity += step_size
+    return quantity
+
+
+def original_quantity(filters, funds, current_price):
+    """QuantityCalculator.calculate_max_*_quantity antes da forma fechada."""
+    quantity = (Decimal(funds) / Decimal(current_price)).quantize(
+        filters.step_size, rounding=ROUND_DOWN
+    )
+    quantity = original_raise(
+        quantity, Decimal(current_price), filters.step_size, Decimal(filters.min_notional)
+    )
+    return max(filters.min_qty, quantity)
+
+
+def random_case(rng):
+    step_size = Decimal(rng.choice(STEP_SIZES))
+    tick_size = Decimal(rng.choice(TICK_SIZES))
+    price = Decimal(rng.randint(1, 10**7)) * tick_size
+    min_notional = Decimal(rng.choice(["1", "5", "10", "10.5", "100", "0.0001"]))
+    # O laço original dá um passo por step_size: limita os passos a ~10 mil
+    max_funds = min_notional * 2 + step_size * price * 10_000
+    funds = Decimal(str(round(rng.uniform(0.00000001, float(max_funds)), 8)))
+    filters = SymbolFilters(
+        symbol="TESTUSDT",
+        step_size=step_size,
+        min_qty=step_size * rng.choice([1, 1, 2, 10]),
+        max_qty=Decimal("9000000"),
+        min_notional=min_notional,
+        tick_size=tick_size,
+    )
+    return filters, funds, price
+
+
+def limited(filters, funds, price):
+    # Casos em que o laço original levaria tempo demais
+    quantity = (funds / price).quantize(filters.step_size, rounding=ROUND_DOWN)
+    return (filters.min_notional - quantity * price) / (filters.step_size * price) > 20_000
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_calculate_order_quantity_matches_original_loop(seed):
+    rng = random.Random(seed)
+    checked = 0
+    while checked < CASES:
+        filters, funds, price = random_case(rng)
+        if limited(filters, funds, price):
+            continue
+        assert calculate_order_quantity(filters, funds, price) == original_quantity(
+            filters, funds, price
+        ), (filters, funds, price)
+        checked += 1
+
+
+def test_raise_to_min_notional_matches_original_loop():
+    rng = random.Random(42)
+    for _ in range(CASES):
+        step_size = Decimal(rng.choice(STEP_SIZES))
+        price = Decimal(rng.randint(1, 10**6)) * Decimal(rng.choice(TICK_SIZES))
+        quantity = step_size * rng.randint(0, 1000)
+        # Déficit de até ~5000 passos, incluindo casos exatos na fronteira
+        steps = rng.randint(0, 5000)
+        min_notional = (quantity + steps * step_size) * price
+        if rng.random() < 0.5:
+            min_notional -= Decimal(rng.choice(["0.00000001", "0.001", "0"]))
+        assert raise_to_min_notional(quantity, price, step_size, min_notional) == (
+            original_raise(quantity, price, step_size, min_notional)
+        ), (quantity, price, step_size, min_notional)
+
+
+def test_quantity_calculator_matches_original_loop():
+    calculator = QuantityCalculator(None, "TESTUSDT")
+    rng = random.Random(7)
+    checked = 0
+    while checked < 1000:
+        filters, funds, price = random_case(rng)
+        if limited(filters, funds, price):
+            continue
+        expected = original_quantity(filters, funds, price)
+        assert calculator.calculate_max_buy_quantity(filters, funds, price) == expected
+        assert calculator.calculate_max_sell_quantity(filters, funds, price) == expected
+        checked += 1
+
+
+def test_calculate_order_quantities_matches_single_orders():
+    rng = random.Random(11)
+    orders = []
+    while len(orders) < 200:
+        filters, funds, price = random_case(rng)
+        if not limited(filters, funds, price):
+            orders.append(
+                {"symbol": f"S{len(orders)}USDT", "filters": filters, "funds": funds, "price": price}
+            )
+    orders.append({"symbol": "BADUSDT", "filters": orders[0]["filters"], "funds": 0, "price": 1})
+
+    quantities = calculate_order_quantities(orders)
+
+    assert quantities["BADUSDT"] is None
+    for order in orders[:-1]:
+        assert quantities[order["symbol"]] == original_quantity(
+            order["filters"], order["funds"], order["price"]
+        )
@@ -0,0 +1,77 @@
+"""
+DecisionJournal: linhas alinhadas entre as colunas, um diretório por robô,
+trava entre processos e arquivamento quando as colunas mudam.
+"""
+
+import os
+import numpy as np
+import pytest
+from functions.DecisionJournal import DecisionJournal, fcntl
+
+COLUMNS = {"time": "i8", "price": "f8", "rsi": "f8", "rule": "S8"}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = DecisionJournal(str(tmp_path), COLUMNS)
+    yield journal
+    journal.close()
+
+
+def test_append_and_query(journal):
+    journal.append("SOLUSDT", {"time": 1, "price": 10.0, "rsi": 30.0, "rule": "compra"})
+    journal.append("SOLUSDT", {"time": 2, "price": 11.0})
+    rows = journal.query()
+    assert rows["price"].tolist() == [10.0, 11.0]
+    assert np.isnan(rows["rsi"][1])
+    assert rows["rule"].astype(str).tolist() == ["compra", ""]
+    assert rows["bot"].tolist() == ["SOLUSDT", "SOLUSDT"]
+    assert journal.query(start=2)["price"].tolist() == [11.0]
+    assert journal.query(last=1)["price"].tolist() == [11.0]
+
+
+def test_invalid_value_drops_the_whole_row(journal):
+    journal.append("X", {"price": 1.0, "rsi": "bad"})
+    journal.append("X", {"price": 2.0, "rsi": 3.0})
+    rows = journal.query()
+    assert rows["price"].tolist() == [2.0]
+    assert rows["rsi"].tolist() == [3.0]
+
+
+def test_rows_are_kept_per_bot(journal):
+    journal.append("SOLUSDT", {"time": 1, "price": 1.0}, bot="SOLUSDT-15m")
+    journal.append("SOLUSDT", {"time": 2, "price": 2.0}, bot="SOLUSDT-1h")
+    assert journal.bots() == ["SOLUSDT-15m", "SOLUSDT-1h"]
+    assert journal.symbols() == ["SOLUSDT"]
+    assert journal.query(bots=["SOLUSDT-1h"])["price"].tolist() == [2.0]
+
+
+def test_incomplete_row_is_discarded_on_reopen(journal, tmp_path):
+    journal.append("X", {"time": 1, "price": 1.0})
+    journal.close()
+    with open(os.path.join(tmp_path, "X", "price.bin"), "ab") as file:
+        file.write(np.float64(9.0).tobytes())
+    journal.append("X", {"time": 2, "price": 2.0})
+    assert journal.query()["price"].tolist() == [1.0, 2.0]
+
+
+@pytest.mark.skipif(fcntl is None, reason="sem flock")
+def test_second_writer_of_the_same_bot_is_blocked(journal, tmp_path):
+    journal.append("X", {"time": 1, "price": 1.0})
+    other = DecisionJournal(str(tmp_path), COLUMNS)
+    other.append("X", {"time": 2, "price": 2.0})
+    other.close()
+    assert journal.query()["price"].tolist() == [1.0]
+
+
+def test_changed_columns_archive_the_old_journal(journal, tmp_path):
+    journal.append("X", {"time": 1, "price": 1.0})
+    journal.close()
+    wider = DecisionJournal(str(tmp_path), {**COLUMNS, "volume": "f8"})
+    wider.append("X", {"time": 2, "price": 2.0, "volume": 5.0})
+    rows = wider.query()
+    wider.close()
+    assert rows["price"].tolist() == [1.0, 2.0]
+    assert np.isnan(rows["volume"][0]) and rows["volume"][1] == 5.0
+    archived = [entry for entry in os.listdir(tmp_path) if entry.startswith("X.") and entry != "X.lock"]
+    assert len(archived) == 1 and os.path.isdir(os.path.join(tmp_path, archived[0]))
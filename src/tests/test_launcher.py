@@ -0,0 +1,32 @@
+"""
+launcher: mercados simulados com o intervalo de cada robô e saldo do [sim]
+dividido entre os workers.
+"""
+
+from launcher import _market_intervals, sim_shares
+
+
+def bot(name, symbol="SOLUSDT", stock_code="SOL", interval="15m", mode="sim"):
+    return {
+        "name": name,
+        "symbol": symbol,
+        "stock_code": stock_code,
+        "interval": interval,
+        "mode": mode,
+    }
+
+
+def test_each_market_uses_its_bots_interval():
+    bots = [
+        bot("SOLUSDT-1h", interval="1h"),
+        bot("BTCUSDT-5m", "BTCUSDT", "BTC", "5m"),
+        bot("SOLUSDT-15m", interval="15m"),
+    ]
+    assert _market_intervals(bots) == {"SOL/USDT": "1h", "BTC/USDT": "5m"}
+
+
+def test_sim_balance_is_split_by_sim_bots_per_worker():
+    bots = [bot("a"), bot("b"), bot("c"), bot("d", mode="live")]
+    assert sim_shares(bots, [["a", "c"], ["b", "d"]]) == [2 / 3, 1 / 3]
+    assert sim_shares(bots, [["a", "b", "c", "d"]]) == [1.0]
+    assert sim_shares([bot("x", mode="live")], [["x"], []]) == [1.0, 1.0]
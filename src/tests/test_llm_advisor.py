@@ -0,0 +1,42 @@
+"""
+LLMAdvisor: prazo por tick, uma consulta em andamento por robô e entrega da
+resposta atrasada a quem pediu.
+"""
+
+import threading
+from functions.InteligenciaArtificial.LLMAdvisor import LLMAdvisor
+
+
+def test_answer_within_deadline():
+    advisor = LLMAdvisor(deadline=1)
+    assert advisor.advise("SOLUSDT", lambda: ("Comprar", True)) == (True, ("Comprar", True))
+
+
+def test_pending_query_is_per_bot_and_late_answer_reaches_on_late():
+    advisor = LLMAdvisor(deadline=0.01)
+    release = threading.Event()
+    late = []
+    arrived = threading.Event()
+
+    def slow():
+        release.wait(1)
+        return ("Vender", False)
+
+    def on_late(answer, elapsed):
+        late.append(answer)
+        arrived.set()
+
+    assert advisor.advise("SOLUSDT", slow, bot="SOLUSDT-a", on_late=on_late) == (False, None)
+    # Outro robô no mesmo símbolo consulta normalmente
+    assert advisor.advise("SOLUSDT", lambda: ("Manter", None), bot="SOLUSDT-b") == (
+        True,
+        ("Manter", None),
+    )
+    # O mesmo robô não abre uma segunda consulta enquanto a primeira não volta
+    assert advisor.advise("SOLUSDT", slow, bot="SOLUSDT-a") == (False, None)
+
+    release.set()
+    assert arrived.wait(1)
+    assert late == [("Vender", False)]
+    assert "SOLUSDT-a" not in advisor._pending
+    advisor.shutdown()
@@ -0,0 +1,49 @@
+"""
+LocalBatchPredictor: uma chamada a decide_batch por modelo para os pedidos
+da janela, e nenhum Future sem resposta quando a predição falha.
+"""
+
+import pytest
+from functions.InteligenciaArtificial.LocalClassifier import LocalBatchPredictor
+
+
+class FakeModel:
+    def __init__(self, skip=None):
+        self.calls = []
+        self.skip = skip
+
+    def decide_batch(self, features_by_index):
+        self.calls.append(dict(features_by_index))
+        return {
+            index: (features > 0, 0.9)
+            for index, features in features_by_index.items()
+            if index != self.skip
+        }
+
+
+def test_requests_in_the_window_share_one_prediction():
+    model = FakeModel()
+    predictor = LocalBatchPredictor(window=0.05)
+    futures = [predictor.submit(model, value) for value in (1, -1, 2)]
+    results = [future.result(timeout=predictor.deadline) for future in futures]
+    assert results == [(True, 0.9), (False, 0.9), (True, 0.9)]
+    assert model.calls == [{0: 1, 1: -1, 2: 2}]
+
+
+def test_partial_result_fails_every_unresolved_future():
+    model = FakeModel(skip=1)
+    predictor = LocalBatchPredictor(window=0.05)
+    futures = [predictor.submit(model, value) for value in (1, -1, 2)]
+    assert futures[0].result(timeout=predictor.deadline) == (True, 0.9)
+    for future in futures[1:]:
+        with pytest.raises(KeyError):
+            future.result(timeout=predictor.deadline)
+
+
+def test_full_batch_runs_without_waiting_for_the_window():
+    model = FakeModel()
+    predictor = LocalBatchPredictor(window=60, max_batch=2)
+    first = predictor.submit(model, 1)
+    second = predictor.submit(model, -1)
+    assert first.done() and second.done()
+    assert predictor._timer is None
@@ -0,0 +1,72 @@
+"""
+PaperExchange: ordens a mercado com filtros, taxa e slippage, saldos e
+eventos no formato da Binance.
+"""
+
+from decimal import Decimal
+import pytest
+from binance.exceptions import BinanceAPIException
+from functions.binance.ExchangeInfoCache import SymbolFilters
+from functions.binance.PaperExchange import PaperExchange
+
+FILTERS = SymbolFilters(
+    symbol="SOLUSDT",
+    step_size=Decimal("0.001"),
+    min_qty=Decimal("0.001"),
+    max_qty=Decimal("9000"),
+    min_notional=Decimal("5"),
+    tick_size=Decimal("0.01"),
+)
+
+
+def order(exchange, side, quantity, price="100"):
+    return exchange.create_market_order(
+        FILTERS, "SOL", "USDT", side, Decimal(quantity), Decimal(price)
+    )
+
+
+def test_buy_and_sell_charge_fee_in_the_received_asset():
+    exchange = PaperExchange(balances={"USDT": 1000}, fee_rate="0.001")
+    bought = order(exchange, "BUY", "1")
+    assert bought["status"] == "FILLED"
+    assert exchange.balances["USDT"] == Decimal("900")
+    assert exchange.balances["SOL"] == Decimal("0.999")
+
+    order(exchange, "SELL", "0.999", "110")
+    assert exchange.balances["SOL"] == 0
+    assert exchange.balances["USDT"] == Decimal("900") + Decimal("109.89") * Decimal("0.999")
+    assert len(exchange.trades["SOLUSDT"]) == 2
+
+
+def test_slippage_goes_against_the_order_on_the_tick_size():
+    exchange = PaperExchange(slippage_bps=10)
+    assert exchange.fill_price("BUY", Decimal("100.003"), FILTERS.tick_size) == Decimal("100.11")
+    assert exchange.fill_price("SELL", Decimal("100.003"), FILTERS.tick_size) == Decimal("99.90")
+
+
+@pytest.mark.parametrize(
+    "side, quantity, message",
+    [
+        ("BUY", "0.0005", "LOT_SIZE"),
+        ("BUY", "0.0015", "LOT_SIZE"),
+        ("BUY", "0.01", "NOTIONAL"),
+        ("BUY", "20", "insufficient balance"),
+        ("SELL", "1", "insufficient balance"),
+    ],
+)
+def test_rejected_orders_leave_balances_untouched(side, quantity, message):
+    exchange = PaperExchange(balances={"USDT": 1000})
+    with pytest.raises(BinanceAPIException, match=message):
+        order(exchange, side, quantity)
+    assert exchange.balances == {"USDT": Decimal("1000")}
+    assert exchange.orders == {}
+
+
+def test_listeners_get_user_data_events():
+    exchange = PaperExchange(balances={"USDT": 1000})
+    events = []
+    exchange.add_user_listener(events.append)
+    order(exchange, "BUY", "1")
+    kinds = [event["e"] for event in events]
+    assert "executionReport" in kinds
+    assert "outboundAccountPosition" in kinds
@@ -0,0 +1,141 @@
+"""
+PositionLedger: posição montada pelas execuções das ordens e conferida com
+as negociações da exchange.
+"""
+
+from decimal import Decimal
+import pytest
+import functions.PositionLedger as position_ledger
+from functions.PositionLedger import PositionLedger
+
+
+class FakeClient:
+    """Só o get_my_trades, com as negociações em ordem crescente."""
+
+    def __init__(self, trades=None):
+        self.trades = trades or []
+
+    def get_my_trades(self, symbol, limit=500):
+        return self.trades[-limit:]
+
+
+def trade(is_buyer, qty, price, commission="0", commission_asset="USDT"):
+    return {
+        "isBuyer": is_buyer,
+        "qty": qty,
+        "price": price,
+        "commission": commission,
+        "commissionAsset": commission_asset,
+    }
+
+
+@pytest.fixture
+def saved(monkeypatch):
+    """Gravações no banco (a write_behind é trocada por uma lista)."""
+    rows = []
+    monkeypatch.setattr(
+        position_ledger.write_behind, "submit", lambda function, *args: rows.append(args)
+    )
+    return rows
+
+
+def make_ledger(trades=None):
+    return PositionLedger(FakeClient(trades), {"SOLUSDT": "SOL"}, bot="SOLUSDT-sim", mode="sim")
+
+
+def test_buy_and_sell_track_quantity_average_and_pnl(saved):
+    ledger = make_ledger()
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "100")
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "110", "0.002", "SOL")
+    position = ledger.get("SOLUSDT")
+    assert position.is_long
+    assert position.quantity == Decimal("1.998")
+    assert position.avg_entry_price == Decimal("105")
+
+    ledger.apply_fill("SOLUSDT", "SELL", "1.998", "120", "0.2", "USDT")
+    assert not position.is_long
+    assert position.quantity == 0
+    assert position.avg_entry_price == 0
+    assert position.realized_pnl == Decimal("15") * Decimal("1.998") - Decimal("0.2")
+
+
+def test_commission_in_third_asset_is_not_charged_in_quote(saved):
+    ledger = make_ledger()
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "100", "0.0005", "BNB")
+    ledger.apply_fill("SOLUSDT", "SELL", "1", "110", "0.0004", "BNB")
+    position = ledger.get("SOLUSDT")
+    assert position.realized_pnl == Decimal("10")
+    assert position.fees == {"BNB": Decimal("0.0009")}
+
+
+def test_persists_by_bot_and_mode(saved):
+    ledger = make_ledger()
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "100")
+    bot, mode, symbol = saved[-1][:3]
+    assert (bot, mode, symbol) == ("SOLUSDT-sim", "sim", "SOLUSDT")
+
+
+def test_start_loads_only_this_bots_positions(saved, monkeypatch):
+    requested = []
+
+    def get_positions(bot, mode):
+        requested.append((bot, mode))
+        return {"SOLUSDT": ("2", "100", "5", "BUY", {"BNB": "0.1"})}
+
+    monkeypatch.setattr(position_ledger, "get_positions", get_positions)
+    ledger = make_ledger([trade(True, "2", "100")])
+    ledger.reconcile_interval = 3600
+    ledger.start()
+    ledger.stop()
+    position = ledger.get("SOLUSDT")
+    assert requested == [("SOLUSDT-sim", "sim")]
+    assert position.quantity == Decimal("2")
+    assert position.fees == {"BNB": Decimal("0.1")}
+
+
+def test_reconcile_sell_resets_position(saved):
+    ledger = make_ledger([trade(True, "1", "100"), trade(False, "1", "105")])
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "100")
+    ledger.reconcile("SOLUSDT")
+    position = ledger.get("SOLUSDT")
+    assert position.last_side == "SELL"
+    assert position.quantity == 0
+    assert position.avg_entry_price == 0
+
+
+def test_reconcile_buy_rebuilds_quantity_since_last_sell(saved):
+    trades = [
+        trade(True, "5", "90"),
+        trade(False, "5", "95"),
+        trade(True, "1", "100", "0.001", "SOL"),
+        trade(True, "3", "120"),
+    ]
+    ledger = make_ledger(trades)
+    ledger.reconcile("SOLUSDT")
+    position = ledger.get("SOLUSDT")
+    assert position.last_side == "BUY"
+    assert position.quantity == Decimal("3.999")
+
+    # Igual à posição que apply_fill monta com as mesmas compras
+    expected = make_ledger()
+    for fill in trades[2:]:
+        expected.apply_fill(
+            "SOLUSDT", "BUY", fill["qty"], fill["price"], fill["commission"], fill["commissionAsset"]
+        )
+    assert position.avg_entry_price == expected.get("SOLUSDT").avg_entry_price
+    assert position.quantity == expected.get("SOLUSDT").quantity
+
+
+def test_reconcile_adopts_buy_when_only_quantity_diverges(saved):
+    ledger = make_ledger([trade(True, "1", "100"), trade(True, "1", "100")])
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "100")
+    ledger.reconcile("SOLUSDT")
+    assert ledger.get("SOLUSDT").quantity == Decimal("2")
+
+
+def test_reconcile_keeps_matching_position(saved):
+    ledger = make_ledger([trade(True, "1", "100")])
+    ledger.apply_fill("SOLUSDT", "BUY", "1", "100")
+    saved.clear()
+    ledger.reconcile("SOLUSDT")
+    assert saved == []
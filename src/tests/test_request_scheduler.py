@@ -0,0 +1,89 @@
+"""
+RequestScheduler: pesos das chamadas, agrupamento de chamadas idênticas e
+espera pelos limites da Binance.
+"""
+
+import threading
+import time
+import pytest
+from functions.binance.RequestScheduler import (
+    PRIORITY_MARKET_DATA,
+    PRIORITY_ORDER,
+    RateLimitedError,
+    RequestScheduler,
+    classify_request,
+)
+
+
+def test_classify_request_weights():
+    assert classify_request("get", "https://x/api/v3/klines", {"limit": 1000}) == (
+        5,
+        PRIORITY_MARKET_DATA,
+        False,
+    )
+    assert classify_request("post", "https://x/api/v3/order", {"symbol": "SOLUSDT"}) == (
+        1,
+        PRIORITY_ORDER,
+        True,
+    )
+    assert classify_request("get", "https://x/api/v3/ticker/price", {})[0] == 4
+
+
+def test_coalesced_callers_get_independent_copies():
+    scheduler = RequestScheduler()
+    calls = []
+
+    def call():
+        calls.append(1)
+        return [[1, "100.0"], [2, "101.0"]]
+
+    first = scheduler._coalesced("klines", 5, call)
+    first.append("alterado")
+    first[0][1] = "0"
+    second = scheduler._coalesced("klines", 5, call)
+    assert len(calls) == 1
+    assert second == [[1, "100.0"], [2, "101.0"]]
+
+
+def test_concurrent_identical_calls_share_one_request():
+    scheduler = RequestScheduler()
+    calls = []
+    started = threading.Event()
+
+    def call():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return {"price": "1"}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(scheduler._coalesced("ticker", 2, call)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == [{"price": "1"}] * 4
+    assert len({id(result) for result in results}) == 4
+
+
+def test_acquire_raises_instead_of_waiting_out_a_long_ban():
+    scheduler = RequestScheduler(max_wait=0.2)
+    scheduler.update_from_headers(418, {"Retry-After": "120"})
+    started = time.monotonic()
+    with pytest.raises(RateLimitedError):
+        scheduler.acquire(1)
+    assert time.monotonic() - started < 0.1
+    assert scheduler.stats["rejected"] == 1
+
+
+def test_acquire_waits_out_a_short_ban():
+    scheduler = RequestScheduler(max_wait=2)
+    scheduler.update_from_headers(429, {"Retry-After": "0.1"})
+    started = time.monotonic()
+    scheduler.acquire(1)
+    assert 0.05 < time.monotonic() - started < 1
+    assert scheduler.stats["delayed"] == 1
@@ -0,0 +1,130 @@
+"""
+CircuitBreaker e retry_call: novas tentativas só para erros passageiros e
+uma única chamada de teste com o circuito meio aberto.
+"""
+
+import time
+import pytest
+from functions.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    is_transient_http_error,
+    retry_call,
+)
+
+
+class HttpError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def open_breaker(reset_timeout=0.05):
+    breaker = CircuitBreaker("teste", failure_threshold=1, reset_timeout=reset_timeout)
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_open_circuit_short_circuits_until_reset_timeout():
+    breaker = open_breaker(reset_timeout=60)
+    assert not breaker.allow()
+    assert not breaker.available()
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.available()
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    # Enquanto a chamada de teste não termina, as outras são recusadas
+    assert not breaker.allow()
+    assert not breaker.available()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+
+
+def test_available_does_not_take_the_probe():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.available()
+    assert breaker.available()
+    assert retry_call(lambda: "ok", attempts=1, breaker=breaker) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_lost_probe_is_replaced_after_reset_timeout():
+    breaker = open_breaker()
+    time.sleep(0.06)
+    assert breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+def test_is_transient_http_error():
+    assert is_transient_http_error(ConnectionError())
+    assert is_transient_http_error(HttpError(503))
+    assert is_transient_http_error(HttpError(429))
+    assert is_transient_http_error(HttpError(418))
+    assert not is_transient_http_error(HttpError(400))
+
+
+def test_retry_call_retries_transient_errors_then_raises():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        raise HttpError(502)
+
+    breaker = CircuitBreaker("teste", failure_threshold=10)
+    with pytest.raises(HttpError):
+        retry_call(
+            flaky,
+            attempts=3,
+            base_delay=0,
+            retry_on=(HttpError,),
+            retry_if=is_transient_http_error,
+            breaker=breaker,
+        )
+    assert len(calls) == 3
+    assert breaker.failures == 3
+
+
+def test_retry_call_raises_client_errors_at_once_without_failure():
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise HttpError(400)
+
+    breaker = CircuitBreaker("teste", failure_threshold=1)
+    with pytest.raises(HttpError):
+        retry_call(
+            bad_request,
+            attempts=3,
+            base_delay=0,
+            retry_on=(HttpError,),
+            retry_if=is_transient_http_error,
+            breaker=breaker,
+        )
+    assert len(calls) == 1
+    assert breaker.state == CLOSED
+
+
+def test_retry_call_refuses_when_circuit_is_open():
+    with pytest.raises(CircuitOpenError):
+        retry_call(lambda: "ok", breaker=open_breaker(reset_timeout=60))
@@ -0,0 +1,139 @@
+"""
+RiskWatcher: saídas por stop-loss, trailing e take profit, nova tentativa
+de uma saída que falhou sem perder o stop, e troca do polling pelo stream.
+"""
+
+import queue
+import threading
+import time
+import pytest
+from functions.bot.RiskWatcher import RiskWatcher
+
+
+class FakeClient:
+    def __init__(self, price="100"):
+        self.price = price
+        self.calls = 0
+
+    def get_symbol_ticker(self, symbol):
+        self.calls += 1
+        return {"symbol": symbol, "price": self.price}
+
+
+def make_watcher(on_exit=None, **params):
+    params = {
+        "stop_loss": 0.05,
+        "trailing_stop": 0.02,
+        "take_profit": 0.0,
+        "level_1": 0.0,
+        "level_2": 0.0,
+        "use_websocket": False,
+        "poll_interval": 60,
+        "retry_backoff": 0.05,
+        **params,
+    }
+    return RiskWatcher("SOLUSDT", FakeClient(), on_exit or (lambda reason, price: None), **params)
+
+
+def next_exit(watcher):
+    try:
+        reason, price, _ = watcher._exits.get_nowait()
+    except queue.Empty:
+        return None
+    return reason, price
+
+
+def test_stop_loss_fires_once():
+    watcher = make_watcher(trailing_stop=0.0)
+    watcher.arm(100)
+    watcher.on_price(96)
+    assert next_exit(watcher) is None
+    watcher.on_price(94)
+    watcher.on_price(93)
+    assert next_exit(watcher) == ("stop_loss", 94.0)
+    assert next_exit(watcher) is None
+
+
+def test_take_profit_fires():
+    watcher = make_watcher(trailing_stop=0.0, take_profit=0.10)
+    watcher.arm(100)
+    watcher.on_price(115)
+    assert next_exit(watcher)[0] == "take_profit"
+
+
+def test_retry_keeps_the_trailing_stop_and_waits_before_firing_again():
+    watcher = make_watcher()
+    watcher.arm(100)
+    watcher.on_price(110)  # stop sobe para 107.8
+    watcher.on_price(107.5)
+    assert next_exit(watcher) == ("trailing_stop", 107.5)
+
+    assert watcher.retry() == pytest.approx(0.05)
+    assert watcher.armed
+    watcher.on_price(107.4)
+    assert next_exit(watcher) is None  # Ainda na espera
+    time.sleep(0.06)
+    watcher.on_price(107.4)
+    # Com arm() o stop voltaria ao stop_loss (95) e não haveria saída
+    assert next_exit(watcher) == ("trailing_stop", 107.4)
+
+
+def test_retry_backoff_doubles_up_to_the_limit_and_arm_resets_it():
+    watcher = make_watcher(retry_backoff=1, max_retry_backoff=3)
+    watcher.arm(100)
+    assert [watcher.retry() for _ in range(3)] == [1, 2, 3]
+    watcher.arm(100)
+    assert watcher.retry() == 1
+
+
+def test_pending_exit_is_not_reset_by_sync():
+    watcher = make_watcher()
+    watcher.arm(100)
+    watcher.on_price(110)
+    watcher.on_price(107)
+    watcher.sync(True, 100)  # Tick durante a saída: continua armado, sem recomeçar
+    assert watcher._high == 110
+    assert watcher.retry() > 0
+
+
+def test_failed_on_exit_is_retried_by_the_exit_thread():
+    calls = []
+    done = threading.Event()
+
+    def on_exit(reason, price):
+        calls.append(reason)
+        done.set()
+        raise RuntimeError("ordem rejeitada")
+
+    watcher = make_watcher(on_exit=on_exit).start()
+    try:
+        watcher.arm(100)
+        watcher.on_price(94)
+        assert done.wait(1)
+        time.sleep(0.01)
+        assert watcher.armed and watcher._failed_exits == 1
+    finally:
+        watcher.stop()
+    assert calls == ["trailing_stop"]
+
+
+def test_stream_is_live_only_after_the_first_trade():
+    watcher = make_watcher()
+    assert not watcher.live
+    watcher._handle_message({"e": "trade", "p": "100.5"})
+    assert watcher.live
+    watcher._handle_message({"e": "error", "m": "desconectado"})
+    assert not watcher.live
+    watcher.stop()
+
+
+def test_polling_pauses_while_the_stream_is_live():
+    watcher = make_watcher(poll_interval=0.01)
+    watcher.live = True
+    watcher._start_polling()
+    time.sleep(0.05)
+    assert watcher.client_binance.calls == 0
+    watcher.live = False
+    time.sleep(0.05)
+    watcher.stop()
+    assert watcher.client_binance.calls > 0